@@ -0,0 +1,75 @@
+"""
+Compares how long the event loop gets blocked by the sync and async json loads.
+
+Usage: python -m benchmarks.bench_asyncJsonLoader
+
+A ticker task measures the largest gap between its ticks (the longest time
+the event loop could not run other tasks) while a directory gets loaded by
+calling JsonLoader.addFromJsonDirectory directly from a coroutine and by
+awaiting AsyncJsonLoader.addFromJsonDirectory.
+"""
+import asyncio
+import shutil
+import tempfile
+import time
+from uver.Loader import JsonLoader, AsyncJsonLoader
+from .configs import generateConfig, writeConfigDirectory
+
+async def measure(load, tickInterval=0.001):
+    """
+    Return (load seconds, largest event loop stall in seconds).
+    """
+    stalls = [0.0]
+    done = []
+
+    async def ticker():
+        last = time.time()
+        while not done:
+            await asyncio.sleep(tickInterval)
+            now = time.time()
+            stalls[0] = max(stalls[0], now - last - tickInterval)
+            last = now
+
+    tickerTask = asyncio.ensure_future(ticker())
+    await asyncio.sleep(tickInterval * 2)
+
+    start = time.time()
+    await load()
+    elapsed = time.time() - start
+
+    done.append(True)
+    await tickerTask
+
+    return (elapsed, stalls[0])
+
+def run(softwareCount=20000, fileCount=200):
+    """
+    Run the benchmark printing the load time and the largest stall.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        writeConfigDirectory(directory, generateConfig(softwareCount, 2, 1, 'complex'), fileCount)
+
+        async def syncLoad():
+            JsonLoader().addFromJsonDirectory(directory)
+
+        async def asyncLoad():
+            await AsyncJsonLoader().addFromJsonDirectory(directory)
+
+        loop = asyncio.new_event_loop()
+        try:
+            for label, load in (('JsonLoader', syncLoad), ('AsyncJsonLoader', asyncLoad)):
+                elapsed, stall = loop.run_until_complete(measure(load))
+                print('{0:<16} load {1:>8.1f}ms  largest stall {2:>8.1f}ms'.format(
+                    label,
+                    elapsed * 1000.0,
+                    stall * 1000.0
+                ))
+        finally:
+            loop.close()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
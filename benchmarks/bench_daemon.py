@@ -0,0 +1,97 @@
+"""
+Load test for the resolver daemon.
+
+Usage: python -m benchmarks.bench_daemon
+
+Starts a daemon (@see uver.Daemon.Server) serving a synthetic config
+directory and sends resolve requests from several client threads, reporting
+the requests per second and the latency percentiles. As reference, the time
+a short-lived process takes to load the same directory and resolve in
+process is reported as well.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+import timeit
+from uver.Loader import JsonLoader
+from uver.Daemon import Server, Client
+from .configs import generateConfig, writeConfigDirectory
+
+def percentile(sortedValues, ratio):
+    """
+    Return the value at the ratio (0 to 1) of the sorted values.
+    """
+    return sortedValues[min(len(sortedValues) - 1, int(len(sortedValues) * ratio))]
+
+def loadTest(socketPath, clients, requests, env):
+    """
+    Return (requests per second, sorted latencies) for the clients sending requests.
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def sendRequests():
+        client = Client(socketPath)
+        clientLatencies = []
+        for index in range(requests):
+            start = time.time()
+            client.resolve(env)
+            clientLatencies.append(time.time() - start)
+        client.close()
+
+        with lock:
+            latencies.extend(clientLatencies)
+
+    threads = list(map(lambda x: threading.Thread(target=sendRequests), range(clients)))
+    start = time.time()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+
+    return (len(latencies) / elapsed, sorted(latencies))
+
+def run(softwareCount=1000, clientCounts=(1, 4, 16), requests=500):
+    """
+    Run the benchmark printing the throughput and latencies.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        config = generateConfig(softwareCount, 2, 1, 'complex')
+        writeConfigDirectory(directory, config, max(1, softwareCount // 100))
+        env = {'UVER_SOFTWARE0_VERSION': '99.0'}
+
+        def resolveInProcess():
+            loader = JsonLoader()
+            loader.addFromJsonDirectory(directory)
+            return loader.resolveMany([env])
+
+        inProcess = min(timeit.repeat(resolveInProcess, number=1, repeat=5))
+        print('{0} softwares, cold in process load + resolve: {1:.2f}ms'.format(
+            softwareCount,
+            inProcess * 1000.0
+        ))
+
+        server = Server(os.path.join(directory, 'uverd.sock'), JsonLoader())
+        server.watchJsonDirectory(directory)
+        server.start()
+        try:
+            for clients in clientCounts:
+                requestsPerSecond, latencies = loadTest(server.socketPath(), clients, requests, env)
+                print('{0:>3} clients: {1:>10.0f} req/s  p50 {2:.3f}ms  p99 {3:.3f}ms'.format(
+                    clients,
+                    requestsPerSecond,
+                    percentile(latencies, 0.5) * 1000.0,
+                    percentile(latencies, 0.99) * 1000.0
+                ))
+        finally:
+            server.shutdown()
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,64 @@
+"""
+Measures the cost of the instrumentation while disabled and enabled.
+
+Usage: python -m benchmarks.bench_instrumentation
+"""
+import json
+import shutil
+import tempfile
+import timeit
+from uver import Instrumentation, Query
+from uver.Loader import JsonLoader
+from .configs import generateConfig, writeConfigDirectory
+
+def timeScenarios(directory, jsonContents, repeat=5):
+    """
+    Return a list of (scenario, best seconds per call).
+    """
+    loader = JsonLoader()
+    loader.addFromJson(jsonContents)
+    query = Query(loader.softwares())
+    name = query.softwareNames()[-1]
+
+    scenarios = [
+        ('JsonLoader.addFromJsonDirectory', lambda: JsonLoader().addFromJsonDirectory(directory), 10),
+        ('JsonLoader.addFromJson', lambda: JsonLoader().addFromJson(jsonContents), 10),
+        ('Loader.softwares', lambda: loader.softwares({'UVER_SOFTWARE0_VERSION': '2.0'}), 10),
+        ('Query.softwareByName', lambda: query.softwareByName(name), 100000)
+    ]
+
+    return list(map(
+        lambda x: (x[0], min(timeit.repeat(x[1], number=x[2], repeat=repeat)) / x[2]),
+        scenarios
+    ))
+
+def run(softwareCount=1000):
+    """
+    Run the benchmark printing the time per call in microseconds.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        config = generateConfig(softwareCount, 2, 1, 'complex')
+        writeConfigDirectory(directory, config, max(1, softwareCount // 20))
+        jsonContents = json.dumps(config)
+
+        disabled = timeScenarios(directory, jsonContents)
+        Instrumentation.enable()
+        try:
+            enabled = timeScenarios(directory, jsonContents)
+        finally:
+            Instrumentation.disable()
+
+        print('{0:<36} {1:>14} {2:>14}'.format('scenario', 'disabled', 'enabled'))
+        for (scenario, disabledTime), (_, enabledTime) in zip(disabled, enabled):
+            print('{0:<36} {1:>12.2f}us {2:>12.2f}us'.format(
+                scenario,
+                disabledTime * 1e6,
+                enabledTime * 1e6
+            ))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
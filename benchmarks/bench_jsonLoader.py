@@ -0,0 +1,66 @@
+"""
+Compares the serial and the threaded JsonLoader.addFromJsonDirectory.
+
+Usage: python -m benchmarks.bench_jsonLoader
+
+The files are written to a temporary local directory which is usually served
+from the page cache, in this case the threaded load only adds overhead. The
+threaded load pays off when the reads have latency (network file systems),
+run the benchmark with TMPDIR pointing to such a location to measure it.
+"""
+import json
+import os
+import shutil
+import tempfile
+import timeit
+from uver.Loader import JsonLoader
+
+def writeConfigDirectory(directory, fileCount, softwaresPerFile=20):
+    """
+    Write synthetic json config files to the directory.
+    """
+    for fileIndex in range(fileCount):
+        contents = {}
+        for index in range(softwaresPerFile):
+            name = 'software{0}_{1}'.format(fileIndex, index)
+            contents[name] = {
+                'version': '1.0.{0}'.format(index),
+                'options': {
+                    'foo': index
+                }
+            }
+
+        filePath = os.path.join(directory, 'show{0:05d}.json'.format(fileIndex))
+        with open(filePath, 'w') as f:
+            json.dump(contents, f)
+
+def run(fileCounts=(10, 100, 1000), workers=(None, 4, 16), repeat=3):
+    """
+    Run the benchmark printing the best time for each configuration.
+    """
+    header = '{0:>8}' + ''.join(map(lambda x: ' {%d:>14}' % (x + 1), range(len(workers))))
+    print(header.format('files', *map(lambda x: 'workers={0}'.format(x), workers)))
+
+    for fileCount in fileCounts:
+        directory = tempfile.mkdtemp()
+        try:
+            writeConfigDirectory(directory, fileCount)
+
+            timings = []
+            for workerCount in workers:
+                timings.append(min(timeit.repeat(
+                    lambda: JsonLoader().addFromJsonDirectory(directory, workers=workerCount),
+                    number=1,
+                    repeat=repeat
+                )))
+        finally:
+            shutil.rmtree(directory)
+
+        print(header.format(
+            fileCount,
+            *map(lambda x: '{0:.2f}ms'.format(x * 1e3), timings)
+        ))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,62 @@
+"""
+Measures the memory used per Software and Addon instance.
+
+Usage: python -m benchmarks.bench_memory
+"""
+import gc
+import tracemalloc
+from uver.Versioned import Software, Addon
+
+def measure(create, count):
+    """
+    Return the number of bytes allocated per object created by the callable.
+    """
+    gc.collect()
+    tracemalloc.start()
+    objects = [create(index) for index in range(count)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # discounting the list holding the objects
+    size -= len(objects) * 8
+
+    return float(size) / count
+
+def createSoftware(index):
+    """
+    Return a software with a single option and no addons.
+    """
+    software = Software('software{0}'.format(index % 100), '1.0.0')
+    software.setOption('foo', 10)
+
+    return software
+
+def createSoftwareWithAddons(index):
+    """
+    Return a software with 5 addons using the default options.
+    """
+    software = Software('software{0}'.format(index % 100), '1.0.0')
+    for addonIndex in range(5):
+        software.addAddon(Addon('addon{0}'.format(addonIndex), '2.0.0'))
+
+    return software
+
+def createAddon(index):
+    """
+    Return an addon using the default options.
+    """
+    return Addon('addon{0}'.format(index % 100), '2.0.0')
+
+def run(count=20000):
+    """
+    Run the benchmark printing the bytes used per object.
+    """
+    for label, create in (
+            ('addon', createAddon),
+            ('software', createSoftware),
+            ('software + 5 addons', createSoftwareWithAddons)):
+        print('{0:>20}: {1:.0f} bytes'.format(label, measure(create, count)))
+
+
+if __name__ == "__main__":
+    run()
@@ -0,0 +1,79 @@
+"""
+Compares the indexed query lookups against linear scans.
+
+Usage: python -m benchmarks.bench_query
+"""
+import timeit
+from uver.Versioned import Software, Addon
+from uver import Query
+
+def buildSoftwares(size, addonFanOut=5):
+    """
+    Return a list of synthetic softwares with addons.
+    """
+    result = []
+    for index in range(size):
+        software = Software('software{0}'.format(index), '1.0.{0}'.format(index))
+        for addonIndex in range(addonFanOut):
+            addonName = 'software{0}'.format((index + addonIndex + 1) % size)
+            software.addAddon(Addon(addonName, '1.0.0'))
+        result.append(software)
+
+    return result
+
+def scanByName(softwares, name):
+    """
+    Reference linear scan (previous implementation of softwareByName).
+    """
+    for software in softwares:
+        if name == software.name():
+            return software
+
+def scanByAddonUverName(softwares, uverName):
+    """
+    Reference linear scan (previous implementation of softwaresByAddonUverName).
+    """
+    result = []
+    for software in softwares:
+        for addon in map(lambda x: software.addon(x), software.addonNames()):
+            if addon.uverName() == uverName:
+                result.append(software)
+
+    return result
+
+def run(sizes=(10, 100, 1000, 5000), lookups=200):
+    """
+    Run the benchmark printing the time per lookup in microseconds.
+    """
+    header = '{0:>8} {1:>14} {2:>14} {3:>14} {4:>14}'
+    print(header.format(
+        'size',
+        'scan name',
+        'index name',
+        'scan addon',
+        'index addon'
+    ))
+
+    for size in sizes:
+        softwares = buildSoftwares(size)
+        query = Query(softwares)
+
+        # looking up the last entry, which is the worst case for a scan
+        name = softwares[-1].name()
+        addonUverName = softwares[-1].uverName()
+
+        timings = [
+            timeit.timeit(lambda: scanByName(softwares, name), number=lookups),
+            timeit.timeit(lambda: query.softwareByName(name), number=lookups),
+            timeit.timeit(lambda: scanByAddonUverName(softwares, addonUverName), number=lookups),
+            timeit.timeit(lambda: query.softwaresByAddonUverName(addonUverName), number=lookups)
+        ]
+
+        print(header.format(
+            size,
+            *map(lambda x: '{0:.2f}us'.format(x / lookups * 1e6), timings)
+        ))
+
+
+if __name__ == "__main__":
+    run()
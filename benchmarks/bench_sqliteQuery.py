@@ -0,0 +1,74 @@
+"""
+Compares opening a sqlite catalog against loading the json into memory.
+
+Usage: python -m benchmarks.bench_sqliteQuery
+"""
+import json
+import os
+import shutil
+import tempfile
+import timeit
+from uver.Loader import JsonLoader, SqliteCatalog
+from uver import Query, SqliteQuery
+from .configs import generateConfig
+
+def run(sizes=(1000, 10000, 100000), addonFanOut=5, lookups=200):
+    """
+    Run the benchmark printing the startup times and the time per lookup.
+    """
+    header = '{0:>8} {1:>12} {2:>12} {3:>12} {4:>12} {5:>12}'
+    print(header.format(
+        'size',
+        'write',
+        'json start',
+        'sqlite start',
+        'json lookup',
+        'sqlite lookup'
+    ))
+
+    directory = tempfile.mkdtemp()
+    try:
+        for size in sizes:
+            jsonContents = json.dumps(generateConfig(size, addonFanOut, shape='complex'))
+            fileName = os.path.join(directory, 'config{0}.db'.format(size))
+
+            loader = JsonLoader()
+            loader.addFromJson(jsonContents)
+            writeTime = timeit.timeit(lambda: loader.writeSqlite(fileName), number=1)
+
+            # startup: from the raw config to the first lookup
+            name = 'software{0}'.format(size - 1)
+            addonName = 'software{0}'.format(size // 2)
+
+            def jsonStart():
+                jsonLoader = JsonLoader()
+                jsonLoader.addFromJson(jsonContents)
+                query = Query(jsonLoader.softwares(lazy=True))
+                query.softwareByName(name)
+                return query
+
+            def sqliteStart():
+                query = SqliteQuery(SqliteCatalog(fileName))
+                query.softwareByName(name)
+                return query
+
+            jsonQuery = jsonStart()
+            sqliteQuery = sqliteStart()
+            timings = [
+                writeTime,
+                timeit.timeit(jsonStart, number=1),
+                timeit.timeit(sqliteStart, number=1),
+                timeit.timeit(lambda: jsonQuery.softwaresByAddonName(addonName), number=lookups) / lookups,
+                timeit.timeit(lambda: sqliteQuery.softwaresByAddonName(addonName), number=lookups) / lookups
+            ]
+
+            print(header.format(
+                size,
+                *map(lambda x: '{0:.2f}ms'.format(x * 1e3), timings)
+            ))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == "__main__":
+    run()
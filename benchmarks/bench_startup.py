@@ -0,0 +1,122 @@
+"""
+Measures the startup cost of the uver command line.
+
+Usage: python -m benchmarks.bench_startup [--budget 60] [--softwares 100]
+
+Times (best of the repeats) a bare interpreter, "import uver" and the uver
+command resolving a synthetic config directory, each in a new process. The
+overhead of the command over the bare interpreter is checked against the
+budget (in milliseconds, exiting with status 1 when exceeded), and the
+modules taking the most time to import are listed (python -X importtime).
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from .configs import generateConfig, writeConfigDirectory
+
+rootDirectory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+libDirectory = os.path.join(rootDirectory, 'src', 'lib')
+uverCommand = os.path.join(rootDirectory, 'src', 'bin', 'uver')
+
+def runEnv():
+    """
+    Return the environment used to run the processes.
+    """
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [libDirectory, env.get('PYTHONPATH')]))
+
+    return env
+
+def timeProcess(args, repeat=10):
+    """
+    Return the best wall time in seconds of running the process.
+    """
+    env = runEnv()
+    best = None
+    with open(os.devnull, 'w') as devnull:
+        for index in range(repeat):
+            start = time.time()
+            subprocess.check_call(args, stdout=devnull, env=env)
+            elapsed = time.time() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+    return best
+
+def slowestImports(args, count=10):
+    """
+    Return the (cumulative microseconds, module) imported by the process taking the most time.
+    """
+    with open(os.devnull, 'w') as devnull:
+        process = subprocess.Popen(
+            [sys.executable, '-X', 'importtime'] + args,
+            stdout=devnull,
+            stderr=subprocess.PIPE,
+            env=runEnv()
+        )
+        output = process.communicate()[1]
+
+    result = []
+    for line in output.decode('utf-8').splitlines():
+        parts = line.split('|')
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        result.append((int(parts[1]), parts[2].strip()))
+
+    return sorted(result, reverse=True)[:count]
+
+def run(budget=60.0, softwareCount=100, stream=sys.stdout):
+    """
+    Run the benchmark, return a boolean telling if the command is within the budget.
+    """
+    directory = tempfile.mkdtemp()
+    try:
+        config = generateConfig(softwareCount, 2, 1, 'complex')
+        writeConfigDirectory(directory, config, max(1, softwareCount // 20))
+
+        interpreter = timeProcess([sys.executable, '-c', 'pass'])
+        importUver = timeProcess([sys.executable, '-c', 'import uver'])
+        command = timeProcess([sys.executable, uverCommand, directory])
+        overhead = (command - interpreter) * 1000.0
+
+        stream.write('{0:<40} {1:>8.1f}ms\n'.format('python -c pass', interpreter * 1000.0))
+        stream.write('{0:<40} {1:>8.1f}ms\n'.format('python -c "import uver"', importUver * 1000.0))
+        stream.write('{0:<40} {1:>8.1f}ms\n'.format(
+            'uver ({0} softwares)'.format(softwareCount),
+            command * 1000.0
+        ))
+        stream.write('{0:<40} {1:>8.1f}ms (budget {2:.1f}ms)\n'.format(
+            'uver overhead',
+            overhead,
+            budget
+        ))
+
+        stream.write('\nslowest imports (cumulative):\n')
+        for microseconds, module in slowestImports([uverCommand, directory]):
+            stream.write('  {0:<38} {1:>8.1f}ms\n'.format(module, microseconds / 1000.0))
+    finally:
+        shutil.rmtree(directory)
+
+    return overhead <= budget
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Measures the startup cost of the uver command')
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=60.0,
+        help='maximum overhead in milliseconds over a bare interpreter (default: 60)'
+    )
+    parser.add_argument(
+        '--softwares',
+        type=int,
+        default=100,
+        help='number of softwares in the config directory (default: 100)'
+    )
+    args = parser.parse_args()
+
+    sys.exit(0 if run(args.budget, args.softwares) else 1)
@@ -0,0 +1,66 @@
+"""
+Synthetic configurations used by the benchmarks.
+"""
+import json
+import os
+
+def generateConfig(softwareCount, addonFanOut=0, optionDepth=0, shape='flat'):
+    """
+    Return a dict following the format expected by JsonLoader.addFromJson.
+
+    Shapes:
+        - flat: softwares defined only by their version ("a": "1.0.0")
+        - complex: same shape as data/json/complex.json, softwares with
+          version, options and addons (with options)
+    """
+    result = {}
+    for index in range(softwareCount):
+        name = 'software{0}'.format(index)
+        version = '{0}.{1}.{2}'.format(index % 7, index % 13, index)
+
+        if shape == 'flat' and not addonFanOut and not optionDepth:
+            result[name] = version
+            continue
+
+        addons = {}
+        for addonIndex in range(min(addonFanOut, softwareCount - 1)):
+            addonName = 'software{0}'.format((index + addonIndex + 1) % softwareCount)
+            addons[addonName] = {
+                'options': {
+                    'enabled': addonIndex % 2 == 0
+                }
+            }
+
+        result[name] = {
+            'version': version,
+            'addons': addons,
+            'options': generateOptions(optionDepth, index)
+        }
+
+    return result
+
+def generateOptions(depth, seed=0):
+    """
+    Return an options dict nested up to the depth.
+    """
+    options = {
+        'foo': seed,
+        'bar': 'value{0}'.format(seed),
+        'baz': [seed, seed + 1]
+    }
+    if depth > 0:
+        options['nested'] = generateOptions(depth - 1, seed + 1)
+
+    return options
+
+def writeConfigDirectory(directory, config, fileCount):
+    """
+    Split the config into json files written under the directory.
+    """
+    names = list(config.keys())
+    chunkSize = max(1, (len(names) + fileCount - 1) // fileCount)
+    for fileIndex, start in enumerate(range(0, len(names), chunkSize)):
+        contents = dict(map(lambda x: (x, config[x]), names[start:start + chunkSize]))
+        filePath = os.path.join(directory, 'config{0:05d}.json'.format(fileIndex))
+        with open(filePath, 'w') as f:
+            json.dump(contents, f)
@@ -0,0 +1,261 @@
+"""
+Benchmark suite covering the loader, json parsing and query hot paths.
+
+Usage:
+    python -m benchmarks.suite [--scales 10,100,1000] [--output results.json]
+                               [--baseline benchmarks/baseline.json]
+                               [--threshold 0.25]
+                               [--save-baseline baseline.json]
+
+Each scenario is timed with timeit (best of the repeats, in seconds per
+call). Results are written as json and, when a baseline is provided, every
+scenario slower than the baseline by more than the threshold is reported as
+a regression (exiting with status 1). A missing baseline file exits with
+status 2.
+
+The stored baseline (benchmarks/baseline.json) covers the scales 10, 100
+and 1000, only the scenarios found in the baseline are compared. Timings
+depend on the machine, save a new baseline (--save-baseline) when
+comparing on a different one.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from uver.Loader import Loader, JsonLoader
+from uver import Query
+from .configs import generateConfig, writeConfigDirectory
+
+# (label, addon fan-out, option depth, shape)
+profiles = [
+    ('flat', 0, 0, 'flat'),
+    ('complex', 2, 1, 'complex'),
+    ('fanout', 20, 0, 'complex'),
+    ('deepOptions', 2, 8, 'complex')
+]
+
+defaultScales = (10, 100, 1000, 10000, 100000)
+
+def timeCall(callable, targetTime=0.2, repeat=3):
+    """
+    Return the best time in seconds per call.
+
+    The number of calls per repeat is adjusted so each repeat takes around
+    targetTime seconds.
+    """
+    number = 1
+    while True:
+        elapsed = timeit.timeit(callable, number=number)
+        if elapsed >= targetTime / 10.0 or number >= 1000000:
+            break
+        number *= 10
+
+    number = max(1, int(number * targetTime / max(elapsed, 1e-9)))
+    return min(timeit.repeat(callable, number=number, repeat=repeat)) / number
+
+def timeFreshCall(create, call, targetTime=0.2, repeat=3):
+    """
+    Return the best time in seconds per call, each call receiving a new object.
+
+    The objects are created by create before the timing starts, so only the
+    call is measured (for instance, to time a cache that is filled by the
+    first call).
+    """
+    elapsed = timeit.timeit(lambda: call(create()), number=1)
+    number = max(1, min(1000, int(targetTime / max(elapsed, 1e-9))))
+
+    result = None
+    for index in range(repeat):
+        objects = list(map(lambda x: create(), range(number)))
+        start = timeit.default_timer()
+        for obj in objects:
+            call(obj)
+        elapsed = (timeit.default_timer() - start) / number
+        result = elapsed if result is None else min(result, elapsed)
+
+    return result
+
+def runScenarios(scale, profile):
+    """
+    Return a dict with the timings of the scenarios for a configuration.
+    """
+    label, addonFanOut, optionDepth, shape = profile
+    config = generateConfig(scale, addonFanOut, optionDepth, shape)
+    jsonContents = json.dumps(config)
+    prefix = '{0}/{1}/'.format(label, scale)
+    result = {}
+
+    # parsing
+    result[prefix + 'JsonLoader.addFromJson'] = timeCall(
+        lambda: JsonLoader().addFromJson(jsonContents)
+    )
+    result[prefix + 'JsonLoader.addFromJson(no provenance)'] = timeCall(
+        lambda: JsonLoader(trackProvenance=False).addFromJson(jsonContents)
+    )
+
+    directory = tempfile.mkdtemp()
+    try:
+        writeConfigDirectory(directory, config, max(1, scale // 100))
+        result[prefix + 'JsonLoader.addFromJsonDirectory'] = timeCall(
+            lambda: JsonLoader().addFromJsonDirectory(directory)
+        )
+    finally:
+        shutil.rmtree(directory)
+
+    # resolving
+    loader = JsonLoader()
+    loader.addFromJson(jsonContents)
+    overrideEnv = {'UVER_SOFTWARE0_VERSION': '99.0', 'PATH': '/usr/bin'}
+
+    def createLoader():
+        freshLoader = Loader()
+        freshLoader.setInfos(loader.infos())
+        return freshLoader
+
+    # a new loader per call, so nothing is cached by the previous calls
+    result[prefix + 'Loader.softwares(cold)'] = timeFreshCall(createLoader, lambda x: x.softwares())
+    result[prefix + 'Loader.softwares(cached)'] = timeCall(lambda: loader.softwares())
+    result[prefix + 'Loader.softwares(env)'] = timeCall(lambda: loader.softwares(overrideEnv))
+
+    # a different override per call, so the result is never cached
+    overrideVersions = itertools.count()
+    result[prefix + 'Loader.softwares(env uncached)'] = timeCall(
+        lambda: loader.softwares({'UVER_SOFTWARE0_VERSION': str(next(overrideVersions))})
+    )
+    result[prefix + 'Loader.uverVersions(env)'] = timeCall(lambda: loader.uverVersions(overrideEnv))
+
+    # querying
+    softwares = loader.softwares()
+    query = Query(softwares)
+    name = softwares[-1].name()
+    uverName = softwares[-1].uverName()
+    addonName = name if addonFanOut else None
+
+    result[prefix + 'Query()'] = timeCall(lambda: Query(softwares))
+    result[prefix + 'Query.softwareNames'] = timeCall(query.softwareNames)
+    result[prefix + 'Query.softwareUverNames'] = timeCall(query.softwareUverNames)
+    result[prefix + 'Query.addonNames'] = timeCall(query.addonNames)
+    result[prefix + 'Query.addonUverNames'] = timeCall(query.addonUverNames)
+    result[prefix + 'Query.uverVersions'] = timeCall(query.uverVersions)
+    result[prefix + 'Query.softwareByName'] = timeCall(lambda: query.softwareByName(name))
+    result[prefix + 'Query.softwareByUverName'] = timeCall(lambda: query.softwareByUverName(uverName))
+    result[prefix + 'Query.latestSoftwareByName'] = timeCall(lambda: query.latestSoftwareByName(name))
+    result[prefix + 'Query.softwaresByVersion'] = timeCall(lambda: query.softwaresByVersion(name, '>=0'))
+    if addonName is not None:
+        result[prefix + 'Query.softwaresByAddonName'] = timeCall(lambda: query.softwaresByAddonName(addonName))
+        result[prefix + 'Query.softwaresByAddonUverName'] = timeCall(lambda: query.softwaresByAddonUverName(uverName))
+        result[prefix + 'Query.softwaresByAddonVersion'] = timeCall(lambda: query.softwaresByAddonVersion(addonName, '>=0'))
+
+    return result
+
+def compareBaseline(results, baseline, threshold):
+    """
+    Return a list of (scenario, baseline time, current time) for regressions.
+    """
+    regressions = []
+    for scenario, seconds in sorted(results.items()):
+        baselineSeconds = baseline.get(scenario)
+        if baselineSeconds is not None and seconds > baselineSeconds * (1.0 + threshold):
+            regressions.append((scenario, baselineSeconds, seconds))
+
+    return regressions
+
+def run(scales, profileNames=None, stream=sys.stdout):
+    """
+    Run the suite and return the results document.
+    """
+    results = {}
+    for profile in profiles:
+        if profileNames and profile[0] not in profileNames:
+            continue
+
+        for scale in scales:
+            scenarios = runScenarios(scale, profile)
+            for scenario in sorted(scenarios.keys()):
+                stream.write('{0:<60} {1:>12.2f}us\n'.format(scenario, scenarios[scenario] * 1e6))
+            results.update(scenarios)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'time': time.strftime('%Y-%m-%dT%H:%M:%S')
+        },
+        'results': results
+    }
+
+def main(argv=None):
+    """
+    Command line entry point, return the exit status.
+    """
+    parser = argparse.ArgumentParser(description='Runs the uver benchmark suite')
+    parser.add_argument(
+        '--scales',
+        default=','.join(map(str, defaultScales)),
+        help='comma separated number of softwares (default: "{0}")'.format(
+            ','.join(map(str, defaultScales))
+        )
+    )
+    parser.add_argument(
+        '--profiles',
+        default='',
+        help='comma separated profiles to run (default: all of {0})'.format(
+            ', '.join(map(lambda x: x[0], profiles))
+        )
+    )
+    parser.add_argument('--output', help='json file receiving the results')
+    parser.add_argument(
+        '--baseline',
+        help='json file with the results used as baseline (for instance, "{0}")'.format(
+            os.path.join('benchmarks', 'baseline.json')
+        )
+    )
+    parser.add_argument('--save-baseline', help='json file receiving the results as the new baseline')
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=0.25,
+        help='relative slowdown reported as regression (default: 0.25)'
+    )
+    args = parser.parse_args(argv)
+
+    # failing before running the suite
+    if args.baseline and not os.path.isfile(args.baseline):
+        sys.stderr.write('Baseline file "{0}" does not exist!\n'.format(args.baseline))
+        return 2
+
+    document = run(
+        list(map(int, args.scales.split(','))),
+        list(filter(None, args.profiles.split(',')))
+    )
+
+    for fileName in filter(None, (args.output, args.save_baseline)):
+        with open(fileName, 'w') as f:
+            json.dump(document, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+
+        regressions = compareBaseline(document['results'], baseline, args.threshold)
+        for scenario, baselineSeconds, seconds in regressions:
+            sys.stdout.write('REGRESSION {0}: {1:.2f}us -> {2:.2f}us\n'.format(
+                scenario,
+                baselineSeconds * 1e6,
+                seconds * 1e6
+            ))
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+import socket
+from .Protocol import Protocol, ProtocolError
+
+class DaemonRequestError(Exception):
+    """Daemon request error."""
+
+class Client(object):
+    """
+    Thin client for the resolver daemon (@see Server).
+
+    The client only depends on the socket module and {@link Protocol}, so
+    it is cheap to import from short-lived processes (for instance,
+    launchers). The connection is opened by the first request and reused by
+    the following ones.
+    """
+
+    def __init__(self, socketPath, timeout=None):
+        """
+        Create a client object.
+        """
+        self.__socketPath = socketPath
+        self.__timeout = timeout
+        self.__socket = None
+
+    def socketPath(self):
+        """
+        Return the path of the socket used to reach the daemon.
+        """
+        return self.__socketPath
+
+    def request(self, op, **args):
+        """
+        Send a request to the daemon and return its result.
+
+        Requests are idempotent, therefore when a reused connection turns
+        out to be broken (for instance, the daemon has been restarted) the
+        request is sent again through a new connection.
+        """
+        request = dict(args)
+        request['op'] = op
+
+        reused = self.__socket is not None
+        try:
+            response = self.__send(request)
+        except (socket.error, ProtocolError):
+            self.close()
+            if not reused:
+                raise
+            response = self.__send(request)
+
+        if 'error' in response:
+            raise DaemonRequestError(
+                '{0}: {1}'.format(response['error']['type'], response['error']['message'])
+            )
+
+        return response['result']
+
+    def status(self):
+        """
+        Return a dict with the status of the daemon.
+
+        Keys: "generation", "softwares" (number of softwares) and
+        "reloadError" (None when the last reload succeeded).
+        """
+        return self.request('status')
+
+    def uverVersions(self, env={}):
+        """
+        Return a dict with the uver names and versions (@see Loader.uverVersions).
+        """
+        return self.request('uverVersions', env=dict(env))
+
+    def resolve(self, env={}):
+        """
+        Return a list of (name, version) pairs (@see Loader.resolveMany).
+        """
+        return list(map(tuple, self.request('resolve', env=dict(env))))
+
+    def software(self, name, env={}):
+        """
+        Return a dict with the "name", "version", "options" and "addons" of a software.
+        """
+        return self.request('software', name=name, env=dict(env))
+
+    def softwaresByAddonName(self, addonName):
+        """
+        Return a list with the names of the softwares using the addon.
+        """
+        return self.request('softwaresByAddonName', name=addonName)
+
+    def reload(self):
+        """
+        Reload the directories watched by the daemon.
+
+        Return the lists of "added", "changed" and "removed" files.
+        """
+        return self.request('reload')
+
+    def close(self):
+        """
+        Close the connection to the daemon (reopened by the next request).
+        """
+        if self.__socket is not None:
+            self.__socket.close()
+            self.__socket = None
+
+    def __send(self, request):
+        """
+        Send the request and return the response.
+
+        @private
+        """
+        if self.__socket is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.__timeout)
+            try:
+                sock.connect(self.__socketPath)
+            except socket.error:
+                sock.close()
+                raise
+            self.__socket = sock
+
+        Protocol.send(self.__socket, request)
+        response = Protocol.receive(self.__socket)
+        if response is None:
+            raise ProtocolError('Connection closed by the daemon!')
+
+        return response
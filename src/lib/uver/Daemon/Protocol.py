@@ -0,0 +1,78 @@
+import json
+import struct
+
+class ProtocolError(Exception):
+    """Protocol error."""
+
+class Protocol(object):
+    """
+    Wire protocol used between the resolver daemon and its clients.
+
+    Each message is a json document (encoded as utf-8) prefixed by its size
+    as a 4 bytes big-endian unsigned integer. Requests are dicts with the
+    "op" name and its arguments, responses are dicts holding either the
+    "result" or the "error" (type and message).
+    """
+
+    # messages larger than this are rejected
+    maxMessageSize = 64 * 1024 * 1024
+
+    __sizeStruct = struct.Struct('>I')
+
+    @classmethod
+    def encode(cls, message):
+        """
+        Return the bytes of a message (including its size prefix).
+        """
+        data = json.dumps(message, separators=(',', ':')).encode('utf-8')
+
+        return cls.__sizeStruct.pack(len(data)) + data
+
+    @classmethod
+    def send(cls, sock, message):
+        """
+        Send a message through a socket.
+        """
+        sock.sendall(cls.encode(message))
+
+    @classmethod
+    def receive(cls, sock):
+        """
+        Return the next message from a socket (None when the socket was closed).
+        """
+        header = cls.__receiveExactly(sock, cls.__sizeStruct.size, True)
+        if header is None:
+            return None
+
+        size = cls.__sizeStruct.unpack(header)[0]
+        if size > cls.maxMessageSize:
+            raise ProtocolError('Message too large ({0} bytes)!'.format(size))
+
+        try:
+            return json.loads(cls.__receiveExactly(sock, size).decode('utf-8'))
+        except ValueError as err:
+            raise ProtocolError('Invalid message: {0}'.format(err))
+
+    @staticmethod
+    def __receiveExactly(sock, size, allowClose=False):
+        """
+        Return exactly size bytes from the socket.
+
+        When allowClose is enabled, None is returned in case the socket gets
+        closed before any data is received.
+
+        @private
+        """
+        chunks = []
+        remaining = size
+        while remaining:
+            chunk = sock.recv(min(remaining, 1024 * 1024))
+            if not chunk:
+                if allowClose and remaining == size:
+                    return None
+                raise ProtocolError('Connection closed in the middle of a message!')
+
+            chunks.append(chunk)
+            remaining -= len(chunk)
+
+        return b''.join(chunks)
@@ -0,0 +1,381 @@
+import os
+import sys
+import socket
+import threading
+from ..Query import Query
+from ..Loader import JsonLoader
+from .Protocol import Protocol, ProtocolError
+
+# compatibility with python 2/3
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+class SocketInUseError(Exception):
+    """Socket in use error."""
+
+class UnknownOperationError(Exception):
+    """Unknown operation error."""
+
+class Server(object):
+    """
+    Resident resolver that answers requests over a UNIX domain socket.
+
+    The server holds a loader (@see Loader) and answers the requests sent by
+    {@link Client} through {@link Protocol}. Requests are served by a thread
+    per connection reading from the current snapshot of the loader, so they
+    never wait for a reload. Json directories can be watched (@see
+    watchJsonDirectory), they are reloaded incrementally when their files
+    change. The socket is only accessible by the user running the server.
+
+    Operations:
+    - status: generation of the loaded info and the last reload error
+    - uverVersions(env): uver names and versions (@see Loader.uverVersions)
+    - resolve(env): (name, version) pairs (@see Loader.resolveMany)
+    - software(name, env): version, options and addons of a software
+    - softwaresByAddonName(name): names of the softwares using an addon
+    - reload: reload the watched directories immediately
+    """
+
+    def __init__(self, socketPath, loader):
+        """
+        Create a server object.
+        """
+        self.__socketPath = socketPath
+        self.__loader = loader
+        self.__directories = []
+        self.__interval = None
+        self.__reloadError = None
+        self.__reloadLock = threading.Lock()
+        self.__stopEvent = threading.Event()
+        self.__threads = []
+        self.__server = None
+        self.__snapshotData = None
+        self.__snapshotLock = threading.Lock()
+        self.__operations = {
+            'status': self.__status,
+            'uverVersions': self.__uverVersions,
+            'resolve': self.__resolve,
+            'software': self.__software,
+            'softwaresByAddonName': self.__softwaresByAddonName,
+            'reload': self.__reload
+        }
+
+    def socketPath(self):
+        """
+        Return the path of the socket used by the server.
+        """
+        return self.__socketPath
+
+    def loader(self):
+        """
+        Return the loader used by the server.
+        """
+        return self.__loader
+
+    def watchJsonDirectory(self, directory, interval=1.0):
+        """
+        Load a json directory and keep reloading it while the server runs.
+
+        The directories are polled every interval (in seconds, the smallest
+        interval among the directories is used). Requires a
+        {@link JsonLoader}.
+        """
+        assert isinstance(self.__loader, JsonLoader), \
+            "watching directories requires a json loader"
+
+        self.__loader.reloadJsonDirectory(directory)
+        self.__directories.append(directory)
+
+        if self.__interval is None or interval < self.__interval:
+            self.__interval = interval
+
+    def reload(self):
+        """
+        Reload the watched directories.
+
+        Return the lists of "added", "changed" and "removed" files
+        (@see JsonLoader.reloadJsonDirectory).
+        """
+        result = {
+            'added': [],
+            'changed': [],
+            'removed': []
+        }
+        with self.__reloadLock:
+            try:
+                for directory in self.__directories:
+                    changes = self.__loader.reloadJsonDirectory(directory)
+                    for key in result.keys():
+                        result[key].extend(changes[key])
+            except Exception as err:
+                self.__reloadError = '{0}: {1}'.format(type(err).__name__, err)
+                raise
+
+            self.__reloadError = None
+
+        return result
+
+    def process(self, request):
+        """
+        Return the response for a request.
+
+        Errors raised by the operation are returned as part of the response.
+        """
+        try:
+            if not isinstance(request, dict) or request.get('op') not in self.__operations:
+                raise UnknownOperationError(
+                    'Unknown operation "{0}"'.format(
+                        request.get('op') if isinstance(request, dict) else request
+                    )
+                )
+
+            return {
+                'result': self.__operations[request['op']](request)
+            }
+        except Exception as err:
+            return {
+                'error': {
+                    'type': type(err).__name__,
+                    'message': str(err)
+                }
+            }
+
+    def start(self):
+        """
+        Start serving the requests in background.
+        """
+        self.__listen()
+
+        thread = threading.Thread(target=self.__server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        self.__threads.append(thread)
+
+    def serveForever(self):
+        """
+        Serve the requests until {@link shutdown} is called (blocks).
+        """
+        self.__listen()
+        self.__server.serve_forever()
+
+    def shutdown(self):
+        """
+        Stop the server (and the reload of the watched directories).
+        """
+        self.__stopEvent.set()
+
+        if self.__server is not None:
+            self.__server.shutdown()
+            self.__server.server_close()
+            self.__server = None
+
+            if os.path.exists(self.__socketPath):
+                os.remove(self.__socketPath)
+
+        for thread in self.__threads:
+            thread.join()
+        self.__threads = []
+
+    def __listen(self):
+        """
+        Create the socket server and start watching the directories.
+
+        @private
+        """
+        self.__removeStaleSocket()
+
+        # the socket is created without access for the other users, instead
+        # of restricting it after it has been bound (the umask is process wide,
+        # it is restored right after)
+        umask = os.umask(0o077)
+        try:
+            self.__server = socketserver.ThreadingUnixStreamServer(self.__socketPath, self.__requestHandler())
+        finally:
+            os.umask(umask)
+        self.__server.daemon_threads = True
+        os.chmod(self.__socketPath, 0o600)
+
+        self.__stopEvent.clear()
+        if self.__directories:
+            thread = threading.Thread(target=self.__watch)
+            thread.daemon = True
+            thread.start()
+            self.__threads.append(thread)
+
+    def __removeStaleSocket(self):
+        """
+        Remove the socket left by a server that is no longer running.
+
+        Raise SocketInUseError when another server is using it.
+
+        @private
+        """
+        if not os.path.exists(self.__socketPath):
+            return
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.__socketPath)
+        except socket.error:
+            os.remove(self.__socketPath)
+        else:
+            raise SocketInUseError(
+                'Socket "{0}" is being used by another server!'.format(self.__socketPath)
+            )
+        finally:
+            probe.close()
+
+    def __requestHandler(self):
+        """
+        Return the handler class serving the requests of a connection.
+
+        @private
+        """
+        server = self
+
+        class RequestHandler(socketserver.BaseRequestHandler):
+            def handle(self):
+                while True:
+                    try:
+                        request = Protocol.receive(self.request)
+                    except (ProtocolError, socket.error):
+                        return
+
+                    if request is None:
+                        return
+
+                    # the client may have disconnected in the meantime
+                    try:
+                        Protocol.send(self.request, server.process(request))
+                    except socket.error:
+                        return
+
+        return RequestHandler
+
+    def __watch(self):
+        """
+        Reload the watched directories every interval until the server stops.
+
+        @private
+        """
+        while not self.__stopEvent.wait(self.__interval):
+            try:
+                self.reload()
+            except Exception as err:
+                sys.stderr.write('Could not reload: {0}\n'.format(err))
+
+    def __snapshot(self):
+        """
+        Return the (snapshot, software positions, query) of the current snapshot.
+
+        The query is shared by the request threads, its indexes are built
+        before it gets assigned.
+
+        @private
+        """
+        snapshot = self.__loader.snapshot()
+        snapshotData = self.__snapshotData
+        if snapshotData is None or snapshotData[0] is not snapshot:
+            with self.__snapshotLock:
+                snapshotData = self.__snapshotData
+                if snapshotData is None or snapshotData[0] is not snapshot:
+                    softwares = snapshot.softwares(lazy=True)
+                    positions = dict(map(reversed, enumerate(softwares.names())))
+                    snapshotData = (snapshot, positions, Query(softwares))
+                    self.__snapshotData = snapshotData
+
+        return snapshotData
+
+    def __status(self, request):
+        """
+        Return the status of the server.
+
+        @private
+        """
+        snapshot = self.__snapshot()
+
+        return {
+            'generation': snapshot[0].generation(),
+            'softwares': len(snapshot[1]),
+            'reloadError': self.__reloadError
+        }
+
+    def __uverVersions(self, request):
+        """
+        Return the uver names and versions for the env.
+
+        @private
+        """
+        return self.__snapshot()[0].uverVersions(request.get('env', {}))
+
+    def __resolve(self, request):
+        """
+        Return the (name, version) pairs for the env.
+
+        @private
+        """
+        return self.__snapshot()[0].resolveMany([request.get('env', {})])[0]
+
+    def __software(self, request):
+        """
+        Return the version, options and addons of a software.
+
+        @private
+        """
+        snapshot, positions, query = self.__snapshot()
+        name = request['name']
+        env = request.get('env', {})
+        if env:
+            software = snapshot.softwares(env, lazy=True)[positions[name]] if name in positions else None
+        else:
+            software = query.softwareByName(name) if name in positions else None
+
+        if software is None:
+            # using the error raised by the query
+            query.softwareByName(name)
+
+        return {
+            'name': software.name(),
+            'version': software.version(),
+            'options': self.__options(software),
+            'addons': dict(map(
+                lambda x: (x, {
+                    'version': software.addon(x).version(),
+                    'options': self.__options(software.addon(x))
+                }),
+                software.addonNames()
+            ))
+        }
+
+    def __softwaresByAddonName(self, request):
+        """
+        Return the names of the softwares using the addon.
+
+        @private
+        """
+        return list(map(
+            lambda x: x.name(),
+            self.__snapshot()[2].softwaresByAddonName(request['name'])
+        ))
+
+    def __reload(self, request):
+        """
+        Reload the watched directories.
+
+        @private
+        """
+        return self.reload()
+
+    @staticmethod
+    def __options(versioned):
+        """
+        Return a dict with the options of a versioned.
+
+        @private
+        """
+        return dict(map(
+            lambda x: (x, versioned.option(x)),
+            versioned.optionNames()
+        ))
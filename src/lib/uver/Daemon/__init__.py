@@ -0,0 +1,12 @@
+from ..LazyModule import LazyModule
+
+# submodules are imported on first access (@see LazyModule)
+LazyModule.install(__name__, [
+    ('Protocol', '.Protocol'),
+    ('ProtocolError', '.Protocol'),
+    ('Server', '.Server'),
+    ('SocketInUseError', '.Server'),
+    ('UnknownOperationError', '.Server'),
+    ('Client', '.Client'),
+    ('DaemonRequestError', '.Client')
+])
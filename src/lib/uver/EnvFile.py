@@ -0,0 +1,56 @@
+import os
+
+class InvalidEnvFileFormatError(Exception):
+    """Invalid env file format error."""
+
+class EnvFile(object):
+    """
+    Writes environment variables to files.
+
+    Supported formats:
+        - sh: shell sourceable file (export NAME='value')
+        - env: one NAME=value per line, compatible with env -i
+    """
+
+    formats = ('sh', 'env')
+
+    @staticmethod
+    def contents(variables, fileFormat='sh'):
+        """
+        Return the variables formatted as file contents.
+
+        The variables are sorted by name so the contents are deterministic.
+        """
+        if fileFormat not in EnvFile.formats:
+            raise InvalidEnvFileFormatError(
+                'Invalid env file format "{0}"!'.format(fileFormat)
+            )
+
+        lines = []
+        for name in sorted(variables.keys()):
+            value = variables[name]
+            if fileFormat == 'sh':
+                lines.append("export {0}='{1}'\n".format(
+                    name,
+                    value.replace("'", "'\\''")
+                ))
+            else:
+                lines.append('{0}={1}\n'.format(name, value))
+
+        return ''.join(lines)
+
+    @staticmethod
+    def write(fileName, variables, fileFormat='sh'):
+        """
+        Write the variables to a file (replacing it atomically).
+        """
+        contents = EnvFile.contents(variables, fileFormat)
+
+        temporaryFileName = '{0}.{1}.tmp'.format(fileName, os.getpid())
+        with open(temporaryFileName, 'w') as f:
+            f.write(contents)
+
+        if hasattr(os, 'replace'):
+            os.replace(temporaryFileName, fileName)
+        else:
+            os.rename(temporaryFileName, fileName)
@@ -0,0 +1,232 @@
+import time
+import functools
+import threading
+
+# most precise clock available (python 3.3+)
+clock = getattr(time, 'perf_counter', time.time)
+
+class Instrumentation(object):
+    """
+    Opt-in counters and timers for the load, resolve and query phases.
+
+    Instrumentation is disabled by default (@see enable). While enabled it
+    records:
+    - timers: calls, total and max seconds of the instrumented methods (for
+    instance, "Query.softwareByName") and phases (for instance,
+    "JsonLoader.read" for file I/O and "JsonLoader.decode" for json decoding)
+    - counters: files, bytes, softwares, addons and options processed
+
+    The recorded values are available through {@link stats} and are sent
+    to the hooks as they happen (@see addHook), so external collectors can
+    forward them.
+
+    Methods are instrumented by replacing them on their classes when the
+    instrumentation gets enabled (@see instrument), therefore they run
+    untouched while disabled. The phases and counters inside of the methods
+    only check the {@link enabled} flag.
+    """
+
+    # read by the instrumented code, use enable and disable to change it
+    enabled = False
+
+    __lock = threading.Lock()
+    __timers = {}
+    __counters = {}
+    __hooks = []
+    __methods = []
+
+    @classmethod
+    def enable(cls):
+        """
+        Start recording (instrumenting the registered methods).
+        """
+        with cls.__lock:
+            cls.enabled = True
+            for owner, methodName, original, instrumented in cls.__methods:
+                setattr(owner, methodName, instrumented)
+
+    @classmethod
+    def disable(cls):
+        """
+        Stop recording (restoring the registered methods).
+
+        The values recorded so far are kept (@see reset).
+        """
+        with cls.__lock:
+            cls.enabled = False
+            for owner, methodName, original, instrumented in cls.__methods:
+                setattr(owner, methodName, original)
+
+    @classmethod
+    def reset(cls):
+        """
+        Discard the recorded values.
+        """
+        with cls.__lock:
+            cls.__timers.clear()
+            cls.__counters.clear()
+
+    @classmethod
+    def stats(cls):
+        """
+        Return a snapshot of the recorded values.
+
+        Format:
+        {
+            "timers": {
+                "Query.softwareByName": {"calls": 2, "total": 0.001, "max": 0.0008}
+            },
+            "counters": {
+                "files": 10
+            }
+        }
+        """
+        with cls.__lock:
+            return {
+                'timers': dict(map(
+                    lambda x: (x[0], {'calls': x[1][0], 'total': x[1][1], 'max': x[1][2]}),
+                    cls.__timers.items()
+                )),
+                'counters': dict(cls.__counters)
+            }
+
+    @classmethod
+    def addHook(cls, hook):
+        """
+        Add a callable called for each recorded value while enabled.
+
+        The hook is called with the kind ("timer" or "counter"), the name
+        and the value (seconds or increment) from the thread that recorded
+        it, so it needs to be cheap.
+        """
+        with cls.__lock:
+            cls.__hooks = cls.__hooks + [hook]
+
+    @classmethod
+    def removeHook(cls, hook):
+        """
+        Remove a hook (nothing happens when it has not been added).
+        """
+        with cls.__lock:
+            cls.__hooks = list(filter(lambda x: x is not hook, cls.__hooks))
+
+    @classmethod
+    def count(cls, name, value=1):
+        """
+        Increment a counter (nothing happens while disabled).
+        """
+        if not cls.enabled:
+            return
+
+        with cls.__lock:
+            cls.__counters[name] = cls.__counters.get(name, 0) + value
+            hooks = cls.__hooks
+
+        for hook in hooks:
+            hook('counter', name, value)
+
+    @classmethod
+    def record(cls, name, seconds):
+        """
+        Record a call to a timer (nothing happens while disabled).
+        """
+        if not cls.enabled:
+            return
+
+        with cls.__lock:
+            timer = cls.__timers.get(name)
+            if timer is None:
+                cls.__timers[name] = [1, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds > timer[2]:
+                    timer[2] = seconds
+            hooks = cls.__hooks
+
+        for hook in hooks:
+            hook('timer', name, seconds)
+
+    @classmethod
+    def timer(cls, name):
+        """
+        Return a context manager recording the time spent inside of it.
+
+        While disabled the context manager does not record anything.
+        """
+        if not cls.enabled:
+            return InstrumentationTimer(None)
+
+        return InstrumentationTimer(name)
+
+    @classmethod
+    def instrument(cls, owner, methodNames):
+        """
+        Register methods of a class to be timed while enabled.
+
+        Each method is recorded by a timer named after the class and the
+        method (for instance, "Loader.softwares"). Methods inherited by
+        subclasses are recorded under the name of the class defining them.
+        """
+        with cls.__lock:
+            for methodName in methodNames:
+                original = owner.__dict__[methodName]
+                instrumented = cls.__instrumentedMethod(
+                    '{0}.{1}'.format(owner.__name__, methodName),
+                    original
+                )
+                cls.__methods.append((owner, methodName, original, instrumented))
+
+                if cls.enabled:
+                    setattr(owner, methodName, instrumented)
+
+    @classmethod
+    def __instrumentedMethod(cls, timerName, method):
+        """
+        Return a version of the method recording its calls.
+
+        @private
+        """
+        # class and static methods are instrumented through their function
+        if isinstance(method, (classmethod, staticmethod)):
+            return type(method)(cls.__instrumentedMethod(timerName, method.__func__))
+
+        @functools.wraps(method)
+        def instrumented(*args, **kwargs):
+            start = clock()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                cls.record(timerName, clock() - start)
+
+        return instrumented
+
+class InstrumentationTimer(object):
+    """
+    Context manager recording the time spent inside of it (@see Instrumentation.timer).
+    """
+
+    __slots__ = ('__name', '__start')
+
+    def __init__(self, name):
+        """
+        Create a timer (timers without a name do not record anything).
+        """
+        self.__name = name
+        self.__start = None
+
+    def __enter__(self):
+        """
+        Start timing.
+        """
+        if self.__name is not None:
+            self.__start = clock()
+
+        return self
+
+    def __exit__(self, *args):
+        """
+        Record the time spent since entering.
+        """
+        if self.__name is not None:
+            Instrumentation.record(self.__name, clock() - self.__start)
@@ -0,0 +1,87 @@
+import sys
+import types
+import importlib
+
+class LazyModule(types.ModuleType):
+    """
+    Package whose attributes are only imported when they are first accessed.
+
+    Packages install it at the end of their __init__ (@see install), listing
+    the (attribute name, submodule) pairs they expose. Importing the package
+    is then almost free, the submodules (and their dependencies, for
+    instance json) are only imported by the code that actually uses them.
+
+    Attributes named after the submodule defining them (for instance, the
+    Query class defined by the Query submodule) keep referring to the
+    attribute rather than to the submodule, as they did when imported
+    eagerly. Python versions without support for replacing the class of a
+    module import everything eagerly.
+    """
+
+    def __getattr__(self, name):
+        """
+        Import the attribute from its submodule.
+        """
+        submoduleName = self.__dict__.get('_LazyModule__attributes', {}).get(name)
+        if submoduleName is None:
+            raise AttributeError(
+                "module '{0}' has no attribute '{1}'".format(self.__name__, name)
+            )
+
+        value = self.__attribute(name, importlib.import_module(submoduleName, self.__name__))
+        setattr(self, name, value)
+
+        return value
+
+    def __setattr__(self, name, value):
+        """
+        Set an attribute keeping the attributes named after their submodules.
+        """
+        # the import system binds submodules to their package once loaded
+        submoduleName = self.__dict__.get('_LazyModule__attributes', {}).get(name)
+        if isinstance(value, types.ModuleType) and submoduleName is not None and \
+                value.__name__ == self.__name__ + submoduleName:
+            value = self.__attribute(name, value)
+
+        super(LazyModule, self).__setattr__(name, value)
+
+    def __dir__(self):
+        """
+        Return the attribute names including the ones not imported yet.
+        """
+        return sorted(set(self.__dict__.keys()).union(
+            self.__dict__.get('_LazyModule__attributes', {}).keys()
+        ))
+
+    @classmethod
+    def install(cls, moduleName, attributes):
+        """
+        Make the module lazy.
+
+        The attributes are a list of (attribute name, relative submodule
+        name) pairs. Submodules exposed directly use their own name as
+        attribute (for instance, ('Loader', '.Loader') for a subpackage).
+        """
+        module = sys.modules[moduleName]
+
+        # eager import
+        if sys.version_info < (3, 5):
+            for name, submoduleName in attributes:
+                submodule = importlib.import_module(submoduleName, moduleName)
+                setattr(module, name, cls.__attribute(name, submodule))
+            return
+
+        module.__dict__['_LazyModule__attributes'] = dict(attributes)
+        module.__class__ = cls
+
+    @staticmethod
+    def __attribute(name, submodule):
+        """
+        Return the attribute defined by the submodule (the submodule itself for subpackages).
+
+        @private
+        """
+        if hasattr(submodule, '__path__') and submodule.__name__.endswith('.' + name):
+            return submodule
+
+        return getattr(submodule, name)
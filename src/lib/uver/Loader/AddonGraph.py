@@ -0,0 +1,176 @@
+class AddonGraph(object):
+    """
+    Graph of the addon relationships between softwares.
+
+    Each software points to its addons (forward adjacency) and each addon
+    points back to the softwares using it (reverse adjacency). Since addons
+    are softwares as well, the transitive queries follow addons of addons,
+    for instance {@link transitiveDependents} tells every software affected
+    by a version change of a software.
+
+    The graph is built in a single pass over the info, therefore addons
+    without a software version (@see missing) and cycles (@see cycles) can
+    be reported without creating any software.
+    """
+
+    def __init__(self, softwareNames, addons):
+        """
+        Create an addon graph.
+
+        The softwareNames are the names of the softwares that have a version,
+        addons is a dict of software name to the addon names of the software.
+        """
+        self.__softwareNames = frozenset(softwareNames)
+        self.__addons = {}
+        self.__dependents = {}
+        self.__missing = []
+
+        for softwareName, addonNames in addons.items():
+            addonNames = tuple(sorted(addonNames))
+            if not addonNames:
+                continue
+
+            self.__addons[softwareName] = addonNames
+            for addonName in addonNames:
+                self.__dependents.setdefault(addonName, []).append(softwareName)
+
+                if addonName not in self.__softwareNames:
+                    self.__missing.append((softwareName, addonName))
+
+        for addonName, softwareNames in self.__dependents.items():
+            self.__dependents[addonName] = tuple(sorted(softwareNames))
+
+        self.__missing.sort()
+        self.__cycles = None
+
+    def addons(self, name):
+        """
+        Return the sorted list of addon names used directly by the software.
+        """
+        return list(self.__addons.get(name, ()))
+
+    def dependents(self, name):
+        """
+        Return the sorted list of software names using the addon directly.
+        """
+        return list(self.__dependents.get(name, ()))
+
+    def transitiveAddons(self, name):
+        """
+        Return the sorted list of addon names used by the software (directly or not).
+        """
+        return self.__reachable(name, self.__addons)
+
+    def transitiveDependents(self, name):
+        """
+        Return the sorted list of software names using the addon (directly or not).
+        """
+        return self.__reachable(name, self.__dependents)
+
+    def missing(self):
+        """
+        Return the sorted list of (software name, addon name) pairs where the addon has no version.
+        """
+        return list(self.__missing)
+
+    def cycles(self):
+        """
+        Return the list of cycles, each cycle is a sorted list of software names.
+
+        A software using itself as addon is reported as a cycle as well.
+        """
+        if self.__cycles is None:
+            self.__cycles = self.__stronglyConnected()
+
+        return list(map(list, self.__cycles))
+
+    def __reachable(self, name, adjacency):
+        """
+        Return the sorted list of names reachable from the name.
+
+        @private
+        """
+        result = set()
+        pending = list(adjacency.get(name, ()))
+        while pending:
+            current = pending.pop()
+            if current in result:
+                continue
+
+            result.add(current)
+            pending.extend(adjacency.get(current, ()))
+
+        return sorted(result)
+
+    def __stronglyConnected(self):
+        """
+        Return the sorted cycles found through Tarjan's algorithm (iterative).
+
+        @private
+        """
+        tarjan = {
+            'indexes': {},
+            'lowLinks': {},
+            'stack': [],
+            'onStack': set(),
+            'frames': [],
+            'cycles': []
+        }
+        indexes = tarjan['indexes']
+        lowLinks = tarjan['lowLinks']
+
+        for root in sorted(self.__addons.keys()):
+            if root in indexes:
+                continue
+
+            self.__visitNode(root, tarjan)
+            while tarjan['frames']:
+                node, children = tarjan['frames'][-1]
+                child = next(children, None)
+
+                if child is None:
+                    self.__leaveNode(tarjan)
+                elif child not in indexes:
+                    self.__visitNode(child, tarjan)
+                elif child in tarjan['onStack']:
+                    lowLinks[node] = min(lowLinks[node], indexes[child])
+
+        return sorted(tarjan['cycles'])
+
+    def __visitNode(self, node, tarjan):
+        """
+        Push a frame for the node (holding an iterator over its addons) to the Tarjan state.
+
+        @private
+        """
+        tarjan['indexes'][node] = tarjan['lowLinks'][node] = len(tarjan['indexes'])
+        tarjan['stack'].append(node)
+        tarjan['onStack'].add(node)
+        tarjan['frames'].append((node, iter(self.__addons.get(node, ()))))
+
+    def __leaveNode(self, tarjan):
+        """
+        Pop the frame of a node whose addons were visited, collecting its component when it is a cycle.
+
+        @private
+        """
+        indexes = tarjan['indexes']
+        lowLinks = tarjan['lowLinks']
+        node = tarjan['frames'].pop()[0]
+        if tarjan['frames']:
+            parent = tarjan['frames'][-1][0]
+            lowLinks[parent] = min(lowLinks[parent], lowLinks[node])
+
+        if lowLinks[node] != indexes[node]:
+            return
+
+        component = []
+        while True:
+            member = tarjan['stack'].pop()
+            tarjan['onStack'].discard(member)
+            component.append(member)
+            if member == node:
+                break
+
+        if len(component) > 1 or node in self.__addons.get(node, ()):
+            tarjan['cycles'].append(tuple(sorted(component)))
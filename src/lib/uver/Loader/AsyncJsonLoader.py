@@ -0,0 +1,180 @@
+import asyncio
+import functools
+from .JsonLoader import JsonLoader
+
+class AsyncJsonLoader(object):
+    """
+    Asyncio front-end for a {@link JsonLoader}.
+
+    Reading and decoding json files runs in an executor (so the event loop
+    is never blocked) with at most concurrency files in flight at the same
+    time. Changes are applied to the loader in the order the methods were
+    called, regardless of which file finishes loading first, therefore the
+    loader ends up in the same state as calling the synchronous methods in
+    that order.
+
+    The loader is shared with the synchronous code (@see loader). The
+    changes are applied by the executor, so the event loop thread never has
+    changes of its own waiting to be committed, therefore taking a snapshot
+    from it (for instance, loader().snapshot()) never waits for the changes
+    being applied (@see Loader.snapshot).
+    """
+
+    def __init__(self, loader=None, concurrency=8, executor=None):
+        """
+        Create an async json loader.
+
+        The executor (None for the default executor of the event loop) runs
+        the file reads, json decoding and software creation.
+        """
+        self.__loader = JsonLoader() if loader is None else loader
+        self.__concurrency = concurrency
+        self.__executor = executor
+        self.__semaphore = None
+        self.__lastChange = None
+        self.__pendingSoftwares = {}
+
+    def loader(self):
+        """
+        Return the json loader holding the software and addon info.
+        """
+        return self.__loader
+
+    async def addFromJson(self, jsonContents):
+        """
+        Add softwares and addons from json contents (@see JsonLoader.addFromJson).
+        """
+        await self.__change(None, functools.partial(self.__loader.addFromJson, jsonContents))
+
+    async def addFromJsonFile(self, fileName):
+        """
+        Add json from a file (@see JsonLoader.addFromJsonFile).
+        """
+        await self.__change(
+            self.__loadJsonFiles([fileName]),
+            self.__loader.addLoadedJsonFiles
+        )
+
+    async def addFromJsonDirectory(self, directory):
+        """
+        Add json from inside of a directory with json files (@see JsonLoader.addFromJsonDirectory).
+
+        The directory is tracked for reloads (@see reloadJsonDirectory).
+        """
+        await self.__change(
+            self.__loadJsonDirectory(directory),
+            functools.partial(self.__addLoadedJsonDirectory, directory)
+        )
+
+    async def reloadJsonDirectory(self, directory):
+        """
+        Reload the json files from a directory that have changed (@see JsonLoader.reloadJsonDirectory).
+
+        Return a dict with the lists of "added", "changed" and "removed" files.
+        """
+        return await self.__change(
+            None,
+            functools.partial(self.__loader.reloadJsonDirectory, directory, self.__concurrency)
+        )
+
+    async def softwares(self, env={}, lazy=False):
+        """
+        Return a list of softwares based on the software/addon info (@see Loader.softwares).
+
+        The softwares are created in the executor. Concurrent calls for the
+        same snapshot and env share the same work (lazy lists are shared as
+        well, while regular lists are copied for each caller).
+        """
+        snapshot = self.__loader.snapshot()
+        key = (snapshot, frozenset(env.items()), lazy)
+
+        future = self.__pendingSoftwares.get(key)
+        if future is None:
+            future = asyncio.ensure_future(
+                self.__runInExecutor(snapshot.softwares, dict(env), lazy)
+            )
+            self.__pendingSoftwares[key] = future
+            future.add_done_callback(lambda x: self.__pendingSoftwares.pop(key, None))
+
+        result = await asyncio.shield(future)
+
+        # each caller gets its own list
+        return result if lazy else list(result)
+
+    async def uverVersions(self, env={}):
+        """
+        Return a dict with the uver names and versions of all softwares (@see Loader.uverVersions).
+        """
+        return await self.__runInExecutor(self.__loader.snapshot().uverVersions, dict(env))
+
+    async def __loadJsonFiles(self, fileNames):
+        """
+        Return the loaded files (@see JsonLoader.loadJsonFile) in the same order.
+
+        @private
+        """
+        if self.__semaphore is None:
+            self.__semaphore = asyncio.Semaphore(self.__concurrency)
+
+        async def loadJsonFile(fileName):
+            async with self.__semaphore:
+                return await self.__runInExecutor(self.__loader.loadJsonFile, fileName)
+
+        return await asyncio.gather(*map(loadJsonFile, fileNames))
+
+    async def __loadJsonDirectory(self, directory):
+        """
+        Return the loaded json files of the directory (@see JsonLoader.jsonFileNames).
+
+        @private
+        """
+        fileNames = await self.__runInExecutor(self.__loader.jsonFileNames, directory)
+
+        return await self.__loadJsonFiles(fileNames)
+
+    async def __change(self, loading, change):
+        """
+        Apply a change to the loader after the changes requested before it.
+
+        The loading (a coroutine or None) runs right away, its result is
+        passed to the change, which runs in the executor once the previous
+        changes are done.
+
+        @private
+        """
+        loop = asyncio.get_event_loop()
+        previous = self.__lastChange
+        current = loop.create_future()
+        self.__lastChange = current
+
+        try:
+            arguments = () if loading is None else (await loading,)
+            if previous is not None:
+                await asyncio.wait([previous])
+
+            future = loop.run_in_executor(self.__executor, change, *arguments)
+        except BaseException:
+            current.set_result(None)
+            raise
+
+        # the next change waits for this one to finish even when this
+        # coroutine gets cancelled
+        future.add_done_callback(lambda x: current.set_result(None))
+
+        return await asyncio.shield(future)
+
+    def __addLoadedJsonDirectory(self, directory, loadedFiles):
+        """
+        Add the loaded files as the contents of the directory.
+
+        @private
+        """
+        self.__loader.addLoadedJsonFiles(loadedFiles, directory)
+
+    def __runInExecutor(self, function, *args):
+        """
+        Return a future running the function in the executor.
+
+        @private
+        """
+        return asyncio.get_event_loop().run_in_executor(self.__executor, function, *args)
@@ -0,0 +1,460 @@
+import os
+import json
+import struct
+import threading
+from ..Versioned import Versioned
+from ..Versioned import InvalidVersionError
+
+# compatibility with python 2/3
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+class InvalidBinaryFormatError(Exception):
+    """Invalid binary format error."""
+
+class BinaryFormat(object):
+    """
+    Compiled binary representation of the software and addon info.
+
+    The info (@see Loader.infos) is stored in a layout that can be read in
+    place (for instance, from a memory-mapped file shared by many processes):
+
+    - header: magic, number of records, number of softwares with a version
+    and number of softwares with addons
+    - record table: one fixed size record per software name (sorted by the
+    utf-8 encoded name), holding the location of the name, version and
+    options plus the range of its addons in the addon table
+    - addon table: one fixed size record per addon (sorted by software and
+    addon name), holding the location of the addon name and options
+    - heap: utf-8 encoded names, versions and options (encoded as json)
+
+    The info is exposed through read-only mappings that only decode the
+    entries that are accessed (@see softwareInfos, addonInfos).
+    """
+
+    __magic = b'UVERBIN\x01'
+    __headerStruct = struct.Struct('<8sIII')
+    __recordStruct = struct.Struct('<IIIIIIII')
+    __addonStruct = struct.Struct('<IIII')
+
+    # version offset used by softwares that only have addons
+    __noVersion = 0xFFFFFFFF
+
+    def __init__(self, data):
+        """
+        Create a binary format reader over the encoded data (bytes or mmap).
+        """
+        if len(data) < self.__headerStruct.size:
+            raise InvalidBinaryFormatError('Data is too small to be a binary uver config!')
+
+        magic, recordCount, softwareCount, addonCount = self.__headerStruct.unpack_from(data, 0)
+        if magic != self.__magic:
+            raise InvalidBinaryFormatError('Unexpected binary uver config header!')
+
+        self.__data = data
+        self.__recordCount = recordCount
+        self.__softwareCount = softwareCount
+        self.__addonCount = addonCount
+        self.__addonTableOffset = self.__headerStruct.size + recordCount * self.__recordStruct.size
+
+        if len(data) < self.__addonTableOffset:
+            raise InvalidBinaryFormatError('Binary uver config is truncated!')
+
+    def softwareInfos(self):
+        """
+        Return a read-only mapping with the software info.
+
+        Same format used by the "softwares" of {@link Loader.infos}.
+        """
+        return BinarySoftwareInfos(self, self.__softwareCount)
+
+    def addonInfos(self):
+        """
+        Return a read-only mapping with the addon info.
+
+        Same format used by the "addons" of {@link Loader.infos}.
+        """
+        return BinaryAddonInfos(self, self.__addonCount)
+
+    def recordCount(self):
+        """
+        Return the number of records (software names) in the data.
+        """
+        return self.__recordCount
+
+    def recordName(self, index):
+        """
+        Return the software name of the record at the index.
+        """
+        record = self.__record(index)
+
+        return self.__string(record[0], record[1])
+
+    def recordVersion(self, index):
+        """
+        Return the version of the record at the index (None when not defined).
+        """
+        record = self.__record(index)
+        if record[2] == self.__noVersion:
+            return None
+
+        return self.__string(record[2], record[3])
+
+    def recordOptions(self, index):
+        """
+        Return the options of the record at the index.
+        """
+        record = self.__record(index)
+
+        return self.__options(record[4], record[5])
+
+    def recordAddons(self, index):
+        """
+        Return the (start, count) range of the record addons in the addon table.
+        """
+        record = self.__record(index)
+
+        return (record[6], record[7])
+
+    def addonName(self, index):
+        """
+        Return the name of the addon at the index of the addon table.
+        """
+        addon = self.__addonStruct.unpack_from(
+            self.__data,
+            self.__addonTableOffset + index * self.__addonStruct.size
+        )
+
+        return self.__string(addon[0], addon[1])
+
+    def addonOptions(self, index):
+        """
+        Return the options of the addon at the index of the addon table.
+        """
+        addon = self.__addonStruct.unpack_from(
+            self.__data,
+            self.__addonTableOffset + index * self.__addonStruct.size
+        )
+
+        return self.__options(addon[2], addon[3])
+
+    def findRecord(self, name):
+        """
+        Return the index of the record for the software name (None when not found).
+
+        The records are sorted by name, so this is a binary search that only
+        compares the encoded names in place.
+        """
+        encodedName = name.encode('utf-8')
+        low = 0
+        high = self.__recordCount
+        while low < high:
+            middle = (low + high) // 2
+            record = self.__record(middle)
+            recordName = self.__data[record[0]:record[0] + record[1]]
+            if recordName < encodedName:
+                low = middle + 1
+            elif recordName > encodedName:
+                high = middle
+            else:
+                return middle
+
+        return None
+
+    @classmethod
+    def contents(cls, infos):
+        """
+        Return the binary data (bytes) encoding the info.
+        """
+        softwareInfos = infos['softwares']
+        addonInfos = infos['addons']
+
+        names = sorted(
+            set(softwareInfos.keys()).union(filter(lambda x: addonInfos[x], addonInfos.keys())),
+            key=lambda x: x.encode('utf-8')
+        )
+        addonCount = sum(map(len, addonInfos.values()))
+
+        heap = []
+        heapOffset = [
+            cls.__headerStruct.size +
+            len(names) * cls.__recordStruct.size +
+            addonCount * cls.__addonStruct.size
+        ]
+
+        def addToHeap(data):
+            offset = heapOffset[0]
+            heap.append(data)
+            heapOffset[0] += len(data)
+            return (offset, len(data))
+
+        def encodeOptions(options):
+            if not options:
+                return (0, 0)
+            return addToHeap(json.dumps(options, sort_keys=True).encode('utf-8'))
+
+        records = []
+        addons = []
+        softwareCount = 0
+        for name in names:
+            nameLocation = addToHeap(name.encode('utf-8'))
+            versionLocation = (cls.__noVersion, 0)
+            optionsLocation = (0, 0)
+            if name in softwareInfos:
+                version = softwareInfos[name]['version']
+                if not Versioned.isValidVersion(version):
+                    raise InvalidVersionError(
+                        'version needs to be defined as valid string "{0}"'.format(
+                            version
+                        )
+                    )
+
+                softwareCount += 1
+                versionLocation = addToHeap(version.encode('utf-8'))
+                optionsLocation = encodeOptions(softwareInfos[name]['options'])
+
+            softwareAddons = addonInfos.get(name, {})
+            records.append(cls.__recordStruct.pack(
+                *(nameLocation + versionLocation + optionsLocation + (len(addons), len(softwareAddons)))
+            ))
+
+            for addonName in sorted(softwareAddons.keys(), key=lambda x: x.encode('utf-8')):
+                addons.append(cls.__addonStruct.pack(
+                    *(addToHeap(addonName.encode('utf-8')) + encodeOptions(softwareAddons[addonName]['options']))
+                ))
+
+        header = cls.__headerStruct.pack(
+            cls.__magic,
+            len(names),
+            softwareCount,
+            len(list(filter(None, addonInfos.values())))
+        )
+
+        return b''.join([header] + records + addons + heap)
+
+    @classmethod
+    def write(cls, fileName, infos):
+        """
+        Write the info to a binary file (replacing it atomically).
+
+        Since the file is replaced rather than modified, processes that have
+        the previous file memory-mapped keep reading a consistent copy.
+        """
+        temporaryFileName = '{0}.{1}.{2}.tmp'.format(
+            fileName,
+            os.getpid(),
+            threading.current_thread().ident
+        )
+        with open(temporaryFileName, 'wb') as f:
+            f.write(cls.contents(infos))
+
+        if hasattr(os, 'replace'):
+            os.replace(temporaryFileName, fileName)
+        else:
+            os.rename(temporaryFileName, fileName)
+
+    def __record(self, index):
+        """
+        Return the unpacked record at the index.
+
+        @private
+        """
+        if not 0 <= index < self.__recordCount:
+            raise IndexError('record index out of range')
+
+        return self.__recordStruct.unpack_from(
+            self.__data,
+            self.__headerStruct.size + index * self.__recordStruct.size
+        )
+
+    def __string(self, offset, length):
+        """
+        Return the string stored in the heap.
+
+        @private
+        """
+        return self.__data[offset:offset + length].decode('utf-8')
+
+    def __options(self, offset, length):
+        """
+        Return the options stored in the heap.
+
+        @private
+        """
+        if not length:
+            return {}
+
+        return json.loads(self.__string(offset, length))
+
+class BinarySoftwareInfos(Mapping):
+    """
+    Read-only mapping of software name to software info backed by {@link BinaryFormat}.
+    """
+
+    def __init__(self, binaryFormat, count):
+        """
+        Create a software info mapping.
+        """
+        self.__binaryFormat = binaryFormat
+        self.__count = count
+
+    def __getitem__(self, name):
+        """
+        Return the info (version and options) of a software.
+
+        The options are only decoded when accessed (@see BinarySoftwareInfo).
+        """
+        index = self.__binaryFormat.findRecord(name)
+        version = None if index is None else self.__binaryFormat.recordVersion(index)
+        if version is None:
+            raise KeyError(name)
+
+        return BinarySoftwareInfo(self.__binaryFormat, index, version)
+
+    def __contains__(self, name):
+        """
+        Return a boolean telling if the software has info.
+        """
+        index = self.__binaryFormat.findRecord(name)
+
+        return index is not None and self.__binaryFormat.recordVersion(index) is not None
+
+    def __iter__(self):
+        """
+        Iterate over the software names.
+        """
+        for index in range(self.__binaryFormat.recordCount()):
+            if self.__binaryFormat.recordVersion(index) is not None:
+                yield self.__binaryFormat.recordName(index)
+
+    def __len__(self):
+        """
+        Return the number of softwares.
+        """
+        return self.__count
+
+class BinarySoftwareInfo(Mapping):
+    """
+    Read-only mapping with the version and options of a software backed by {@link BinaryFormat}.
+
+    The options are decoded the first time they are accessed, so looking up
+    the version of a software (for instance, to resolve the version of an
+    addon) does not decode its options.
+    """
+
+    __keys = ('version', 'options')
+
+    def __init__(self, binaryFormat, index, version):
+        """
+        Create a software info mapping for the record at the index.
+        """
+        self.__binaryFormat = binaryFormat
+        self.__index = index
+        self.__version = version
+        self.__options = None
+
+    def __getitem__(self, key):
+        """
+        Return the version or the options of the software.
+        """
+        if key == 'version':
+            return self.__version
+
+        if key == 'options':
+            if self.__options is None:
+                self.__options = self.__binaryFormat.recordOptions(self.__index)
+            return self.__options
+
+        raise KeyError(key)
+
+    def __iter__(self):
+        """
+        Iterate over the keys of the info.
+        """
+        return iter(self.__keys)
+
+    def __len__(self):
+        """
+        Return the number of keys of the info.
+        """
+        return len(self.__keys)
+
+class BinaryAddonInfos(Mapping):
+    """
+    Read-only mapping of software name to addon infos backed by {@link BinaryFormat}.
+    """
+
+    def __init__(self, binaryFormat, count):
+        """
+        Create an addon info mapping.
+        """
+        self.__binaryFormat = binaryFormat
+        self.__count = count
+
+    def __getitem__(self, name):
+        """
+        Return a mapping with the addons of a software.
+        """
+        index = self.__binaryFormat.findRecord(name)
+        if index is None:
+            raise KeyError(name)
+
+        start, count = self.__binaryFormat.recordAddons(index)
+        if not count:
+            raise KeyError(name)
+
+        return BinarySoftwareAddonInfos(self.__binaryFormat, start, count)
+
+    def __iter__(self):
+        """
+        Iterate over the names of the softwares that have addons.
+        """
+        for index in range(self.__binaryFormat.recordCount()):
+            if self.__binaryFormat.recordAddons(index)[1]:
+                yield self.__binaryFormat.recordName(index)
+
+    def __len__(self):
+        """
+        Return the number of softwares that have addons.
+        """
+        return self.__count
+
+class BinarySoftwareAddonInfos(Mapping):
+    """
+    Read-only mapping of addon name to addon info backed by {@link BinaryFormat}.
+    """
+
+    def __init__(self, binaryFormat, start, count):
+        """
+        Create a mapping for the addons of a software.
+        """
+        self.__binaryFormat = binaryFormat
+        self.__start = start
+        self.__count = count
+
+    def __getitem__(self, name):
+        """
+        Return the info (options) of an addon.
+        """
+        for index in range(self.__start, self.__start + self.__count):
+            if self.__binaryFormat.addonName(index) == name:
+                return {
+                    'options': self.__binaryFormat.addonOptions(index)
+                }
+
+        raise KeyError(name)
+
+    def __iter__(self):
+        """
+        Iterate over the addon names.
+        """
+        for index in range(self.__start, self.__start + self.__count):
+            yield self.__binaryFormat.addonName(index)
+
+    def __len__(self):
+        """
+        Return the number of addons.
+        """
+        return self.__count
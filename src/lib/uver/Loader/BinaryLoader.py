@@ -0,0 +1,90 @@
+import os
+import mmap
+from .Loader import Loader
+from .BinaryFormat import BinaryFormat, InvalidBinaryFormatError
+from .JsonLoader import InvalidFileError
+
+class BinaryLoader(Loader):
+    """
+    Loads a list of softwares from a binary file (@see Loader.writeBinary).
+
+    The file is memory-mapped and the info is read in place, entries are
+    only decoded when accessed. Therefore, processes loading the same file
+    share a single copy of it (through the page cache) rather than holding
+    their own parsed copy. Use lazy softwares (@see Loader.softwares) to
+    query the loader (@see Query) without creating all the softwares.
+
+    Only the lookups by name on the info (@see Loader.infos) read the file
+    in place (binary search over the records). Creating a query over the
+    lazy softwares still decodes every software name (and the addon names
+    when querying addons), and the non-lazy softwares decode all the entries
+    since the addon graph (@see AddonGraph) is built over them.
+
+    Changes made to the loader afterwards copy the info into memory first.
+
+    The file stays mapped until the loader is closed (@see close), the
+    loader can be used as a context manager to close it. The info (and the
+    snapshots or softwares) of a closed loader must not be used anymore.
+    """
+
+    def __init__(self):
+        """
+        Create a binary loader.
+        """
+        super(BinaryLoader, self).__init__()
+
+        self.__mappings = []
+
+    def loadFromBinaryFile(self, fileName):
+        """
+        Replace the info of the loader by the info from a binary file.
+        """
+        # making sure it's a valid file
+        if not (os.path.exists(fileName) and os.path.isfile(fileName)):
+            raise InvalidFileError(
+                'Invalid file "{0}"!'.format(fileName)
+            )
+
+        # mmap fails on empty files
+        if not os.path.getsize(fileName):
+            raise InvalidBinaryFormatError(
+                'Invalid binary file "{0}": the file is empty!'.format(fileName)
+            )
+
+        with open(fileName, 'rb') as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            binaryFormat = BinaryFormat(data)
+        except InvalidBinaryFormatError:
+            data.close()
+            raise
+
+        # the previous mappings are kept until the loader is closed since
+        # snapshots taken before may still be reading them
+        self.__mappings.append(data)
+        self.setInfos({
+            'softwares': binaryFormat.softwareInfos(),
+            'addons': binaryFormat.addonInfos()
+        })
+
+    def close(self):
+        """
+        Close the memory-mapped files, the info of the loader gets cleared.
+        """
+        self.setInfos({'softwares': {}, 'addons': {}})
+
+        while self.__mappings:
+            self.__mappings.pop().close()
+
+    def __enter__(self):
+        """
+        Return the loader itself (@see close).
+        """
+        return self
+
+    def __exit__(self, *args):
+        """
+        Close the loader.
+        """
+        self.close()
@@ -0,0 +1,184 @@
+import os
+import sys
+import marshal
+import socket
+import hashlib
+import threading
+
+class JsonCache(object):
+    """
+    Persistent cache of the software and addon info parsed from json files.
+
+    Each json file has an entry under the cache directory holding the info
+    parsed from the file (@see Loader.infos) encoded with marshal. Entries
+    are only written for files that were parsed successfully, the names and
+    versions are validated when the softwares get created (the same way as
+    for info parsed from the file). An entry is used when the file path,
+    modification time and size match. In case only the modification time or
+    the size differ, the hash of the contents is compared before parsing the
+    file again (for instance, files that were touched or copied around).
+
+    The cache is an optimization, failing to read or write an entry (for
+    instance, a read-only or full cache directory) falls back to parsing
+    the file.
+    """
+
+    # bumped whenever the entry layout changes
+    __formatVersion = 1
+
+    def __init__(self, directory):
+        """
+        Create a cache object.
+        """
+        if not os.path.isdir(directory):
+            try:
+                os.makedirs(directory)
+            except (IOError, OSError):
+                # the entries are not going to be written
+                pass
+
+        self.__directory = directory
+        self.__hits = 0
+        self.__misses = 0
+        self.__statsLock = threading.Lock()
+
+    def directory(self):
+        """
+        Return the directory used to store the cache entries.
+        """
+        return self.__directory
+
+    def infos(self, fileName, parse):
+        """
+        Return the info for the json file.
+
+        The callable parse receives the json contents and returns the info,
+        it's only called when there is no valid entry for the file.
+        """
+        fileName = os.path.abspath(fileName)
+        fileStat = os.stat(fileName)
+        mtime = getattr(fileStat, 'st_mtime_ns', fileStat.st_mtime)
+        entryPath = self.__entryPath(fileName)
+        entry = self.__readEntry(entryPath, fileName)
+
+        # fast path, nothing has changed since the entry was written
+        if entry is not None and entry[1] == mtime and entry[2] == fileStat.st_size:
+            self.__count(True)
+            return entry[4]
+
+        with open(fileName, 'rb') as f:
+            contents = f.read()
+        digest = hashlib.sha1(contents).hexdigest()
+
+        # the contents are still the same (only updating the stat info)
+        if entry is not None and entry[3] == digest:
+            self.__count(True)
+            infos = entry[4]
+        else:
+            self.__count(False)
+            infos = parse(contents.decode('utf-8'))
+
+        self.__writeEntry(
+            entryPath,
+            (fileName, mtime, fileStat.st_size, digest, infos)
+        )
+
+        return infos
+
+    def stats(self):
+        """
+        Return a dict with the hits and misses of the cache.
+        """
+        with self.__statsLock:
+            return {
+                'hits': self.__hits,
+                'misses': self.__misses
+            }
+
+    def __count(self, hit):
+        """
+        Count a hit or a miss (files can be loaded by multiple threads).
+
+        @private
+        """
+        with self.__statsLock:
+            if hit:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+
+    def __entryPath(self, fileName):
+        """
+        Return the location of the cache entry for the json file.
+
+        @private
+        """
+        return os.path.join(
+            self.__directory,
+            '{0}.uvercache'.format(
+                hashlib.sha1(fileName.encode('utf-8')).hexdigest()
+            )
+        )
+
+    def __readEntry(self, entryPath, fileName):
+        """
+        Return the entry data or None when it does not exist (or it's invalid).
+
+        @private
+        """
+        if not os.path.exists(entryPath):
+            return None
+
+        try:
+            with open(entryPath, 'rb') as f:
+                header, entry = marshal.load(f)
+
+            # making sure the entry has the expected layout, otherwise it's a miss
+            if header != self.__header() or not isinstance(entry, tuple) or len(entry) != 5 or \
+                    entry[0] != fileName or not isinstance(entry[4], dict):
+                return None
+        except (EOFError, ValueError, TypeError, IOError, OSError):
+            return None
+
+        return entry
+
+    def __writeEntry(self, entryPath, entry):
+        """
+        Write the cache entry (atomically), nothing happens when it fails.
+
+        @private
+        """
+        # the host name avoids collisions on caches shared through the network
+        temporaryPath = '{0}.{1}.{2}.{3}.tmp'.format(
+            entryPath,
+            socket.gethostname(),
+            os.getpid(),
+            threading.current_thread().ident
+        )
+        try:
+            with open(temporaryPath, 'wb') as f:
+                marshal.dump((self.__header(), entry), f)
+
+            if hasattr(os, 'replace'):
+                os.replace(temporaryPath, entryPath)
+            else:
+                os.rename(temporaryPath, entryPath)
+        except (IOError, OSError):
+            pass
+        finally:
+            if os.path.exists(temporaryPath):
+                try:
+                    os.remove(temporaryPath)
+                except (IOError, OSError):
+                    pass
+
+    @classmethod
+    def __header(cls):
+        """
+        Return the header used to identify compatible entries.
+
+        The marshal format is specific to the python version.
+
+        @private
+        """
+        return (cls.__formatVersion, tuple(sys.version_info[:2]))
@@ -1,7 +1,11 @@
 import os
 import glob
 import json
+import threading
+from ..Instrumentation import Instrumentation
 from .Loader import Loader
+from .Provenance import Provenance
+from .JsonStreamParser import JsonStreamParser, UnexpectedJsonStreamRootError
 
 # compatibility with python 2/3
 try:
@@ -30,8 +34,51 @@ class InvalidFileError(Exception):
 class JsonLoader(Loader):
     """
     Loads a list of softwares from a json.
+
+    Optionally, a cache directory can be provided to keep the info parsed
+    from json files on disk (@see JsonCache). Files that have not changed
+    since they were cached are loaded without being parsed again.
+
+    The loader also records where each software, addon and option came from
+    (@see provenance).
     """
 
+    def __init__(self, cacheDirectory=None, trackProvenance=True):
+        """
+        Create a json loader.
+
+        Provenance is recorded in bulk per loaded info (@see Provenance.addInfos),
+        disable trackProvenance to skip it entirely.
+        """
+        super(JsonLoader, self).__init__()
+
+        self.__trackedDirectories = {}
+        self.__provenance = Provenance() if trackProvenance else None
+        self.__cache = None
+        if cacheDirectory is not None:
+            # only imported when needed, keeping the import of the loader cheap
+            from .JsonCache import JsonCache
+
+            self.__cache = JsonCache(cacheDirectory)
+
+    def cache(self):
+        """
+        Return the cache used by the loader (None when caching is disabled).
+        """
+        return self.__cache
+
+    def provenance(self):
+        """
+        Return the table with the source of the entries added from json.
+
+        The source is the absolute path of the json file (None for contents
+        that were not read from a file) and the position is the index of the
+        software entry inside of the root object (@see Provenance).
+
+        Return None when the loader was created with trackProvenance disabled.
+        """
+        return self.__provenance
+
     def addFromJson(self, jsonContents):
         """
         Add softwares and addons from json contents.
@@ -60,14 +107,39 @@ class JsonLoader(Loader):
             }
         }
         """
-        contents = json.loads(jsonContents)
+        infos = self.__parseInfos(jsonContents)
+        self.addInfos(infos)
+        if self.__provenance is not None:
+            self.__provenance.addInfos(None, infos)
 
-        # root checking
-        if not isinstance(contents, dict):
+    def addFromJsonStream(self, stream, chunkSize=1024 * 1024):
+        """
+        Add softwares and addons from a stream of json contents.
+
+        The stream can be either a file object (read in chunks of chunkSize)
+        or an iterable of chunks (text or utf-8 encoded bytes). The contents
+        need to follow the format expected by {@link addFromJson}.
+
+        Each software is decoded as soon as its entry is complete
+        (@see JsonStreamParser), so the whole document is never held in
+        memory. The softwares are committed together when the stream ends,
+        when the stream fails to parse the softwares decoded before the
+        error are kept. The stream is read before taking the lock of the
+        loader, so readers of other threads are not held by it.
+        """
+        parsedInfos = []
+        try:
+            for softwareName, softwareContents in JsonStreamParser.entries(stream, chunkSize):
+                infos = {
+                    'softwares': {},
+                    'addons': {}
+                }
+                self.__addParsedSoftware(softwareName, softwareContents, infos)
+                parsedInfos.append(infos)
+        except UnexpectedJsonStreamRootError:
             raise UnexpectedRootContentError('Expecting object as root!')
-
-        for softwareName, softwareContents in contents.items():
-            self.__addParsedSoftware(softwareName, softwareContents)
+        finally:
+            self.__addParsedInfos(parsedInfos)
 
     def addFromJsonFile(self, fileName):
         """
@@ -76,22 +148,114 @@ class JsonLoader(Loader):
         The json file need to follow the format expected
         by {@link addFromJson}.
         """
+        self.addLoadedJsonFiles([self.loadJsonFile(fileName)])
+
+    def addFromJsonDirectory(self, directory, workers=None):
+        """
+        Add json from inside of a directory with json files.
+
+        The json file need to follow the format expected
+        by {@link addFromJson}. The files are loaded in alphabetical order,
+        therefore when a software is defined by more than one file the
+        definition from the last file wins.
+
+        When workers is greater than one, the files are read and decoded
+        concurrently by a pool of threads (useful when the files live in a
+        network file system). The decoded contents are still added to the
+        loader one file at a time following the same order used by the
+        serial load.
+
+        The info contributed by each file is tracked, so the directory can
+        be reloaded incrementally later (@see reloadJsonDirectory).
+        """
+        self.addLoadedJsonFiles(
+            self.__loadJsonFiles(self.jsonFileNames(directory), workers),
+            directory
+        )
+
+    def loadJsonFile(self, fileName):
+        """
+        Return (file name, stat key, info) loaded from a json file without adding it.
+
+        The loaded file can be added later through {@link addLoadedJsonFiles},
+        splitting the (slow) reading and decoding of the files from adding
+        them to the loader (@see AsyncJsonLoader). The stat key (modification
+        time and size) is queried before reading the file, so changes made
+        while the file is being read are detected by the next reload.
+        """
         # making sure it's a valid file
         if not (os.path.exists(fileName) and os.path.isfile(fileName)):
             raise InvalidFileError(
                 'Invalid file "{0}"!'.format(fileName)
             )
 
-        with open(fileName, 'r') as f:
-            contents = '\n'.join(f.readlines())
-            self.addFromJson(contents)
+        statKey = self.__statKey(fileName)
+        if self.__cache is None:
+            infos = self.__parseInfos(self.__readJsonFile(fileName))
+        else:
+            infos = self.__cache.infos(fileName, self.__parseInfos)
+
+        return (fileName, statKey, infos)
 
-    def addFromJsonDirectory(self, directory):
+    def addLoadedJsonFiles(self, loadedFiles, directory=None):
         """
-        Add json from inside of a directory with json files.
+        Add the files returned by {@link loadJsonFile} (in order).
 
-        The json file need to follow the format expected
-        by {@link addFromJson}.
+        When a directory is provided, the files are tracked as the contents
+        of the directory (the same way as {@link addFromJsonDirectory}), so
+        they need to be all the json files of the directory
+        (@see jsonFileNames).
+
+        The files are loaded (when given by a generator) before taking the
+        lock of the loader, so readers of other threads are not held by it.
+        """
+        loadedFiles = list(map(
+            lambda x: (os.path.abspath(x[0]), x[1], x[2]),
+            loadedFiles
+        ))
+
+        with self.batch():
+            for fileName, statKey, infos in loadedFiles:
+                self.addInfos(infos)
+
+            if directory is not None:
+                self.__trackedDirectories[os.path.abspath(directory)] = dict(map(
+                    lambda x: (x[0], (x[1], x[2])),
+                    loadedFiles
+                ))
+
+        if self.__provenance is not None:
+            for fileName, statKey, infos in loadedFiles:
+                self.__provenance.addInfos(fileName, infos)
+
+    @staticmethod
+    def jsonFileNames(directory):
+        """
+        Return the sorted list of json files (absolute paths) in the directory.
+        """
+        # making sure it's a valid directory
+        if not (os.path.exists(directory) and os.path.isdir(directory)):
+            raise InvalidDirectoryError(
+                'Invalid directory "{0}"!'.format(directory)
+            )
+
+        return sorted(glob.glob(os.path.join(os.path.abspath(directory), '*.json')))
+
+    def reloadJsonDirectory(self, directory, workers=None):
+        """
+        Reload the json files from a directory that have changed.
+
+        Only the files that were added, changed (based on the modification
+        time and size) or removed since the directory was loaded are parsed.
+        The softwares and addons defined by these files are computed again
+        based on all the files in the directory (following the same order
+        used by {@link addFromJsonDirectory}) and updated in place. It assumes
+        the directory owns these entries, definitions of the same entries
+        added from elsewhere are replaced.
+
+        In case the directory was not loaded before, it gets fully loaded.
+
+        Return a dict with the lists of "added", "changed" and "removed" files.
         """
         # making sure it's a valid directory
         if not (os.path.exists(directory) and os.path.isdir(directory)):
@@ -99,13 +263,250 @@ class JsonLoader(Loader):
                 'Invalid directory "{0}"!'.format(directory)
             )
 
-        # collecting the json files and loading them to the loader.
-        for fileName in glob.glob(os.path.join(directory, '*.json')):
-            self.addFromJsonFile(fileName)
+        trackedFiles = self.__trackedDirectories.get(os.path.abspath(directory))
+        if trackedFiles is None:
+            self.addFromJsonDirectory(directory, workers)
+            return {
+                'added': sorted(self.__trackedDirectories[os.path.abspath(directory)].keys()),
+                'changed': [],
+                'removed': []
+            }
+
+        changes = self.__directoryChanges(trackedFiles, self.jsonFileNames(directory))
 
-    def __addParsedSoftware(self, softwareName, softwareContents):
+        # parsing everything before touching the loader, so a file that fails
+        # to parse leaves the loader (and the tracked files) as they were
+        loadedFiles = list(self.__loadJsonFiles(
+            sorted(changes['added'] + changes['changed']),
+            workers
+        ))
+
+        affectedSoftwares, affectedAddons = self.__affectedEntries(
+            list(map(lambda x: trackedFiles[x][1], changes['changed'] + changes['removed'])) +
+            list(map(lambda x: x[2], loadedFiles))
+        )
+
+        # computing the affected entries again from all files
+        updatedFiles = dict(trackedFiles)
+        for fileName in changes['removed']:
+            del updatedFiles[fileName]
+
+        for fileName, statKey, infos in loadedFiles:
+            updatedFiles[fileName] = (statKey, infos)
+
+        mergedInfos = self.__mergeAffectedInfos(updatedFiles, affectedSoftwares, affectedAddons)
+
+        # swapping the entries in a single commit
+        with self.batch():
+            for softwareName in affectedSoftwares:
+                self.removeSoftwareInfo(softwareName)
+
+            for softwareName, addonName in affectedAddons:
+                self.removeAddonInfo(softwareName, addonName)
+
+            self.addInfos(mergedInfos)
+
+        self.__trackedDirectories[os.path.abspath(directory)] = updatedFiles
+
+        # recording the sources of the affected entries again
+        if self.__provenance is not None:
+            self.__provenance.discardMany(affectedSoftwares, affectedAddons)
+            for fileName in sorted(updatedFiles.keys()):
+                self.__provenance.addInfos(
+                    fileName,
+                    updatedFiles[fileName][1],
+                    affectedSoftwares,
+                    affectedAddons
+                )
+
+        return changes
+
+    def watchJsonDirectory(self, directory, interval=1.0, callback=None, errorCallback=None, stopEvent=None, workers=None):
         """
-        Add a software based on the parsed software contents.
+        Keep reloading a directory until the stop event is set.
+
+        The directory is polled every interval (in seconds) through
+        {@link reloadJsonDirectory}. The callback is called with the changes
+        whenever files were added, changed or removed. Errors raised while
+        reloading are passed to the errorCallback (the directory is polled
+        again in the next interval), when no errorCallback is provided the
+        error is raised.
+
+        This call blocks, use a thread to watch the directory in background
+        and a threading.Event as stopEvent to stop it.
+        """
+        if stopEvent is None:
+            stopEvent = threading.Event()
+
+        while True:
+            try:
+                changes = self.reloadJsonDirectory(directory, workers)
+            except Exception as err:
+                if errorCallback is None:
+                    raise
+                errorCallback(err)
+            else:
+                if callback is not None and any(changes.values()):
+                    callback(changes)
+
+            if stopEvent.wait(interval):
+                break
+
+    @classmethod
+    def __readJsonFile(cls, fileName):
+        """
+        Return the contents of a json file (read in a single call).
+
+        @private
+        """
+        # making sure it's a valid file
+        if not (os.path.exists(fileName) and os.path.isfile(fileName)):
+            raise InvalidFileError(
+                'Invalid file "{0}"!'.format(fileName)
+            )
+
+        with Instrumentation.timer('JsonLoader.read'):
+            with open(fileName, 'r') as f:
+                contents = f.read()
+
+        if Instrumentation.enabled:
+            Instrumentation.count('files')
+            Instrumentation.count('bytes', len(contents))
+
+        return contents
+
+    @staticmethod
+    def __statKey(fileName):
+        """
+        Return the modification time and size of a file.
+
+        @private
+        """
+        fileStat = os.stat(fileName)
+
+        return (getattr(fileStat, 'st_mtime_ns', fileStat.st_mtime), fileStat.st_size)
+
+    def __directoryChanges(self, trackedFiles, fileNames):
+        """
+        Return a dict with the lists of "added", "changed" and "removed" files compared to the tracked files.
+
+        @private
+        """
+        return {
+            'added': list(filter(lambda x: x not in trackedFiles, fileNames)),
+            'changed': list(filter(
+                lambda x: x in trackedFiles and trackedFiles[x][0] != self.__statKey(x),
+                fileNames
+            )),
+            'removed': sorted(set(trackedFiles.keys()).difference(fileNames))
+        }
+
+    @staticmethod
+    def __affectedEntries(infosList):
+        """
+        Return the set of software names and the set of (software name, addon name) defined by the infos.
+
+        @private
+        """
+        affectedSoftwares = set()
+        affectedAddons = set()
+        for infos in infosList:
+            affectedSoftwares.update(infos['softwares'].keys())
+            for softwareName, addons in infos['addons'].items():
+                affectedAddons.update(map(lambda x: (softwareName, x), addons.keys()))
+
+        return affectedSoftwares, affectedAddons
+
+    @staticmethod
+    def __mergeAffectedInfos(trackedFiles, affectedSoftwares, affectedAddons):
+        """
+        Return the info with the affected entries merged from the tracked files (in file name order).
+
+        @private
+        """
+        mergedInfos = {
+            'softwares': {},
+            'addons': {}
+        }
+        for fileName in sorted(trackedFiles.keys()):
+            infos = trackedFiles[fileName][1]
+            for softwareName in affectedSoftwares.intersection(infos['softwares'].keys()):
+                mergedInfos['softwares'][softwareName] = infos['softwares'][softwareName]
+
+            for softwareName, addonName in affectedAddons:
+                if addonName in infos['addons'].get(softwareName, {}):
+                    mergedInfos['addons'].setdefault(softwareName, {})[addonName] = \
+                        infos['addons'][softwareName][addonName]
+
+        return mergedInfos
+
+    def __loadJsonFiles(self, fileNames, workers):
+        """
+        Yield (file name, stat key, info) for each of the json files (in order).
+
+        @private
+        """
+        if workers is None or workers <= 1 or len(fileNames) <= 1:
+            for fileName in fileNames:
+                yield self.loadJsonFile(fileName)
+            return
+
+        from concurrent.futures import ThreadPoolExecutor
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # map yields the results in the order of the input
+            for loaded in executor.map(self.loadJsonFile, fileNames):
+                yield loaded
+
+    def __addParsedInfos(self, parsedInfos):
+        """
+        Add the info of each software entry of a stream in a single commit.
+
+        @private
+        """
+        with self.batch():
+            for infos in parsedInfos:
+                self.addInfos(infos)
+
+        if self.__provenance is not None:
+            for position, infos in enumerate(parsedInfos):
+                self.__provenance.addInfos(None, infos, firstPosition=position)
+
+    @classmethod
+    def __parseInfos(cls, jsonContents):
+        """
+        Return the info (@see Loader.infos) parsed from the json contents.
+
+        @private
+        """
+        infos = {
+            'softwares': {},
+            'addons': {}
+        }
+        with Instrumentation.timer('JsonLoader.decode'):
+            contents = json.loads(jsonContents)
+
+        cls.__addParsedContents(contents, infos)
+
+        return infos
+
+    @classmethod
+    def __addParsedContents(cls, contents, infos):
+        """
+        Add softwares based on the decoded json contents to the info.
+
+        @private
+        """
+        # root checking
+        if not isinstance(contents, dict):
+            raise UnexpectedRootContentError('Expecting object as root!')
+
+        for softwareName, softwareContents in contents.items():
+            cls.__addParsedSoftware(softwareName, softwareContents, infos)
+
+    @classmethod
+    def __addParsedSoftware(cls, softwareName, softwareContents, infos):
+        """
+        Add a software based on the parsed software contents to the info.
 
         @private
         """
@@ -134,15 +535,22 @@ class JsonLoader(Loader):
                 'Could not decode version for "{0}"'.format(softwareName)
             )
 
+        assert isinstance(options, dict), \
+            'options need to be a dictionary'
+
         # adding software
-        self.addSoftwareInfo(softwareName, version, options)
+        infos['softwares'][softwareName] = {
+            'version': version,
+            'options': dict(options)
+        }
 
         # adding addons
-        self.__addParsedAddons(softwareName, addons)
+        cls.__addParsedAddons(softwareName, addons, infos)
 
-    def __addParsedAddons(self, softwareName, addons):
+    @staticmethod
+    def __addParsedAddons(softwareName, addons, infos):
         """
-        Add an addon based on the parsed addon contents.
+        Add an addon based on the parsed addon contents to the info.
 
         @private
         """
@@ -159,4 +567,23 @@ class JsonLoader(Loader):
             if 'options' in addonData:
                 addonOptions = addonData['options']
 
-            self.addAddonInfo(softwareName, addonName, addonOptions)
+            assert isinstance(addonOptions, dict), \
+                'options need to be a dictionary'
+
+            if softwareName not in infos['addons']:
+                infos['addons'][softwareName] = {}
+
+            infos['addons'][softwareName][addonName] = {
+                'options': dict(addonOptions)
+            }
+
+
+Instrumentation.instrument(JsonLoader, (
+    'addFromJson',
+    'addFromJsonStream',
+    'addFromJsonFile',
+    'addFromJsonDirectory',
+    'reloadJsonDirectory',
+    'loadJsonFile',
+    'addLoadedJsonFiles'
+))
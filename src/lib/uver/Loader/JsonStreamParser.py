@@ -0,0 +1,412 @@
+import re
+import json
+import codecs
+
+class InvalidJsonStreamError(ValueError):
+    """Invalid json stream error."""
+
+class UnexpectedJsonStreamRootError(InvalidJsonStreamError):
+    """Unexpected json stream root error."""
+
+class JsonStreamParser(object):
+    """
+    Incremental parser for a json document that has an object as root.
+
+    The document is fed in chunks (@see feed) and the entries of the root
+    object are returned as (key, value) pairs as soon as each entry is
+    complete. Only the text of the entry being decoded is kept in memory,
+    therefore the memory used is bounded by the largest entry rather than
+    by the whole document.
+
+    Chunks can be either text or utf-8 encoded bytes.
+    """
+
+    # characters that need to be looked at outside and inside of strings
+    __structuralRegex = re.compile(r'[\[\]{}",]')
+    __stringRegex = re.compile(r'["\\]')
+    __whitespaceRegex = re.compile(r'\s*')
+    __valueEndCharacters = frozenset(' \t\n\r,}')
+    __jsonDecoder = json.JSONDecoder()
+
+    def __init__(self):
+        """
+        Create a json stream parser.
+        """
+        self.__buffer = ''
+        self.__parts = []
+        self.__start = 0
+        self.__position = 0
+        self.__state = 'root'
+        self.__depth = 0
+        self.__inString = False
+        self.__escaped = False
+        self.__scanning = False
+        self.__key = None
+        self.__decoder = codecs.getincrementaldecoder('utf-8')()
+        self.__handlers = {
+            'root': self.__parseRoot,
+            'firstKey': self.__parseKeyStart,
+            'nextKey': self.__parseKeyStart,
+            'key': self.__parseKey,
+            'colon': self.__parseColon,
+            'value': self.__parseValue,
+            'separator': self.__parseSeparator,
+            'done': self.__parseDone
+        }
+
+    def feed(self, chunk):
+        """
+        Add a chunk to the parser and return the list of completed entries.
+        """
+        if isinstance(chunk, bytes) and bytes is not str:
+            chunk = self.__decoder.decode(chunk)
+
+        # keeping the text of an incomplete key or value aside, it only
+        # gets joined once complete (@see __tokenText)
+        if self.__start < len(self.__buffer):
+            self.__parts.append(self.__buffer[self.__start:])
+        self.__buffer = chunk
+        self.__start = 0
+        self.__position = 0
+
+        return self.__parse()
+
+    def close(self):
+        """
+        Finish the parsing, failing when the document is incomplete.
+        """
+        self.feed(self.__decoder.decode(b'', True))
+
+        if self.__state == 'root':
+            raise UnexpectedJsonStreamRootError('Expecting object as root!')
+
+        if self.__state != 'done':
+            raise InvalidJsonStreamError('Unexpected end of json stream!')
+
+    @classmethod
+    def entries(cls, stream, chunkSize=1024 * 1024):
+        """
+        Yield the (key, value) entries of the root object from a stream.
+
+        The stream can be either a file object (read in chunks of chunkSize)
+        or an iterable of chunks.
+        """
+        if hasattr(stream, 'read'):
+            read = stream.read
+            stream = iter(lambda: read(chunkSize), read(0))
+
+        parser = cls()
+        for chunk in stream:
+            for entry in parser.feed(chunk):
+                yield entry
+        parser.close()
+
+    def __parse(self):
+        """
+        Parse the buffered text returning the completed entries.
+
+        Each state has a handler (@see __handlers) returning False when
+        more text is needed.
+
+        @private
+        """
+        result = []
+        while self.__handlers[self.__state](result):
+            pass
+
+        return result
+
+    def __parseRoot(self, result):
+        """
+        Parse the opening of the root object.
+
+        @private
+        """
+        token = self.__nextToken()
+        if token is None:
+            return False
+
+        if token != '{':
+            raise UnexpectedJsonStreamRootError('Expecting object as root!')
+
+        return self.__accept('firstKey')
+
+    def __parseKeyStart(self, result):
+        """
+        Parse the opening quote of a key (or the end of an empty root object).
+
+        @private
+        """
+        token = self.__nextToken()
+        if token is None:
+            return False
+
+        if token == '}' and self.__state == 'firstKey':
+            return self.__accept('done')
+
+        if token != '"':
+            raise InvalidJsonStreamError('Expecting property name!')
+
+        # the key text starts at the quote
+        self.__state = 'key'
+        self.__position += 1
+
+        return True
+
+    def __parseKey(self, result):
+        """
+        Parse the rest of a key.
+
+        @private
+        """
+        if not self.__scanString():
+            return False
+
+        self.__key = self.__decode(self.__tokenText())
+        self.__state = 'colon'
+
+        return True
+
+    def __parseColon(self, result):
+        """
+        Parse the colon following a key.
+
+        @private
+        """
+        token = self.__nextToken()
+        if token is None:
+            return False
+
+        if token != ':':
+            raise InvalidJsonStreamError(
+                'Expecting ":" after "{0}"!'.format(self.__key)
+            )
+
+        return self.__accept('value')
+
+    def __parseValue(self, result):
+        """
+        Parse the value of an entry adding the entry to the result.
+
+        @private
+        """
+        if not self.__scanning:
+            # optimistic decoding, the value is usually complete
+            if self.__nextToken() is None:
+                return False
+
+            value, valueEnd = self.__rawDecode(self.__start)
+            if valueEnd is not None:
+                self.__position = valueEnd
+                return self.__addEntry(result, value)
+
+            # otherwise looking for the end of the value as more chunks are fed
+            self.__scanning = True
+
+        if not self.__scanValue():
+            return False
+
+        valueText = self.__tokenText().strip()
+        if not valueText:
+            raise InvalidJsonStreamError(
+                'Expecting value for "{0}"!'.format(self.__key)
+            )
+
+        self.__scanning = False
+
+        return self.__addEntry(result, self.__decode(valueText))
+
+    def __parseSeparator(self, result):
+        """
+        Parse the separator following a value (or the end of the root object).
+
+        @private
+        """
+        token = self.__nextToken()
+        if token is None:
+            return False
+
+        if token == ',':
+            return self.__accept('nextKey')
+
+        if token == '}':
+            return self.__accept('done')
+
+        raise InvalidJsonStreamError('Expecting "," or "}"!')
+
+    def __parseDone(self, result):
+        """
+        Make sure only whitespace follows the root object.
+
+        @private
+        """
+        if self.__nextToken() is None:
+            return False
+
+        raise InvalidJsonStreamError('Unexpected data after the root object!')
+
+    def __nextToken(self):
+        """
+        Return the next character after the whitespace (None when more text is needed).
+
+        The text before it is dropped.
+
+        @private
+        """
+        self.__position = self.__whitespaceRegex.match(self.__buffer, self.__position).end()
+        self.__start = self.__position
+        if self.__parts:
+            self.__parts = []
+
+        if self.__position >= len(self.__buffer):
+            return None
+
+        return self.__buffer[self.__position]
+
+    def __accept(self, state):
+        """
+        Consume the current character moving to the state.
+
+        @private
+        """
+        self.__state = state
+        self.__position += 1
+        self.__start = self.__position
+
+        return True
+
+    def __addEntry(self, result, value):
+        """
+        Add the entry of the current key to the result.
+
+        @private
+        """
+        result.append((self.__key, value))
+        self.__key = None
+        self.__state = 'separator'
+
+        return True
+
+    def __tokenText(self):
+        """
+        Return the text of the key or value being parsed, including the parts from the previous chunks.
+
+        @private
+        """
+        text = self.__buffer[self.__start:self.__position]
+        if self.__parts:
+            text = ''.join(self.__parts) + text
+
+        return text
+
+    def __scanString(self):
+        """
+        Scan the buffer for the end of the current string.
+
+        Return True when the string is complete, the position is moved to
+        the end of the string.
+
+        @private
+        """
+        if self.__escaped:
+            # skipping the character escaped at the end of the previous chunk
+            if self.__position >= len(self.__buffer):
+                return False
+            self.__escaped = False
+            self.__position += 1
+
+        while True:
+            match = self.__stringRegex.search(self.__buffer, self.__position)
+            if match is None:
+                self.__position = len(self.__buffer)
+                return False
+
+            if match.group() == '"':
+                self.__position = match.end()
+                return True
+
+            # skipping the escaped character (when available)
+            if match.end() >= len(self.__buffer):
+                self.__escaped = True
+                self.__position = len(self.__buffer)
+                return False
+            self.__position = match.end() + 1
+
+    def __scanValue(self):
+        """
+        Scan the buffer for the end of the current value.
+
+        Return True when the value is complete (followed by "," or "}" in
+        the root object), the position is moved to the end of the value.
+
+        @private
+        """
+        while True:
+            if self.__inString:
+                if not self.__scanString():
+                    return False
+                self.__inString = False
+
+            match = self.__structuralRegex.search(self.__buffer, self.__position)
+            if match is None:
+                self.__position = len(self.__buffer)
+                return False
+
+            if match.group() == '"':
+                self.__inString = True
+            elif self.__endsValue(match.group()):
+                self.__position = match.start()
+                return True
+
+            self.__position = match.end()
+
+    def __endsValue(self, token):
+        """
+        Return a boolean telling if a structural character (other than quote) ends the value.
+
+        The depth of the value is updated by the brackets.
+
+        @private
+        """
+        if token in '[{':
+            self.__depth += 1
+            return False
+
+        if self.__depth == 0:
+            return True
+
+        if token != ',':
+            self.__depth -= 1
+
+        return False
+
+    def __rawDecode(self, start):
+        """
+        Return (value, end) for the value starting at the start position.
+
+        The end is None when the value could not be decoded from the buffer
+        or it may continue in the next chunk.
+
+        @private
+        """
+        try:
+            value, end = self.__jsonDecoder.raw_decode(self.__buffer, start)
+        except ValueError:
+            return (None, None)
+
+        if end >= len(self.__buffer) or self.__buffer[end] not in self.__valueEndCharacters:
+            return (None, None)
+
+        return (value, end)
+
+    @staticmethod
+    def __decode(text):
+        """
+        Return the decoded json text.
+
+        @private
+        """
+        try:
+            return json.loads(text)
+        except ValueError as err:
+            raise InvalidJsonStreamError(str(err))
@@ -0,0 +1,184 @@
+from .Loader import Loader
+
+class LayeredLoader(Loader):
+    """
+    Loads softwares by merging layers of software and addon info.
+
+    Each layer (for instance: site, show, sequence and shot) has a priority,
+    layers with a higher priority are merged on top of the lower ones (layers
+    with the same priority are merged by name). When a software (or addon)
+    is defined by more than one layer, the version comes from the highest
+    layer and the options are merged deeply (nested dicts are merged, any
+    other value is replaced).
+
+    The merge shares everything a layer does not change with the layers
+    below it, and the result of merging each prefix of the layers is cached.
+    Therefore, replacing a layer only merges that layer (and the ones above
+    it) on top of the cached result of the layers below. The merged info
+    still has one entry per software (copying the top level dicts is linear
+    on the number of softwares), however the software instances compiled
+    for the previous layers are reused for the entries the replaced layers
+    did not touch (@see Snapshot), so resolving after replacing a layer
+    (for instance, switching shots) only creates the softwares of the
+    previous and the new layer.
+
+    The info of the loader is replaced by the merged info whenever the
+    layers change, so changes made directly to the loader (for instance,
+    through {@link addSoftwareInfo}) are discarded at that point.
+    """
+
+    def __init__(self):
+        """
+        Create a layered loader.
+        """
+        super(LayeredLoader, self).__init__()
+
+        self.__layers = []
+        self.__merged = []
+
+    def setLayer(self, layerName, infos, priority=0):
+        """
+        Add (or replace) a layer.
+
+        The info can be either the info of a loader (@see Loader.infos) or a
+        loader itself. The info is owned by the layer from now on (it must
+        not be modified afterwards).
+        """
+        if isinstance(infos, Loader):
+            infos = infos.infos()
+
+        with self.batch():
+            layers = list(filter(lambda x: x[1] != layerName, self.__layers))
+            layers.append((priority, layerName, infos))
+            self.__setLayers(sorted(layers, key=lambda x: (x[0], x[1])))
+
+    def removeLayer(self, layerName):
+        """
+        Remove a layer (nothing happens when it does not exist).
+        """
+        with self.batch():
+            self.__setLayers(list(filter(lambda x: x[1] != layerName, self.__layers)))
+
+    def layerNames(self):
+        """
+        Return the list of layer names in the order they are merged.
+        """
+        return list(map(lambda x: x[1], self.__layers))
+
+    def layerPriority(self, layerName):
+        """
+        Return the priority of a layer.
+        """
+        return self.__layer(layerName)[0]
+
+    def layerInfos(self, layerName):
+        """
+        Return the info of a layer (without merging).
+        """
+        return self.__layer(layerName)[2]
+
+    @classmethod
+    def mergeInfos(cls, baseInfos, infos):
+        """
+        Return the info resulting from merging the info on top of the base info.
+
+        Neither input is modified, the result shares the entries that are
+        not affected by the info with the base info.
+        """
+        softwares = dict(baseInfos['softwares'])
+        for softwareName, softwareInfo in infos['softwares'].items():
+            baseSoftwareInfo = softwares.get(softwareName)
+            if baseSoftwareInfo is None:
+                softwares[softwareName] = softwareInfo
+            else:
+                softwares[softwareName] = {
+                    'version': softwareInfo['version'],
+                    'options': cls.mergeOptions(baseSoftwareInfo['options'], softwareInfo['options'])
+                }
+
+        addons = dict(baseInfos['addons'])
+        for softwareName, softwareAddons in infos['addons'].items():
+            baseSoftwareAddons = addons.get(softwareName)
+            if baseSoftwareAddons is None:
+                addons[softwareName] = softwareAddons
+                continue
+
+            mergedAddons = dict(baseSoftwareAddons)
+            for addonName, addonInfo in softwareAddons.items():
+                baseAddonInfo = mergedAddons.get(addonName)
+                if baseAddonInfo is None:
+                    mergedAddons[addonName] = addonInfo
+                else:
+                    mergedAddons[addonName] = {
+                        'options': cls.mergeOptions(baseAddonInfo['options'], addonInfo['options'])
+                    }
+
+            addons[softwareName] = mergedAddons
+
+        return {
+            'softwares': softwares,
+            'addons': addons
+        }
+
+    @classmethod
+    def mergeOptions(cls, baseOptions, options):
+        """
+        Return the options merged deeply on top of the base options.
+
+        Only the dicts along the merged values are created, everything else
+        is shared with the inputs.
+        """
+        if not options:
+            return baseOptions
+
+        if not baseOptions:
+            return options
+
+        result = dict(baseOptions)
+        for optionName, optionValue in options.items():
+            baseValue = result.get(optionName)
+            if isinstance(optionValue, dict) and isinstance(baseValue, dict):
+                result[optionName] = cls.mergeOptions(baseValue, optionValue)
+            else:
+                result[optionName] = optionValue
+
+        return result
+
+    def __layer(self, layerName):
+        """
+        Return the (priority, name, info) of a layer.
+
+        @private
+        """
+        for layer in self.__layers:
+            if layer[1] == layerName:
+                return layer
+
+        raise KeyError(layerName)
+
+    def __setLayers(self, layers):
+        """
+        Replace the layers, merging only the layers that have changed.
+
+        Needs to be called inside of a batch.
+
+        @private
+        """
+        # keeping the merges of the layers that did not change
+        unchanged = 0
+        for layer, previousLayer in zip(layers, self.__layers):
+            if layer[1] != previousLayer[1] or layer[2] is not previousLayer[2]:
+                break
+            unchanged += 1
+
+        merged = self.__merged[:unchanged]
+        for layer in layers[unchanged:]:
+            if merged:
+                merged.append(self.mergeInfos(merged[-1], layer[2]))
+            else:
+                merged.append(self.mergeInfos({'softwares': {}, 'addons': {}}, layer[2]))
+
+        self.__layers = layers
+        self.__merged = merged
+
+        self.setInfos(merged[-1] if merged else {'softwares': {}, 'addons': {}})
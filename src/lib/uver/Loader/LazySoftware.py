@@ -0,0 +1,80 @@
+import weakref
+from ..Versioned import Software
+
+class LazySoftware(Software):
+    """
+    Software that only creates its addons when they are accessed.
+
+    The addons are added by a callable (receiving the software) the first
+    time {@link addon}, {@link addonNames} or {@link addAddon} is called.
+    Loading the addons is not considered a change (@see watchAddons).
+    """
+
+    __slots__ = ('__addonsLoader', '__pendingWatchers')
+
+    def __init__(self, name, version, addonsLoader):
+        """
+        Create a lazy software object.
+        """
+        super(LazySoftware, self).__init__(name, version)
+
+        self.__addonsLoader = addonsLoader
+        self.__pendingWatchers = None
+
+    def addAddon(self, addon):
+        """
+        Add an addon to the software.
+        """
+        self.__loadAddons()
+
+        super(LazySoftware, self).addAddon(addon)
+
+    def addon(self, name):
+        """
+        Return an addon object.
+        """
+        self.__loadAddons()
+
+        return super(LazySoftware, self).addon(name)
+
+    def addonNames(self):
+        """
+        Return a list of addon names.
+        """
+        self.__loadAddons()
+
+        return super(LazySoftware, self).addonNames()
+
+    def watchAddons(self, revision):
+        """
+        Bump the revision whenever the addons of the software change.
+
+        The software only starts being watched once its addons are loaded.
+        """
+        if self.__addonsLoader is None:
+            super(LazySoftware, self).watchAddons(revision)
+        else:
+            self.__pendingWatchers = (self.__pendingWatchers or []) + [weakref.ref(revision)]
+
+    def __loadAddons(self):
+        """
+        Add the addons to the software in case they have not been loaded yet.
+
+        @private
+        """
+        addonsLoader = self.__addonsLoader
+        if addonsLoader is not None:
+            self.__addonsLoader = None
+            try:
+                addonsLoader(self)
+            except Exception:
+                self.__addonsLoader = addonsLoader
+                raise
+
+            # watching the addons from now on
+            pendingWatchers = self.__pendingWatchers
+            self.__pendingWatchers = None
+            for watcher in pendingWatchers or ():
+                revision = watcher()
+                if revision is not None:
+                    super(LazySoftware, self).watchAddons(revision)
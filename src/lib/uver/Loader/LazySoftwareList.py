@@ -0,0 +1,86 @@
+# compatibility with python 2/3
+try:
+    from collections.abc import Sequence
+except ImportError:
+    from collections import Sequence
+
+class LazySoftwareList(Sequence):
+    """
+    Sequence of softwares that are only created when accessed.
+
+    The names and the addon names of the softwares are known upfront, so
+    they can be queried (and indexed by {@link Query}) without creating any
+    software. Softwares created by the list are kept, so each element is
+    created at most once. Softwares added through {@link append} are stored
+    as they are.
+    """
+
+    def __init__(self, names, createSoftware, addonNames):
+        """
+        Create a lazy software list.
+
+        The callable createSoftware receives a software name and returns the
+        software instance, addonNames receives a software name and returns
+        the names of its addons.
+        """
+        self.__names = list(names)
+        self.__softwares = [None] * len(self.__names)
+        self.__createSoftware = createSoftware
+        self.__addonNames = addonNames
+
+    def names(self):
+        """
+        Return a list with the name of each software (without creating them).
+        """
+        return list(self.__names)
+
+    def name(self, index):
+        """
+        Return the name of the software at the index (without creating it).
+        """
+        return self.__names[index]
+
+    def addonNames(self, index):
+        """
+        Return the addon names of the software at the index.
+
+        The software is only used when it has been created already.
+        """
+        software = self.__softwares[index]
+        if software is not None:
+            return software.addonNames()
+
+        return self.__addonNames(self.__names[index])
+
+    def isCreated(self, index):
+        """
+        Return a boolean telling if the software at the index has been created.
+        """
+        return self.__softwares[index] is not None
+
+    def append(self, software):
+        """
+        Add a software (already created) to the end of the list.
+        """
+        self.__names.append(software.name())
+        self.__softwares.append(software)
+
+    def __getitem__(self, index):
+        """
+        Return the software at the index (creating it when necessary).
+        """
+        if isinstance(index, slice):
+            return list(map(self.__getitem__, range(*index.indices(len(self)))))
+
+        software = self.__softwares[index]
+        if software is None:
+            software = self.__createSoftware(self.__names[index])
+            self.__softwares[index] = software
+
+        return software
+
+    def __len__(self):
+        """
+        Return the number of softwares.
+        """
+        return len(self.__names)
@@ -1,9 +1,7 @@
-from ..Versioned import Versioned
-from ..Versioned import Software
-from ..Versioned import Addon
-
-class AddonNotFoundError(Exception):
-    """Addon not found in the softwares error."""
+import threading
+from contextlib import contextmanager
+from ..Instrumentation import Instrumentation
+from .Snapshot import Snapshot
 
 class Loader(object):
     """
@@ -11,14 +9,30 @@ class Loader(object):
 
     Returns a list of software instances based on the addon and software
     information (@see softwares)
+
+    The information is committed to immutable snapshots (@see snapshot).
+    Readers go through the current snapshot without taking any lock, while
+    writers change a draft that is swapped in as the next snapshot. Outside
+    of a batch (@see batch), pending changes are committed on the next read
+    when no other thread is changing the loader. A thread always sees its
+    own changes, it only waits for the lock when it has changes that have
+    not been committed yet. Writers that perform many changes from other
+    threads should use a batch, so readers don't see the changes partially
+    applied.
     """
 
     def __init__(self):
         """
         Create a software.
         """
-        self.__softwares = {}
-        self.__addons = {}
+        self.__snapshot = Snapshot({}, {})
+        self.__draftSoftwares = None
+        self.__draftAddons = None
+        self.__batchDepth = 0
+        self.__lock = threading.RLock()
+
+        # generation holding the latest changes made by each thread
+        self.__writes = threading.local()
 
     def addSoftwareInfo(self, softwareName, version, options={}):
         """
@@ -27,10 +41,11 @@ class Loader(object):
         assert isinstance(options, dict), \
             'options need to be a dictionary'
 
-        self.__softwares[softwareName] = {
-            'version': version,
-            'options': dict(options)
-        }
+        with self.__lock:
+            self.__draft()[0][softwareName] = {
+                'version': version,
+                'options': dict(options)
+            }
 
     def addAddonInfo(self, softwareName, addonName, options={}):
         """
@@ -39,104 +54,293 @@ class Loader(object):
         assert isinstance(options, dict), \
             'options need to be a dictionary'
 
-        if softwareName not in self.__addons:
-            self.__addons[softwareName] = {}
+        with self.__lock:
+            addons = self.__draft()[1]
+            if softwareName not in addons:
+                addons[softwareName] = {}
 
-        self.__addons[softwareName][addonName] = {
-            'options': dict(options)
+            addons[softwareName][addonName] = {
+                'options': dict(options)
+            }
+
+    def removeSoftwareInfo(self, softwareName):
+        """
+        Remove the info of a software (nothing happens when it does not exist).
+
+        The addons added to the software are kept.
+        """
+        with self.__lock:
+            softwares = self.__draft()[0]
+            if softwareName in softwares:
+                del softwares[softwareName]
+
+    def removeAddonInfo(self, softwareName, addonName):
+        """
+        Remove an addon from a software (nothing happens when it does not exist).
+        """
+        with self.__lock:
+            addons = self.__draft()[1]
+            if addonName in addons.get(softwareName, {}):
+                del addons[softwareName][addonName]
+                if not addons[softwareName]:
+                    del addons[softwareName]
+
+    def infos(self):
+        """
+        Return a dict with the software and addon info added to the loader.
+
+        Format:
+        {
+            "softwares": {
+                "<softwareName>": {"version": "<version>", "options": {...}}
+            },
+            "addons": {
+                "<softwareName>": {"<addonName>": {"options": {...}}}
+            }
         }
 
-    def softwares(self, env={}):
+        The dicts holding the options are shared with the loader and should
+        not be modified.
+        """
+        return self.snapshot().infos()
+
+    def addInfos(self, infos):
+        """
+        Add the software and addon info returned by {@link infos}.
+
+        The info is expected to be already validated, therefore it's added
+        as it is (the same way as calling {@link addSoftwareInfo} and
+        {@link addAddonInfo} for each entry).
+        """
+        with self.__lock:
+            softwares, addons = self.__draft()
+
+            for softwareName, softwareInfo in infos['softwares'].items():
+                softwares[softwareName] = {
+                    'version': softwareInfo['version'],
+                    'options': softwareInfo['options']
+                }
+
+            for softwareName, softwareAddons in infos['addons'].items():
+                if softwareName not in addons:
+                    addons[softwareName] = {}
+
+                for addonName, addonInfo in softwareAddons.items():
+                    addons[softwareName][addonName] = {
+                        'options': addonInfo['options']
+                    }
+
+        if Instrumentation.enabled:
+            self.__countInfos(infos)
+
+    def setInfos(self, infos):
+        """
+        Replace all the software and addon info by the info (@see infos).
+
+        The info is owned by the loader from now on and committed as it is,
+        the softwares and addons can be given by read-only mappings
+        (@see BinaryFormat) since they are only copied in case the loader
+        gets changed afterwards.
+        """
+        with self.__lock:
+            self.__draftSoftwares = infos['softwares']
+            self.__draftAddons = infos['addons']
+            self.__writes.generation = self.__snapshot.generation() + 1
+            if self.__batchDepth == 0:
+                self.__commit()
+
+    def writeBinary(self, fileName):
+        """
+        Write the software and addon info to a binary file.
+
+        The file can be memory-mapped and queried in place by
+        {@link BinaryLoader}.
+        """
+        # only imported when needed, keeping the import of the loaders cheap
+        from .BinaryFormat import BinaryFormat
+
+        BinaryFormat.write(fileName, self.infos())
+
+    def writeSqlite(self, fileName):
+        """
+        Write the software and addon info to a sqlite catalog.
+
+        The catalog can be loaded by {@link SqliteLoader} or queried in
+        place by {@link SqliteQuery}.
+        """
+        # only imported when needed, keeping the import of the loaders cheap
+        from .SqliteCatalog import SqliteCatalog
+
+        SqliteCatalog.write(fileName, self.infos())
+
+    def softwares(self, env={}, lazy=False):
         """
         Return a list of softwares based on the added software/addon info.
 
         In case there is a version assigned in the input environment, it's
         going to use that instead of the parsed version. The version
         in the input env needs to be defined following {@link versioned.uverName}.
-        """
-        # now creating softwares
-        result = []
-        for softwareName in self.__softwares.keys():
-            softwareVersion = self.__softwareVersion(softwareName, env)
-            softwareOptions = self.__softwares[softwareName]['options']
 
-            # creating a software instance
-            software = Software(
-                softwareName,
-                softwareVersion
-            )
+        When lazy is enabled, softwares and their addons are only created when
+        accessed (@see LazySoftwareList).
 
-            # setting software options
-            self.__setVersionedOptions(software, softwareOptions)
+        @see Snapshot.softwares
+        """
+        return self.snapshot().softwares(env, lazy)
 
-            # adding addons to the software
-            self.__addAddonsToSoftware(software, env)
+    def uverVersions(self, env={}, target=None):
+        """
+        Return a dict with the uver names and versions of all softwares.
 
-            # adding software to result
-            result.append(software)
+        @see Snapshot.uverVersions
+        """
+        return self.snapshot().uverVersions(env, target)
 
-        return result
+    def namesByUverName(self):
+        """
+        Return a dict with the software names of each uver name.
 
-    def __softwareVersion(self, name, env):
+        @see Snapshot.namesByUverName
         """
-        Return the version for the input software.
+        return self.snapshot().namesByUverName()
 
-        @private
+    def addonGraph(self):
         """
-        version = self.__softwares[name]['version']
+        Return the graph of the addon relationships.
 
-        # in case there is a version override under the env
-        uverName = Versioned.toUverName(name)
-        if uverName in env:
-            version = env[uverName]
+        The graph is built on demand (not when the info is committed).
 
-        return version
+        @see Snapshot.addonGraph
+        """
+        return self.snapshot().addonGraph()
 
-    def __addAddonsToSoftware(self, software, env):
+    def resolveMany(self, envs, processes=None):
         """
-        Add addons to a software.
+        Return the resolved (name, version) pairs for each of the envs.
 
-        @private
+        @see Snapshot.resolveMany
         """
-        assert isinstance(software, Software), \
-            "Invalid software type!"
+        return self.snapshot().resolveMany(envs, processes)
 
-        softwareName = software.name()
+    def snapshot(self):
+        """
+        Return the current snapshot of the loader.
+
+        Use the same snapshot to run several queries against a consistent
+        state. Pending changes (made outside of a batch) are committed first
+        when the lock is free. While another thread holds the lock (for
+        instance, running a batch) the current snapshot is returned right
+        away, unless the calling thread has changes of its own that have not
+        been committed yet (in this case it waits for the lock, so a thread
+        always sees its own changes).
+        """
+        if self.__draftSoftwares is None:
+            return self.__snapshot
 
-        # creating addons for the software
-        if softwareName in self.__addons:
-            for addonName, addonContent in self.__addons[softwareName].items():
+        if not self.__lock.acquire(False):
+            if getattr(self.__writes, 'generation', 0) <= self.__snapshot.generation():
+                return self.__snapshot
 
-                if addonName not in self.__softwares:
-                    raise AddonNotFoundError(
-                        'Could not find a version for the addon "{0}"'.format(
-                            addonName
-                        )
-                    )
+            self.__lock.acquire()
 
-                addonVersion = self.__softwareVersion(addonName, env)
-                addonOptions = addonContent['options']
+        try:
+            if self.__batchDepth == 0:
+                self.__commit()
+        finally:
+            self.__lock.release()
 
-                # creating addon
-                addon = Addon(
-                    addonName,
-                    addonVersion
-                )
+        return self.__snapshot
 
-                # setting addon options
-                self.__setVersionedOptions(addon, addonOptions)
+    @contextmanager
+    def batch(self):
+        """
+        Return a context manager that groups changes into a single commit.
 
-                # adding addon to software
-                software.addAddon(addon)
+        The changes made inside of the batch are only visible (to all threads,
+        including the one running the batch) when the batch ends. Batches
+        can be nested, the commit happens when the outermost one ends.
+        """
+        with self.__lock:
+            # pending changes made before the batch are committed on their own
+            if self.__batchDepth == 0:
+                self.__commit()
+
+            self.__batchDepth += 1
+            try:
+                yield self
+            finally:
+                self.__batchDepth -= 1
+                if self.__batchDepth == 0:
+                    self.__commit()
+
+    @staticmethod
+    def __countInfos(infos):
+        """
+        Count the softwares, addons and options of the info (@see Instrumentation).
 
-    def __setVersionedOptions(self, versioned, options):
+        @private
+        """
+        Instrumentation.count('softwares', len(infos['softwares']))
+        Instrumentation.count(
+            'addons',
+            sum(map(len, infos['addons'].values()))
+        )
+        Instrumentation.count(
+            'options',
+            sum(map(lambda x: len(x['options']), infos['softwares'].values())) +
+            sum(map(
+                lambda x: sum(map(lambda y: len(y['options']), x.values())),
+                infos['addons'].values()
+            ))
+        )
+
+    def __draft(self):
         """
-        Set options to a versioned instance.
+        Return the (softwares, addons) dicts of the next snapshot.
+
+        They are copied from the current snapshot on the first change.
+        Needs to be called holding the lock.
 
         @private
         """
-        assert isinstance(versioned, Versioned), \
-            "Invalid versioned type"
+        if self.__draftSoftwares is None:
+            infos = self.__snapshot.infos()
+            self.__draftSoftwares = infos['softwares']
+            self.__draftAddons = infos['addons']
 
-        for optionName, optionValue in options.items():
-            versioned.setOption(optionName, optionValue)
+        # the draft becomes the next generation
+        self.__writes.generation = self.__snapshot.generation() + 1
+
+        return (self.__draftSoftwares, self.__draftAddons)
+
+    def __commit(self):
+        """
+        Swap in the draft as the current snapshot.
+
+        Needs to be called holding the lock.
+
+        @private
+        """
+        if self.__draftSoftwares is None:
+            return
+
+        snapshot = Snapshot(
+            self.__draftSoftwares,
+            self.__draftAddons,
+            self.__snapshot.generation() + 1,
+            self.__snapshot
+        )
+
+        self.__draftSoftwares = None
+        self.__draftAddons = None
+        self.__snapshot = snapshot
+
+
+Instrumentation.instrument(Loader, (
+    'addInfos',
+    'setInfos',
+    'softwares',
+    'uverVersions',
+    'resolveMany',
+    'addonGraph'
+))
@@ -0,0 +1,25 @@
+from .Snapshot import Snapshot
+
+class ProcessResolver(object):
+    """
+    Resolves softwares inside of the processes of a pool (@see Snapshot.resolveMany).
+
+    Each process builds its own snapshot once (through {@link initialize},
+    used as the pool initializer) and then resolves the envs sent to it.
+    """
+
+    __snapshot = None
+
+    @classmethod
+    def initialize(cls, infos):
+        """
+        Create the snapshot used by the process from the info.
+        """
+        cls.__snapshot = Snapshot(infos['softwares'], infos['addons'])
+
+    @classmethod
+    def resolve(cls, env):
+        """
+        Return the resolved (name, version) pairs for the env.
+        """
+        return cls.__snapshot.resolveMany([env])[0]
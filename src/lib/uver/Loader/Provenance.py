@@ -0,0 +1,391 @@
+import threading
+from array import array
+from itertools import repeat
+
+class Provenance(object):
+    """
+    Compact table recording where softwares, addons and options come from.
+
+    Each record holds the source (file name) of a software or an addon of a
+    software, the position of the software entry inside of the source (index
+    of the entry in the root object) and where the names of the options
+    defined by the entry can be found. Records of the same software (or
+    addon) are linked, so besides the current source (@see source) the
+    override history is available (@see history).
+
+    The infos (@see addInfos) are recorded in bulk: adding an info only
+    queues it, the records of the queued infos are created the next time the
+    table is used. The records point to the info itself, so the option names
+    are only looked up when an option is queried. Sources are interned to
+    integer ids and the records are stored in arrays of integers (instead of
+    an object per record). Records of discarded entries are freed by
+    compacting the arrays once they make up most of the table
+    (@see compact), so reloading the same sources over and over does not
+    grow the table.
+    """
+
+    # option names of the records without options
+    __noOptions = frozenset()
+
+    def __init__(self):
+        """
+        Create a provenance table.
+        """
+        self.__lock = threading.RLock()
+        self.__sources = []
+        self.__sourceIds = {}
+        self.__options = [self.__noOptions]
+        self.__optionSetIds = {self.__noOptions: 0}
+        self.__pendingInfos = []
+
+        # latest record of each software (by name) and addon (by software and addon names)
+        self.__latestSoftwares = {}
+        self.__latestAddons = {}
+
+        self.__recordSources = array('i')
+        self.__recordPositions = array('i')
+        self.__recordOptions = array('i')
+        self.__recordPrevious = array('i')
+        self.__discardedRecords = 0
+
+    def add(self, source, position, softwareName, addonName=None, optionNames=()):
+        """
+        Record the source and position of a software (or addon), overriding the previous one.
+
+        The source is usually a file name (None for unknown sources).
+        """
+        with self.__lock:
+            self.__recordPendingInfos()
+
+            if addonName is None:
+                latest, key = self.__latestSoftwares, softwareName
+            else:
+                latest, key = self.__latestAddons.setdefault(softwareName, {}), addonName
+
+            self.__addRecords(
+                latest,
+                [key],
+                [position],
+                self.__sourceId(source),
+                self.__optionSetId(optionNames)
+            )
+
+    def addInfos(self, source, infos, softwareNames=None, addonKeys=None, firstPosition=0):
+        """
+        Record all the entries of the info (@see Loader.infos) from a source.
+
+        The position of an entry is the index of the software it belongs to
+        in the info (starting at firstPosition). Use softwareNames and
+        addonKeys (pairs of software and addon names) to only record some of
+        the entries.
+
+        The info is kept by the table (to look up the option names of its
+        entries), it must not be modified afterwards.
+        """
+        if not (infos['softwares'] or infos['addons']):
+            return
+
+        with self.__lock:
+            optionsId = len(self.__options)
+            self.__options.append(infos)
+            self.__pendingInfos.append((
+                self.__sourceId(source),
+                optionsId,
+                None if softwareNames is None else frozenset(softwareNames),
+                None if addonKeys is None else frozenset(addonKeys),
+                firstPosition
+            ))
+
+    def discard(self, softwareName, addonName=None):
+        """
+        Forget the source and history of a software or addon (nothing happens when not recorded).
+        """
+        if addonName is None:
+            self.discardMany([softwareName])
+        else:
+            self.discardMany([], [(softwareName, addonName)])
+
+    def discardMany(self, softwareNames, addonKeys=()):
+        """
+        Forget the source and history of softwares and addons (pairs of software and addon names).
+
+        The table gets compacted when the discarded records outnumber the
+        records still in use.
+        """
+        with self.__lock:
+            self.__recordPendingInfos()
+
+            records = list(map(lambda x: self.__latestSoftwares.pop(x, -1), softwareNames))
+            for softwareName, addonName in addonKeys:
+                latest = self.__latestAddons.get(softwareName)
+                if latest is None:
+                    continue
+
+                records.append(latest.pop(addonName, -1))
+                if not latest:
+                    del self.__latestAddons[softwareName]
+
+            for record in records:
+                while record != -1:
+                    self.__discardedRecords += 1
+                    record = self.__recordPrevious[record]
+
+            if self.__discardedRecords * 2 > len(self.__recordSources):
+                self.compact()
+
+    def compact(self):
+        """
+        Free the records (and infos) of the discarded entries.
+
+        The history of the entries still in use is kept.
+        """
+        with self.__lock:
+            self.__recordPendingInfos()
+
+            compacted = {
+                'sources': array('i'),
+                'positions': array('i'),
+                'options': array('i'),
+                'previous': array('i'),
+                'optionIds': {0: 0},
+                'optionList': [self.__noOptions]
+            }
+
+            self.__latestSoftwares = self.__compactKeys(self.__latestSoftwares, compacted)
+            self.__latestAddons = dict(map(
+                lambda x: (x[0], self.__compactKeys(x[1], compacted)),
+                self.__latestAddons.items()
+            ))
+            self.__options = compacted['optionList']
+            self.__optionSetIds = dict(map(
+                lambda x: (x[1], x[0]),
+                filter(lambda x: isinstance(x[1], frozenset), enumerate(self.__options))
+            ))
+            self.__recordSources = compacted['sources']
+            self.__recordPositions = compacted['positions']
+            self.__recordOptions = compacted['options']
+            self.__recordPrevious = compacted['previous']
+            self.__discardedRecords = 0
+
+    def source(self, softwareName, addonName=None, optionName=None):
+        """
+        Return the current (source, position) of an entry or None when not recorded.
+
+        Since a software (or addon) is replaced with all its options, an
+        option that is not defined by the latest record of its software (or
+        addon) has no current source.
+        """
+        with self.__lock:
+            self.__recordPendingInfos()
+
+            record = self.__latestRecord(softwareName, addonName)
+            if record == -1:
+                return None
+
+            if optionName is not None and not self.__definesOption(record, softwareName, addonName, optionName):
+                return None
+
+            return (
+                self.__sources[self.__recordSources[record]],
+                self.__recordPositions[record]
+            )
+
+    def history(self, softwareName, addonName=None, optionName=None):
+        """
+        Return the list of (source, position) of an entry (latest first).
+
+        For options, only the records that defined the option are returned.
+        """
+        result = []
+        with self.__lock:
+            self.__recordPendingInfos()
+
+            record = self.__latestRecord(softwareName, addonName)
+            while record != -1:
+                if optionName is None or self.__definesOption(record, softwareName, addonName, optionName):
+                    result.append((
+                        self.__sources[self.__recordSources[record]],
+                        self.__recordPositions[record]
+                    ))
+                record = self.__recordPrevious[record]
+
+        return result
+
+    def sources(self):
+        """
+        Return the list of sources that have been recorded.
+        """
+        with self.__lock:
+            return list(self.__sources)
+
+    def __len__(self):
+        """
+        Return the number of records.
+        """
+        with self.__lock:
+            self.__recordPendingInfos()
+
+            return len(self.__recordSources)
+
+    def __recordPendingInfos(self):
+        """
+        Create the records of the infos queued by addInfos (in the order they were added).
+
+        @private
+        """
+        pendingInfos = self.__pendingInfos
+        self.__pendingInfos = []
+        for sourceId, optionsId, softwareNames, addonKeys, firstPosition in pendingInfos:
+            infos = self.__options[optionsId]
+            names = list(infos['softwares'].keys())
+            positions = range(firstPosition, firstPosition + len(names))
+            if softwareNames is not None:
+                positions = list(filter(lambda x: names[x - firstPosition] in softwareNames, positions))
+                names = list(map(lambda x: names[x - firstPosition], positions))
+
+            self.__addRecords(self.__latestSoftwares, names, positions, sourceId, optionsId)
+
+            for softwareName, addonNames, position in self.__addonEntries(infos, firstPosition, addonKeys):
+                self.__addRecords(
+                    self.__latestAddons.setdefault(softwareName, {}),
+                    addonNames,
+                    repeat(position, len(addonNames)),
+                    sourceId,
+                    optionsId
+                )
+
+    def __latestRecord(self, softwareName, addonName):
+        """
+        Return the latest record of a software or addon (-1 when not recorded).
+
+        @private
+        """
+        if addonName is None:
+            return self.__latestSoftwares.get(softwareName, -1)
+
+        return self.__latestAddons.get(softwareName, {}).get(addonName, -1)
+
+    @staticmethod
+    def __addonEntries(infos, firstPosition, addonKeys):
+        """
+        Return the (software name, addon names, position) of the softwares of an info that have addons.
+
+        @private
+        """
+        softwares = infos['softwares']
+        addons = infos['addons']
+        positions = dict(zip(softwares.keys(), range(firstPosition, firstPosition + len(softwares))))
+        addonNames = map(list, addons.values())
+        if addonKeys is not None:
+            addonNames = map(
+                lambda x: list(filter(lambda y: (x[0], y) in addonKeys, x[1])),
+                addons.items()
+            )
+
+        return filter(
+            lambda x: x[1],
+            zip(addons.keys(), addonNames, map(positions.get, addons.keys(), repeat(-1)))
+        )
+
+    def __addRecords(self, latest, keys, positions, sourceId, optionsId):
+        """
+        Append a record per key linked to the previous record of the key.
+
+        The keys are unique per call, so the latest records are updated in bulk.
+
+        @private
+        """
+        start = len(self.__recordSources)
+
+        self.__recordPrevious.extend(array('i', map(latest.get, keys, repeat(-1))))
+        self.__recordSources.extend(array('i', [sourceId]) * len(keys))
+        self.__recordPositions.extend(positions)
+        self.__recordOptions.extend(array('i', [optionsId]) * len(keys))
+
+        latest.update(zip(keys, range(start, start + len(keys))))
+
+    def __compactKeys(self, latest, compacted):
+        """
+        Return the latest records of the keys after appending their history to the compacted arrays.
+
+        @private
+        """
+        result = {}
+        for key, record in latest.items():
+            result[key] = self.__compactHistory(record, compacted)
+
+        return result
+
+    def __compactHistory(self, record, compacted):
+        """
+        Append the history of a record to the compacted arrays returning its new index.
+
+        @private
+        """
+        # collecting the history (latest first) to append it oldest first
+        records = []
+        while record != -1:
+            records.append(record)
+            record = self.__recordPrevious[record]
+
+        previous = -1
+        for record in reversed(records):
+            optionsId = self.__recordOptions[record]
+            if optionsId not in compacted['optionIds']:
+                compacted['optionIds'][optionsId] = len(compacted['optionList'])
+                compacted['optionList'].append(self.__options[optionsId])
+
+            compacted['sources'].append(self.__recordSources[record])
+            compacted['positions'].append(self.__recordPositions[record])
+            compacted['options'].append(compacted['optionIds'][optionsId])
+            compacted['previous'].append(previous)
+            previous = len(compacted['sources']) - 1
+
+        return previous
+
+    def __definesOption(self, record, softwareName, addonName, optionName):
+        """
+        Return a boolean telling if the entry of the record defines the option.
+
+        @private
+        """
+        options = self.__options[self.__recordOptions[record]]
+        if isinstance(options, frozenset):
+            return optionName in options
+
+        if addonName is None:
+            return optionName in options['softwares'][softwareName]['options']
+
+        return optionName in options['addons'][softwareName][addonName]['options']
+
+    def __sourceId(self, source):
+        """
+        Return the id of a source (interning it when necessary).
+
+        @private
+        """
+        sourceId = self.__sourceIds.get(source)
+        if sourceId is None:
+            sourceId = len(self.__sources)
+            self.__sources.append(source)
+            self.__sourceIds[source] = sourceId
+
+        return sourceId
+
+    def __optionSetId(self, optionNames):
+        """
+        Return the id of a set of option names (interning it when necessary).
+
+        @private
+        """
+        if not optionNames:
+            return 0
+
+        optionSet = frozenset(optionNames)
+        optionSetId = self.__optionSetIds.get(optionSet)
+        if optionSetId is None:
+            optionSetId = len(self.__options)
+            self.__options.append(optionSet)
+            self.__optionSetIds[optionSet] = optionSetId
+
+        return optionSetId
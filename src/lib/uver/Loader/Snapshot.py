@@ -0,0 +1,646 @@
+import threading
+from collections import OrderedDict
+from ..Versioned import Versioned
+from ..Versioned import Software
+from ..Versioned import Addon
+from ..Versioned import InvalidNameError
+from ..Versioned import InvalidVersionError
+from .LazySoftware import LazySoftware
+from .LazySoftwareList import LazySoftwareList
+from .AddonGraph import AddonGraph
+
+class AddonNotFoundError(Exception):
+    """Addon not found in the softwares error."""
+
+class Snapshot(object):
+    """
+    Immutable state of a loader.
+
+    Holds the software and addon information committed by a loader
+    (@see Loader.snapshot). Since a snapshot never changes, it can be read
+    from many threads without locking while the loader builds the next
+    generation.
+
+    The software information is compiled into a resolution plan the first time
+    softwares are requested. The plan holds validated software instances for
+    the parsed versions, these instances are reused by every result where the
+    environment does not override them. Therefore, the returned softwares are
+    shared between calls and should be treated as read-only.
+
+    A snapshot created from a previous one (@see Loader.snapshot) reuses the
+    software instances compiled by the previous plan for the softwares
+    whose info, addons and addon versions are the same objects (or
+    versions), so only the changed entries are created when compiling.
+
+    Resolved lists are cached per snapshot (@see resolvedCacheSize). Cache
+    hits are plain dict reads, only storing a newly resolved list takes a
+    lock.
+    """
+
+    # maximum number of resolved software lists kept by a snapshot (the
+    # oldest ones are discarded first)
+    resolvedCacheSize = 64
+
+    def __init__(self, softwares, addons, generation=0, previous=None):
+        """
+        Create a snapshot object.
+
+        The input dicts are owned by the snapshot from now on (they must not
+        be modified afterwards). The previous snapshot is used to reuse the
+        softwares of its plan, only its plan is kept (never the snapshot).
+        """
+        self.__softwares = softwares
+        self.__addons = addons
+        self.__generation = generation
+        self.__plan = None
+        self.__basePlan = None
+        if previous is not None:
+            self.__basePlan = previous.__reusablePlan()
+        self.__versionsPlan = None
+        self.__uverNames = None
+        self.__addonGraph = None
+        self.__resolved = OrderedDict()
+        self.__resolvedLock = threading.Lock()
+        self.__pool = None
+        self.__poolProcesses = None
+        self.__poolLock = threading.Lock()
+
+    def __del__(self):
+        """
+        Terminate the pool of processes used by the snapshot.
+        """
+        self.close()
+
+    def close(self):
+        """
+        Terminate the pool of processes used by {@link resolveMany} (if any).
+
+        The snapshot can still be used afterwards, a new pool is created when
+        needed.
+        """
+        with self.__poolLock:
+            pool = self.__pool
+            self.__pool = None
+            self.__poolProcesses = None
+
+        if pool is not None:
+            pool.terminate()
+            pool.join()
+
+    def generation(self):
+        """
+        Return the generation number of the snapshot.
+        """
+        return self.__generation
+
+    def infos(self):
+        """
+        Return a dict with the software and addon info (@see Loader.infos).
+        """
+        return {
+            'softwares': dict(self.__softwares),
+            'addons': dict(map(
+                lambda x: (x[0], dict(x[1])),
+                self.__addons.items()
+            ))
+        }
+
+    def softwares(self, env={}, lazy=False):
+        """
+        Return a list of softwares based on the software/addon info.
+
+        In case there is a version assigned in the input environment, it's
+        going to use that instead of the parsed version. The version
+        in the input env needs to be defined following {@link versioned.uverName}.
+
+        The result is cached based on the versions overridden by the env, only
+        softwares affected by an override (either directly or through one of
+        their addons) are created again.
+
+        When lazy is enabled a {@link LazySoftwareList} is returned instead,
+        softwares are only created when accessed and their addons only when
+        the addons are accessed. In this mode invalid versions and addons
+        without a version are only reported when the software (or addons)
+        get created.
+        """
+        if lazy:
+            return self.__lazySoftwares(dict(env))
+
+        plan = self.__compiledPlan()
+        overrides = self.__envOverrides(env)
+
+        cacheKey = frozenset(overrides.items())
+        result = self.__resolved.get(cacheKey)
+        if result is None:
+            result = self.__resolvePlan(plan, overrides)
+            self.__cacheResolved(cacheKey, result)
+
+        return list(result)
+
+    def uverVersions(self, env={}, target=None):
+        """
+        Return a dict with the uver names and versions of all softwares.
+
+        It follows the same rules used by {@link softwares} (versions in the
+        input env are used instead of the parsed versions), however no
+        software/addon instances are created. Addons are softwares as well,
+        therefore their versions are part of the result.
+
+        The variables are added to the target dict when provided (for
+        instance, os.environ), otherwise a new dict is returned.
+        """
+        result = {} if target is None else target
+
+        for uverName, version in self.__compiledVersionsPlan():
+            if uverName in env:
+                overrideVersion = env[uverName]
+                if overrideVersion != version and not Versioned.isValidVersion(overrideVersion):
+                    raise InvalidVersionError(
+                        'version needs to be defined as valid string "{0}"'.format(
+                            overrideVersion
+                        )
+                    )
+                version = overrideVersion
+
+            result[uverName] = version
+
+        return result
+
+    def namesByUverName(self):
+        """
+        Return a dict with the software names (in order) of each uver name.
+
+        It's the inverse of {@link Versioned.toUverName} for the softwares of
+        the snapshot, several names can share the same uver name (for
+        instance, "foo" and "FOO").
+        """
+        return dict(map(
+            lambda x: (x[0], list(x[1])),
+            self.__uverNameMap().items()
+        ))
+
+    def addonGraph(self):
+        """
+        Return the graph of the addon relationships (@see AddonGraph).
+
+        The graph is built the first time it's requested (committing the info
+        does not build it, so loading a binary file does not read every
+        addon), therefore addons without a version and cycles are only
+        detected when the graph is requested. Addons without a version are
+        reported up front (before any software is created) by
+        {@link softwares} and {@link uverVersions}, except in lazy mode.
+        """
+        if self.__addonGraph is None:
+            self.__addonGraph = AddonGraph(self.__softwares.keys(), self.__addons)
+
+        return self.__addonGraph
+
+    def resolveMany(self, envs, processes=None):
+        """
+        Return the resolved softwares for each of the envs (in the same order).
+
+        Each result is a tuple of (name, version) pairs following the order
+        used by {@link softwares}, which is cheaper to build, share and
+        transfer between processes than software instances. Resolving an env
+        fails the same way {@link softwares} does (for instance, an invalid
+        version).
+
+        The envs are reduced to the overrides that change a version, so envs
+        that only differ by unrelated variables are resolved once. When
+        processes is greater than one, the unique envs are resolved by a
+        pool of processes. The pool is kept by the snapshot and reused by the
+        next calls asking for the same number of processes (@see close), in
+        this case the plan is only compiled by the processes.
+        """
+        keys = list(map(
+            lambda x: frozenset(self.__envOverrides(x).items()),
+            envs
+        ))
+        uniqueKeys = list(set(keys))
+
+        if processes is None or processes <= 1 or len(uniqueKeys) <= 1:
+            plan = self.__compiledPlan()
+            resolvedVersions = list(map(
+                lambda x: self.__resolveVersions(plan, dict(x)),
+                uniqueKeys
+            ))
+        else:
+            from .ProcessResolver import ProcessResolver
+
+            resolvedVersions = self.__processPool(processes).map(
+                ProcessResolver.resolve,
+                list(map(dict, uniqueKeys)),
+                max(1, len(uniqueKeys) // (processes * 4))
+            )
+
+        resolved = dict(zip(uniqueKeys, resolvedVersions))
+
+        return list(map(lambda x: resolved[x], keys))
+
+    def __processPool(self, processes):
+        """
+        Return the pool of processes used to resolve the envs, creating it when necessary.
+
+        @private
+        """
+        with self.__poolLock:
+            if self.__pool is not None and self.__poolProcesses == processes:
+                return self.__pool
+
+            previousPool = self.__pool
+
+            import multiprocessing
+            from .ProcessResolver import ProcessResolver
+
+            self.__pool = multiprocessing.Pool(
+                processes,
+                ProcessResolver.initialize,
+                (self.__resolveInfos(),)
+            )
+            self.__poolProcesses = processes
+            pool = self.__pool
+
+        if previousPool is not None:
+            previousPool.terminate()
+            previousPool.join()
+
+        return pool
+
+    def __resolveInfos(self):
+        """
+        Return plain dicts with the info required to resolve the versions.
+
+        The options are left out since they don't affect the versions (the
+        info of a snapshot may not be picklable, for instance the one read
+        by {@link BinaryLoader}).
+
+        @private
+        """
+        return {
+            'softwares': dict(map(
+                lambda x: (x[0], {'version': x[1]['version'], 'options': {}}),
+                self.__softwares.items()
+            )),
+            'addons': dict(map(
+                lambda x: (x[0], dict(map(lambda y: (y, {'options': {}}), x[1].keys()))),
+                self.__addons.items()
+            ))
+        }
+
+    def __cacheResolved(self, cacheKey, result):
+        """
+        Store a resolved list discarding the oldest ones over the cache size.
+
+        @private
+        """
+        with self.__resolvedLock:
+            self.__resolved[cacheKey] = result
+            while len(self.__resolved) > self.resolvedCacheSize:
+                self.__resolved.popitem(last=False)
+
+    def __compiledVersionsPlan(self):
+        """
+        Return a list of validated (uver name, parsed version) pairs.
+
+        @private
+        """
+        if self.__versionsPlan is None:
+            self.__checkMissingAddons()
+
+            versionsPlan = []
+            for softwareName, softwareInfo in self.__softwares.items():
+                if not Versioned.isValidName(softwareName):
+                    raise InvalidNameError(
+                        'Invalid addon name: "{0}"'.format(softwareName)
+                    )
+
+                version = softwareInfo['version']
+                if not Versioned.isValidVersion(version):
+                    raise InvalidVersionError(
+                        'version needs to be defined as valid string "{0}"'.format(
+                            version
+                        )
+                    )
+
+                versionsPlan.append((Versioned.toUverName(softwareName), version))
+
+            self.__versionsPlan = versionsPlan
+
+        return self.__versionsPlan
+
+    def __compiledPlan(self):
+        """
+        Return the resolution plan, compiling it when necessary.
+
+        The plan contains the software instances created with the parsed
+        versions, the names each software depends on (itself and its addons)
+        and a map from uver names to software names (@see __uverNameMap).
+
+        @private
+        """
+        if self.__plan is None:
+            self.__checkMissingAddons()
+
+            basePlan = self.__basePlan
+            entries = []
+            sources = {}
+            for softwareName, softwareInfo in self.__softwares.items():
+                softwareAddons = self.__addons.get(softwareName)
+                source = None
+                if basePlan is not None:
+                    source = self.__reusableSource(basePlan, softwareName, softwareInfo, softwareAddons)
+
+                if source is None:
+                    software = self.__createSoftware(softwareName, {})
+                    dependencies = frozenset(
+                        [softwareName] + list(software.addonNames())
+                    )
+                    source = (
+                        softwareInfo,
+                        softwareAddons,
+                        (softwareName, software, dependencies)
+                    )
+
+                entries.append(source[2])
+                sources[softwareName] = source
+
+            self.__plan = {
+                'entries': entries,
+                'uverNames': self.__uverNameMap(),
+                'sources': sources
+            }
+            self.__basePlan = None
+
+        return self.__plan
+
+    def __checkMissingAddons(self):
+        """
+        Raise an error when an addon does not have a version.
+
+        @private
+        """
+        missing = self.addonGraph().missing()
+        if missing:
+            raise AddonNotFoundError(
+                'Could not find a version for the addon "{0}"'.format(
+                    missing[0][1]
+                )
+            )
+
+    def __reusablePlan(self):
+        """
+        Return the latest compiled plan (None when there is none) for the next snapshot.
+
+        @private
+        """
+        return self.__basePlan if self.__plan is None else self.__plan
+
+    def __reusableSource(self, basePlan, softwareName, softwareInfo, softwareAddons):
+        """
+        Return the source of a software in the base plan when nothing it depends on has changed.
+
+        A source holds the (software info, addons info, plan entry) used to
+        compile the software.
+
+        @private
+        """
+        baseSources = basePlan['sources']
+        base = baseSources.get(softwareName)
+        if base is None or base[0] is not softwareInfo:
+            return None
+
+        baseAddons = base[1] or {}
+        addons = softwareAddons or {}
+        if list(baseAddons.keys()) != list(addons.keys()):
+            return None
+
+        for addonName, addonInfo in addons.items():
+            if baseAddons[addonName] is not addonInfo:
+                return None
+
+            # the addons get the version of the software with their name
+            addonSoftwareInfo = self.__softwares.get(addonName)
+            baseAddonSource = baseSources.get(addonName)
+            if addonSoftwareInfo is None or baseAddonSource is None or \
+                    addonSoftwareInfo['version'] != baseAddonSource[0]['version']:
+                return None
+
+        return base
+
+    def __uverNameMap(self):
+        """
+        Return a dict with the software names of each uver name.
+
+        It's used to detect the overrides of an env without compiling the
+        plan (@see __envOverrides).
+
+        @private
+        """
+        uverNames = self.__uverNames
+        if uverNames is None:
+            uverNames = {}
+            for softwareName in self.__softwares.keys():
+                uverNames.setdefault(Versioned.toUverName(softwareName), []).append(softwareName)
+
+            self.__uverNames = uverNames
+
+        return uverNames
+
+    def __envOverrides(self, env):
+        """
+        Return a dict with the uver names overridden by the env.
+
+        Overrides assigning the same version that was parsed are ignored since
+        they don't change the result.
+
+        @private
+        """
+        result = {}
+        uverNames = self.__uverNameMap()
+
+        # looking up through the smaller of the two
+        if len(env) < len(uverNames):
+            candidates = filter(lambda x: x in uverNames, env.keys())
+        else:
+            candidates = filter(lambda x: x in env, uverNames.keys())
+
+        for uverName in candidates:
+            version = env[uverName]
+            for softwareName in uverNames[uverName]:
+                if self.__softwares[softwareName]['version'] != version:
+                    result[uverName] = version
+                    break
+
+        return result
+
+    def __resolvePlan(self, plan, overrides):
+        """
+        Return the list of softwares for the overridden versions.
+
+        @private
+        """
+        overriddenNames = set()
+        for uverName in overrides.keys():
+            overriddenNames.update(plan['uverNames'][uverName])
+
+        result = []
+        for softwareName, software, dependencies in plan['entries']:
+            if overriddenNames and not dependencies.isdisjoint(overriddenNames):
+                software = self.__createSoftware(softwareName, overrides)
+
+            result.append(software)
+
+        return result
+
+    def __resolveVersions(self, plan, overrides):
+        """
+        Return the (name, version) pairs for the overridden versions.
+
+        Only the softwares affected by the overrides are created (so their
+        versions and addons get validated), the pairs of the remaining
+        softwares come from the plan.
+
+        @private
+        """
+        if 'versions' not in plan:
+            dependents = {}
+            for index, (softwareName, software, dependencies) in enumerate(plan['entries']):
+                for dependencyName in dependencies:
+                    dependents.setdefault(dependencyName, []).append(index)
+
+            plan['dependents'] = dependents
+            plan['versions'] = tuple(map(
+                lambda x: (x[0], x[1].version()),
+                plan['entries']
+            ))
+
+        if not overrides:
+            return plan['versions']
+
+        affected = set()
+        for uverName in overrides.keys():
+            for softwareName in plan['uverNames'][uverName]:
+                affected.update(plan['dependents'].get(softwareName, ()))
+
+        result = list(plan['versions'])
+        for index in affected:
+            softwareName = plan['entries'][index][0]
+            result[index] = (softwareName, self.__createSoftware(softwareName, overrides).version())
+
+        return tuple(result)
+
+    def __lazySoftwares(self, env):
+        """
+        Return a lazy list of softwares.
+
+        @private
+        """
+        return LazySoftwareList(
+            self.__softwares.keys(),
+            lambda x: self.__createLazySoftware(x, env),
+            lambda x: self.__addons.get(x, {}).keys()
+        )
+
+    def __createLazySoftware(self, softwareName, env):
+        """
+        Return a new software instance that creates its addons on demand.
+
+        @private
+        """
+        software = LazySoftware(
+            softwareName,
+            self.__softwareVersion(softwareName, env),
+            lambda x: self.__addAddonsToSoftware(x, env)
+        )
+
+        # setting software options
+        self.__setVersionedOptions(software, self.__softwares[softwareName]['options'])
+
+        return software
+
+    def __createSoftware(self, softwareName, env):
+        """
+        Return a new software instance (including its addons).
+
+        @private
+        """
+        softwareVersion = self.__softwareVersion(softwareName, env)
+        softwareOptions = self.__softwares[softwareName]['options']
+
+        # creating a software instance
+        software = Software(
+            softwareName,
+            softwareVersion
+        )
+
+        # setting software options
+        self.__setVersionedOptions(software, softwareOptions)
+
+        # adding addons to the software
+        self.__addAddonsToSoftware(software, env)
+
+        return software
+
+    def __softwareVersion(self, name, env):
+        """
+        Return the version for the input software.
+
+        @private
+        """
+        version = self.__softwares[name]['version']
+
+        # in case there is a version override under the env
+        uverName = Versioned.toUverName(name)
+        if uverName in env:
+            version = env[uverName]
+
+        return version
+
+    def __addAddonsToSoftware(self, software, env):
+        """
+        Add addons to a software.
+
+        @private
+        """
+        assert isinstance(software, Software), \
+            "Invalid software type!"
+
+        softwareName = software.name()
+
+        # creating addons for the software
+        if softwareName in self.__addons:
+            for addonName, addonContent in self.__addons[softwareName].items():
+
+                if addonName not in self.__softwares:
+                    raise AddonNotFoundError(
+                        'Could not find a version for the addon "{0}"'.format(
+                            addonName
+                        )
+                    )
+
+                addonVersion = self.__softwareVersion(addonName, env)
+                addonOptions = addonContent['options']
+
+                # creating addon
+                addon = Addon(
+                    addonName,
+                    addonVersion
+                )
+
+                # setting addon options
+                self.__setVersionedOptions(addon, addonOptions)
+
+                # adding addon to software
+                software.addAddon(addon)
+
+    def __setVersionedOptions(self, versioned, options):
+        """
+        Set options to a versioned instance.
+
+        @private
+        """
+        assert isinstance(versioned, Versioned), \
+            "Invalid versioned type"
+
+        for optionName, optionValue in options.items():
+            versioned.setOption(optionName, optionValue)
@@ -0,0 +1,508 @@
+import os
+import json
+import sqlite3
+import threading
+from ..Versioned import Versioned
+from ..Versioned import InvalidVersionError
+
+# compatibility with python 2/3
+try:
+    from collections.abc import Mapping
+except ImportError:
+    from collections import Mapping
+
+class InvalidSqliteCatalogError(Exception):
+    """Invalid sqlite catalog error."""
+
+class SqliteCatalog(object):
+    """
+    Software and addon info stored in an indexed SQLite database.
+
+    Tables:
+    - softwares: one row per software (position, name, uver name, version
+    and options encoded as json), indexed by name and uver name
+    - addons: one row per addon of a software (position, software name,
+    addon name, addon uver name and options encoded as json), indexed by
+    software name, addon name and addon uver name
+
+    The positions keep the order of the info the catalog was written from
+    (@see write), so lookups return the entries in the same order used by
+    the loaders. Lookups only read the rows they need through the indexes,
+    the info is exposed to the loaders through read-only mappings that
+    query the database as they are accessed (@see softwareInfos,
+    addonInfos).
+
+    The catalog can be shared among threads (queries are serialized).
+    """
+
+    __schemaVersion = 1
+
+    def __init__(self, fileName):
+        """
+        Open a catalog file (@see write).
+        """
+        # making sure it's a valid file (sqlite creates missing files)
+        if not (os.path.exists(fileName) and os.path.isfile(fileName)):
+            raise InvalidSqliteCatalogError(
+                'Invalid sqlite catalog "{0}"!'.format(fileName)
+            )
+
+        self.__fileName = fileName
+        self.__lock = threading.Lock()
+        self.__connection = sqlite3.connect(fileName, check_same_thread=False)
+
+        # making sure the connection does not leak when the file is not a valid catalog
+        try:
+            self.__checkSchemaVersion()
+            self.__softwareCount = self.__fetchAll('SELECT COUNT(*) FROM softwares')[0][0]
+            self.__addonSoftwareCount = self.__fetchAll(
+                'SELECT COUNT(DISTINCT softwareName) FROM addons'
+            )[0][0]
+        except Exception:
+            self.__connection.close()
+            raise
+
+    def fileName(self):
+        """
+        Return the file name of the catalog.
+        """
+        return self.__fileName
+
+    def softwareInfos(self):
+        """
+        Return a read-only mapping with the software info.
+
+        Same format used by the "softwares" of {@link Loader.infos}.
+        """
+        return SqliteSoftwareInfos(self, self.__softwareCount)
+
+    def addonInfos(self):
+        """
+        Return a read-only mapping with the addon info.
+
+        Same format used by the "addons" of {@link Loader.infos}.
+        """
+        return SqliteAddonInfos(self, self.__addonSoftwareCount)
+
+    def softwareNames(self):
+        """
+        Return the list of software names (in order).
+        """
+        return list(map(
+            lambda x: x[0],
+            self.__fetchAll('SELECT name FROM softwares ORDER BY position')
+        ))
+
+    def softwareInfo(self, name):
+        """
+        Return the info (version and options) of a software (None when not found).
+        """
+        rows = self.__fetchAll(
+            'SELECT version, options FROM softwares WHERE name = ?',
+            (name,)
+        )
+        if not rows:
+            return None
+
+        return {
+            'version': rows[0][0],
+            'options': self.__decodeOptions(rows[0][1])
+        }
+
+    def hasSoftware(self, name):
+        """
+        Return a boolean telling if the catalog has info for the software.
+        """
+        return bool(self.__fetchAll('SELECT 1 FROM softwares WHERE name = ? LIMIT 1', (name,)))
+
+    def hasAddons(self, softwareName):
+        """
+        Return a boolean telling if the software has addons in the catalog.
+        """
+        return bool(self.__fetchAll('SELECT 1 FROM addons WHERE softwareName = ? LIMIT 1', (softwareName,)))
+
+    def softwareNameByUverName(self, uverName):
+        """
+        Return the name of the first software with the uver name (None when not found).
+        """
+        rows = self.__fetchAll(
+            'SELECT name FROM softwares WHERE uverName = ? ORDER BY position LIMIT 1',
+            (uverName,)
+        )
+
+        return rows[0][0] if rows else None
+
+    def softwareAddonInfos(self, softwareName):
+        """
+        Return a dict with the info (options) of the addons of a software.
+        """
+        return dict(map(
+            lambda x: (x[0], {'options': self.__decodeOptions(x[1])}),
+            self.__fetchAll(
+                'SELECT addonName, options FROM addons WHERE softwareName = ? ORDER BY position',
+                (softwareName,)
+            )
+        ))
+
+    def softwareAddons(self, softwareName):
+        """
+        Return a list of (addon name, version, options) for the addons of a software.
+
+        The version of an addon is the version of the software with the
+        addon name (None when there is no such software).
+        """
+        return list(map(
+            lambda x: (x[0], x[1], self.__decodeOptions(x[2])),
+            self.__fetchAll(
+                'SELECT addons.addonName, softwares.version, addons.options FROM addons '
+                'LEFT JOIN softwares ON softwares.name = addons.addonName '
+                'WHERE addons.softwareName = ? ORDER BY addons.position',
+                (softwareName,)
+            )
+        ))
+
+    def softwareAddonNames(self, softwareName):
+        """
+        Return the list of addon names of a software.
+        """
+        return list(map(
+            lambda x: x[0],
+            self.__fetchAll(
+                'SELECT addonName FROM addons WHERE softwareName = ? ORDER BY position',
+                (softwareName,)
+            )
+        ))
+
+    def softwareNamesByAddonName(self, addonName):
+        """
+        Return the names of the softwares (with a version) using the addon.
+        """
+        return self.__softwareNamesByAddon('addonName', addonName)
+
+    def softwareNamesByAddonUverName(self, addonUverName):
+        """
+        Return the names of the softwares (with a version) using an addon with the uver name.
+        """
+        return self.__softwareNamesByAddon('addonUverName', addonUverName)
+
+    def addonNames(self):
+        """
+        Return the list of addon names among the softwares (with a version).
+        """
+        return self.__addonColumn('addonName')
+
+    def addonUverNames(self):
+        """
+        Return the list of addon uver names among the softwares (with a version).
+        """
+        return self.__addonColumn('addonUverName')
+
+    def uverVersions(self):
+        """
+        Return a list of (uver name, version) of the softwares (in order).
+        """
+        return self.__fetchAll('SELECT uverName, version FROM softwares ORDER BY position')
+
+    def addonSoftwareNames(self):
+        """
+        Return the names of the softwares that have addons (in order).
+        """
+        return list(map(
+            lambda x: x[0],
+            self.__fetchAll(
+                'SELECT softwareName FROM addons GROUP BY softwareName ORDER BY MIN(position)'
+            )
+        ))
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        with self.__lock:
+            self.__connection.close()
+
+    @classmethod
+    def write(cls, fileName, infos):
+        """
+        Write the info (@see Loader.infos) to a catalog file (replacing it atomically).
+
+        The rows are inserted in bulk by a single transaction and the
+        indexes are only created afterwards.
+        """
+        temporaryFileName = '{0}.{1}.{2}.tmp'.format(
+            fileName,
+            os.getpid(),
+            threading.current_thread().ident
+        )
+        if os.path.exists(temporaryFileName):
+            os.remove(temporaryFileName)
+
+        connection = sqlite3.connect(temporaryFileName)
+        try:
+            # the file is only used once complete, so no journal is needed
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+
+            with connection:
+                cls.__fillTables(connection, infos)
+
+            connection.execute('ANALYZE')
+        except Exception:
+            connection.close()
+            os.remove(temporaryFileName)
+            raise
+
+        connection.close()
+
+        if hasattr(os, 'replace'):
+            os.replace(temporaryFileName, fileName)
+        else:
+            os.rename(temporaryFileName, fileName)
+
+    @classmethod
+    def __fillTables(cls, connection, infos):
+        """
+        Create the tables filled with the info, then their indexes.
+
+        @private
+        """
+        connection.execute(
+            'CREATE TABLE softwares ('
+            'position INTEGER PRIMARY KEY, '
+            'name TEXT NOT NULL, '
+            'uverName TEXT NOT NULL, '
+            'version TEXT NOT NULL, '
+            'options TEXT)'
+        )
+        connection.execute(
+            'CREATE TABLE addons ('
+            'position INTEGER PRIMARY KEY, '
+            'softwareName TEXT NOT NULL, '
+            'addonName TEXT NOT NULL, '
+            'addonUverName TEXT NOT NULL, '
+            'options TEXT)'
+        )
+        connection.executemany('INSERT INTO softwares VALUES (?, ?, ?, ?, ?)', cls.__softwareRows(infos['softwares']))
+        connection.executemany('INSERT INTO addons VALUES (?, ?, ?, ?, ?)', cls.__addonRows(infos['addons']))
+
+        connection.execute('CREATE UNIQUE INDEX softwaresName ON softwares (name)')
+        connection.execute('CREATE INDEX softwaresUverName ON softwares (uverName, position)')
+        connection.execute('CREATE UNIQUE INDEX addonsSoftwareName ON addons (softwareName, addonName)')
+        connection.execute('CREATE INDEX addonsAddonName ON addons (addonName)')
+        connection.execute('CREATE INDEX addonsAddonUverName ON addons (addonUverName)')
+        connection.execute('PRAGMA user_version = {0}'.format(cls.__schemaVersion))
+
+    @classmethod
+    def __softwareRows(cls, softwareInfos):
+        """
+        Yield the rows of the softwares table.
+
+        @private
+        """
+        for position, (name, softwareInfo) in enumerate(softwareInfos.items()):
+            version = softwareInfo['version']
+            if not Versioned.isValidVersion(version):
+                raise InvalidVersionError(
+                    'version needs to be defined as valid string "{0}"'.format(
+                        version
+                    )
+                )
+
+            yield (
+                position,
+                name,
+                Versioned.toUverName(name),
+                version,
+                cls.__encodeOptions(softwareInfo['options'])
+            )
+
+    @classmethod
+    def __addonRows(cls, addonInfos):
+        """
+        Yield the rows of the addons table.
+
+        @private
+        """
+        position = 0
+        for softwareName, addons in addonInfos.items():
+            for addonName, addonInfo in addons.items():
+                yield (
+                    position,
+                    softwareName,
+                    addonName,
+                    Versioned.toUverName(addonName),
+                    cls.__encodeOptions(addonInfo['options'])
+                )
+                position += 1
+
+    def __checkSchemaVersion(self):
+        """
+        Make sure the file is a catalog with the expected schema version.
+
+        @private
+        """
+        try:
+            schemaVersion = self.__fetchAll('PRAGMA user_version')[0][0]
+        except sqlite3.DatabaseError as err:
+            raise InvalidSqliteCatalogError(
+                'Invalid sqlite catalog "{0}": {1}'.format(self.__fileName, err)
+            )
+
+        if schemaVersion != self.__schemaVersion:
+            raise InvalidSqliteCatalogError(
+                'Unexpected sqlite catalog schema version "{0}"!'.format(schemaVersion)
+            )
+
+    def __softwareNamesByAddon(self, column, value):
+        """
+        Return the names of the softwares (with a version) whose addons match the column value.
+
+        @private
+        """
+        return list(map(
+            lambda x: x[0],
+            self.__fetchAll(
+                'SELECT softwares.name FROM addons '
+                'JOIN softwares ON softwares.name = addons.softwareName '
+                'WHERE addons.{0} = ? '
+                'ORDER BY softwares.position, addons.position'.format(column),
+                (value,)
+            )
+        ))
+
+    def __addonColumn(self, column):
+        """
+        Return the distinct values of an addon column among the softwares (with a version).
+
+        The values follow the order of the softwares using them first.
+
+        @private
+        """
+        result = []
+        known = set()
+        for row in self.__fetchAll(
+                'SELECT addons.{0} FROM addons '
+                'JOIN softwares ON softwares.name = addons.softwareName '
+                'ORDER BY softwares.position, addons.position'.format(column)):
+            if row[0] not in known:
+                known.add(row[0])
+                result.append(row[0])
+
+        return result
+
+    def __fetchAll(self, statement, parameters=()):
+        """
+        Return the rows returned by the statement.
+
+        @private
+        """
+        with self.__lock:
+            return self.__connection.execute(statement, parameters).fetchall()
+
+    @staticmethod
+    def __encodeOptions(options):
+        """
+        Return the options encoded as json (None when empty).
+
+        @private
+        """
+        if not options:
+            return None
+
+        return json.dumps(options, sort_keys=True)
+
+    @staticmethod
+    def __decodeOptions(data):
+        """
+        Return the options decoded from json.
+
+        @private
+        """
+        if data is None:
+            return {}
+
+        return json.loads(data)
+
+class SqliteSoftwareInfos(Mapping):
+    """
+    Read-only mapping of software name to software info backed by {@link SqliteCatalog}.
+    """
+
+    def __init__(self, catalog, count):
+        """
+        Create a software info mapping.
+        """
+        self.__catalog = catalog
+        self.__count = count
+
+    def __getitem__(self, name):
+        """
+        Return the info (version and options) of a software.
+        """
+        info = self.__catalog.softwareInfo(name)
+        if info is None:
+            raise KeyError(name)
+
+        return info
+
+    def __contains__(self, name):
+        """
+        Return a boolean telling if the software has info.
+
+        The options are not decoded (@see SqliteCatalog.hasSoftware).
+        """
+        return self.__catalog.hasSoftware(name)
+
+    def __iter__(self):
+        """
+        Iterate over the software names.
+        """
+        return iter(self.__catalog.softwareNames())
+
+    def __len__(self):
+        """
+        Return the number of softwares.
+        """
+        return self.__count
+
+class SqliteAddonInfos(Mapping):
+    """
+    Read-only mapping of software name to addon infos backed by {@link SqliteCatalog}.
+    """
+
+    def __init__(self, catalog, count):
+        """
+        Create an addon info mapping.
+        """
+        self.__catalog = catalog
+        self.__count = count
+
+    def __getitem__(self, name):
+        """
+        Return a dict with the addons of a software.
+        """
+        addons = self.__catalog.softwareAddonInfos(name)
+        if not addons:
+            raise KeyError(name)
+
+        return addons
+
+    def __contains__(self, name):
+        """
+        Return a boolean telling if the software has addons.
+
+        The options are not decoded (@see SqliteCatalog.hasAddons).
+        """
+        return self.__catalog.hasAddons(name)
+
+    def __iter__(self):
+        """
+        Iterate over the names of the softwares that have addons.
+        """
+        return iter(self.__catalog.addonSoftwareNames())
+
+    def __len__(self):
+        """
+        Return the number of softwares that have addons.
+        """
+        return self.__count
@@ -0,0 +1,24 @@
+from .Loader import Loader
+from .SqliteCatalog import SqliteCatalog
+
+class SqliteLoader(Loader):
+    """
+    Loads a list of softwares from a sqlite catalog (@see Loader.writeSqlite).
+
+    The info is read from the catalog as it is accessed rather than parsed
+    upfront. Use lazy softwares (@see Loader.softwares) so only the
+    softwares that are accessed get read, or {@link SqliteQuery} to look up
+    softwares straight from the catalog indexes.
+
+    Changes made to the loader afterwards copy the info into memory first.
+    """
+
+    def loadFromSqliteFile(self, fileName):
+        """
+        Replace the info of the loader by the info from a sqlite catalog.
+        """
+        catalog = SqliteCatalog(fileName)
+        self.setInfos({
+            'softwares': catalog.softwareInfos(),
+            'addons': catalog.addonInfos()
+        })
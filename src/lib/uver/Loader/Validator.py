@@ -0,0 +1,328 @@
+import os
+import glob
+import json
+from ..Versioned import Versioned
+
+# compatibility with python 2/3
+try:
+    basestring
+except NameError:
+    basestring = str
+
+try:
+    long
+except NameError:
+    long = int
+
+class ValidationIssue(object):
+    """
+    Problem found by the validator (@see Validator).
+    """
+
+    __slots__ = ('__fileName', '__keyPath', '__message')
+
+    def __init__(self, fileName, keyPath, message):
+        """
+        Create a validation issue.
+        """
+        self.__fileName = fileName
+        self.__keyPath = tuple(keyPath)
+        self.__message = message
+
+    def fileName(self):
+        """
+        Return the file where the issue was found (None when not from a file).
+        """
+        return self.__fileName
+
+    def keyPath(self):
+        """
+        Return a tuple with the keys leading to the problematic value.
+        """
+        return self.__keyPath
+
+    def message(self):
+        """
+        Return the description of the issue.
+        """
+        return self.__message
+
+    def __str__(self):
+        """
+        Return the issue formatted as "file: key.path: message".
+        """
+        result = []
+        if self.__fileName is not None:
+            result.append(self.__fileName)
+
+        if self.__keyPath:
+            result.append('.'.join(map(str, self.__keyPath)))
+
+        result.append(self.__message)
+
+        return ': '.join(result)
+
+class Validator(object):
+    """
+    Validates software and addon definitions in bulk.
+
+    Unlike the loaders, which fail at the first problem (some of them only
+    when the softwares get created), the validator goes over all the data
+    in a single pass and collects every problem (@see issues). It checks the
+    format expected by {@link JsonLoader.addFromJson}, software and addon
+    names, versions, option names and values (json types, since the info
+    gets encoded as json by the caches and catalogs) and addons without a
+    version.
+
+    Addon references are checked against the softwares of everything added
+    to the validator, so a directory of json files can define softwares
+    and addons in different files.
+    """
+
+    # option values that don't need to be looked into
+    __optionScalarTypes = frozenset([str, type(u''), int, long, float, bool, type(None)])
+
+    def __init__(self):
+        """
+        Create a validator.
+        """
+        self.__issues = []
+        self.__softwareNames = set()
+        self.__validNames = set()
+        self.__addonReferences = []
+
+    def addFromJson(self, jsonContents, fileName=None):
+        """
+        Validate json contents (@see JsonLoader.addFromJson).
+        """
+        try:
+            contents = json.loads(jsonContents)
+        except ValueError as err:
+            self.__addIssue(fileName, (), 'Invalid json: {0}'.format(err))
+            return
+
+        self.addFromContents(contents, fileName)
+
+    def addFromJsonFile(self, fileName):
+        """
+        Validate a json file.
+        """
+        # making sure it's a valid file
+        if not (os.path.exists(fileName) and os.path.isfile(fileName)):
+            self.__addIssue(fileName, (), 'Invalid file!')
+            return
+
+        try:
+            # json files are utf-8 encoded (regardless of the locale)
+            with open(fileName, 'rb') as f:
+                jsonContents = f.read().decode('utf-8')
+        except (IOError, OSError, UnicodeDecodeError) as err:
+            self.__addIssue(fileName, (), 'Could not read file: {0}'.format(err))
+            return
+
+        self.addFromJson(jsonContents, fileName)
+
+    def addFromJsonDirectory(self, directory):
+        """
+        Validate the json files inside of a directory.
+        """
+        # making sure it's a valid directory
+        if not (os.path.exists(directory) and os.path.isdir(directory)):
+            self.__addIssue(directory, (), 'Invalid directory!')
+            return
+
+        for fileName in sorted(glob.glob(os.path.join(directory, '*.json'))):
+            self.addFromJsonFile(fileName)
+
+    def addFromContents(self, contents, fileName=None):
+        """
+        Validate decoded json contents.
+        """
+        # root checking
+        if not isinstance(contents, dict):
+            self.__addIssue(fileName, (), 'Expecting object as root!')
+            return
+
+        for softwareName, softwareContents in contents.items():
+            self.__validateSoftware(fileName, softwareName, softwareContents)
+
+    def addInfos(self, infos, fileName=None):
+        """
+        Validate the software and addon info (@see Loader.infos).
+        """
+        for softwareName, softwareInfo in infos['softwares'].items():
+            self.__validateName(fileName, (softwareName,), softwareName)
+            self.__validateVersion(fileName, (softwareName, 'version'), softwareInfo['version'])
+            self.__validateOptions(fileName, (softwareName, 'options'), softwareInfo['options'])
+            self.__softwareNames.add(softwareName)
+
+        for softwareName, addons in infos['addons'].items():
+            for addonName, addonInfo in addons.items():
+                keyPath = (softwareName, 'addons', addonName)
+                self.__validateAddonName(fileName, keyPath, addonName)
+                self.__validateOptions(fileName, keyPath + ('options',), addonInfo['options'])
+
+    def issues(self):
+        """
+        Return the list of issues found so far.
+
+        Addons without a version are reported at the end (once everything
+        has been added).
+        """
+        result = list(self.__issues)
+        for fileName, keyPath, addonName in self.__addonReferences:
+            if addonName not in self.__softwareNames:
+                result.append(ValidationIssue(
+                    fileName,
+                    keyPath,
+                    'Could not find a version for the addon "{0}"'.format(addonName)
+                ))
+
+        return result
+
+    def isValid(self):
+        """
+        Return a boolean telling if no issues were found.
+        """
+        return not self.issues()
+
+    def __validateSoftware(self, fileName, softwareName, softwareContents):
+        """
+        Validate the contents of a software.
+
+        @private
+        """
+        keyPath = (softwareName,)
+        self.__validateName(fileName, keyPath, softwareName)
+
+        # simple format (version only)
+        if isinstance(softwareContents, basestring):
+            self.__validateVersion(fileName, keyPath, softwareContents)
+            self.__softwareNames.add(softwareName)
+            return
+
+        if not isinstance(softwareContents, dict):
+            self.__addIssue(
+                fileName,
+                keyPath,
+                'Could not decode version for "{0}"'.format(softwareName)
+            )
+            return
+
+        # compound format (with addons, options)
+        if softwareContents.get('version'):
+            self.__validateVersion(fileName, keyPath + ('version',), softwareContents['version'])
+            self.__softwareNames.add(softwareName)
+        else:
+            self.__addIssue(
+                fileName,
+                keyPath,
+                'Could not decode version for "{0}"'.format(softwareName)
+            )
+
+        if 'options' in softwareContents:
+            self.__validateOptions(fileName, keyPath + ('options',), softwareContents['options'])
+
+        addons = softwareContents.get('addons', {})
+        if not isinstance(addons, dict):
+            self.__addIssue(fileName, keyPath + ('addons',), 'Expecting object for addons!')
+            return
+
+        for addonName, addonContents in addons.items():
+            addonKeyPath = keyPath + ('addons', addonName)
+            self.__validateAddonName(fileName, addonKeyPath, addonName)
+
+            if not isinstance(addonContents, dict):
+                self.__addIssue(fileName, addonKeyPath, 'Expecting object as content for addon!')
+            elif 'options' in addonContents:
+                self.__validateOptions(fileName, addonKeyPath + ('options',), addonContents['options'])
+
+    def __validateAddonName(self, fileName, keyPath, addonName):
+        """
+        Validate an addon name and keep the reference to check its version.
+
+        @private
+        """
+        self.__validateName(fileName, keyPath, addonName)
+        self.__addonReferences.append((fileName, keyPath, addonName))
+
+    def __validateName(self, fileName, keyPath, name):
+        """
+        Validate a software or addon name.
+
+        @private
+        """
+        # names are repeated a lot by the addons
+        if name in self.__validNames:
+            return
+
+        if Versioned.isValidName(name):
+            self.__validNames.add(name)
+        else:
+            self.__addIssue(fileName, keyPath, 'Invalid name: "{0}"'.format(name))
+
+    def __validateVersion(self, fileName, keyPath, version):
+        """
+        Validate a version.
+
+        @private
+        """
+        if not Versioned.isValidVersion(version):
+            self.__addIssue(
+                fileName,
+                keyPath,
+                'version needs to be defined as valid string "{0}"'.format(version)
+            )
+
+    def __validateOptions(self, fileName, keyPath, options):
+        """
+        Validate the options (names need to be non empty strings).
+
+        @private
+        """
+        if not isinstance(options, dict):
+            self.__addIssue(fileName, keyPath, 'options need to be a dictionary')
+            return
+
+        for optionName, optionValue in options.items():
+            if not (isinstance(optionName, basestring) and len(optionName)):
+                self.__addIssue(
+                    fileName,
+                    keyPath,
+                    'Invalid option name: "{0}"'.format(optionName)
+                )
+
+            if type(optionValue) not in self.__optionScalarTypes:
+                self.__validateOptionValue(fileName, keyPath + (optionName,), optionValue)
+
+    def __validateOptionValue(self, fileName, keyPath, value):
+        """
+        Validate an option value (strings, numbers, booleans, None, lists and dicts with string keys).
+
+        @private
+        """
+        if type(value) in self.__optionScalarTypes:
+            return
+
+        if isinstance(value, (list, tuple)):
+            for index, item in enumerate(value):
+                self.__validateOptionValue(fileName, keyPath + (index,), item)
+        elif isinstance(value, dict):
+            for key, item in value.items():
+                if not isinstance(key, basestring):
+                    self.__addIssue(fileName, keyPath, 'Invalid option key: "{0}"'.format(key))
+                self.__validateOptionValue(fileName, keyPath + (key,), item)
+        else:
+            self.__addIssue(
+                fileName,
+                keyPath,
+                'Invalid option value type: "{0}"'.format(type(value).__name__)
+            )
+
+    def __addIssue(self, fileName, keyPath, message):
+        """
+        Add an issue.
+
+        @private
+        """
+        self.__issues.append(ValidationIssue(fileName, keyPath, message))
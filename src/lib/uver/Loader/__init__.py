@@ -1,9 +1,36 @@
-from .Loader import Loader, AddonNotFoundError
-from .JsonLoader import\
-    JsonLoader, \
-    UnexpectedRootContentError, \
-    UnexpectedAddonsDataError, \
-    UnexpectedAddonContentError, \
-    UnexpectedVersionFormatError, \
-    InvalidFileError, \
-    InvalidDirectoryError
+import sys
+from ..LazyModule import LazyModule
+
+# submodules are imported on first access (@see LazyModule)
+LazyModule.install(__name__, [
+    ('LazySoftware', '.LazySoftware'),
+    ('LazySoftwareList', '.LazySoftwareList'),
+    ('AddonGraph', '.AddonGraph'),
+    ('Snapshot', '.Snapshot'),
+    ('ProcessResolver', '.ProcessResolver'),
+    ('Loader', '.Loader'),
+    ('AddonNotFoundError', '.Snapshot'),
+    ('JsonCache', '.JsonCache'),
+    ('Provenance', '.Provenance'),
+    ('JsonStreamParser', '.JsonStreamParser'),
+    ('InvalidJsonStreamError', '.JsonStreamParser'),
+    ('JsonLoader', '.JsonLoader'),
+    ('UnexpectedRootContentError', '.JsonLoader'),
+    ('UnexpectedAddonsDataError', '.JsonLoader'),
+    ('UnexpectedAddonContentError', '.JsonLoader'),
+    ('UnexpectedVersionFormatError', '.JsonLoader'),
+    ('InvalidFileError', '.JsonLoader'),
+    ('InvalidDirectoryError', '.JsonLoader'),
+    ('BinaryFormat', '.BinaryFormat'),
+    ('InvalidBinaryFormatError', '.BinaryFormat'),
+    ('BinaryLoader', '.BinaryLoader'),
+    ('Validator', '.Validator'),
+    ('ValidationIssue', '.Validator'),
+    ('LayeredLoader', '.LayeredLoader'),
+    ('SqliteCatalog', '.SqliteCatalog'),
+    ('InvalidSqliteCatalogError', '.SqliteCatalog'),
+    ('SqliteLoader', '.SqliteLoader')
+] + (
+    # asyncio support (python 3.5+)
+    [('AsyncJsonLoader', '.AsyncJsonLoader')] if sys.version_info >= (3, 5) else []
+))
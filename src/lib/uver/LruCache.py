@@ -0,0 +1,87 @@
+import threading
+from collections import OrderedDict
+
+class LruCache(object):
+    """
+    Bounded cache that discards the least recently used entries.
+
+    Keeps hit and miss counters that can be used for monitoring
+    (@see stats). The cache can be shared among threads.
+    """
+
+    __missing = object()
+
+    def __init__(self, maxSize=128):
+        """
+        Create a cache object.
+        """
+        assert maxSize > 0, "cache size needs to be greater than zero"
+
+        self.__maxSize = maxSize
+        self.__entries = OrderedDict()
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def maxSize(self):
+        """
+        Return the maximum number of entries held by the cache.
+        """
+        return self.__maxSize
+
+    def get(self, key, default=None):
+        """
+        Return the cached value for the key (or the default value).
+        """
+        with self.__lock:
+            value = self.__entries.pop(key, self.__missing)
+            if value is self.__missing:
+                self.__misses += 1
+                return default
+
+            # re-inserting it to mark it as the most recently used
+            self.__entries[key] = value
+            self.__hits += 1
+
+        return value
+
+    def set(self, key, value):
+        """
+        Add a value to the cache.
+        """
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = value
+
+            while len(self.__entries) > self.__maxSize:
+                self.__entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Remove all entries from the cache (counters are kept).
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    def stats(self):
+        """
+        Return a dict with the hits, misses and current size of the cache.
+        """
+        return {
+            'hits': self.__hits,
+            'misses': self.__misses,
+            'size': len(self.__entries),
+            'maxSize': self.__maxSize
+        }
+
+    def __contains__(self, key):
+        """
+        Return a boolean telling if the key is cached (does not count as a hit).
+        """
+        return key in self.__entries
+
+    def __len__(self):
+        """
+        Return the number of cached entries.
+        """
+        return len(self.__entries)
@@ -1,3 +1,10 @@
+import bisect
+import threading
+from .Versioned import Versioned, VersionConstraint, AddonRevision
+from .LruCache import LruCache
+from .Instrumentation import Instrumentation
+from .Loader.LazySoftwareList import LazySoftwareList
+
 class SoftwareNotFoundError(Exception):
     """Software not found error."""
 
@@ -7,111 +14,539 @@ class AddonNotFoundError(Exception):
 class Query(object):
     """
     Queries softwares and addons.
+
+    The lookups are served by indexes (name, uver name and addon reverse
+    indexes) that are built once when the softwares are assigned to the
+    query. Changes to the software list should go through {@link addSoftware}
+    or {@link setSoftwares} so the indexes are kept up to date (appending
+    directly to the list returned by {@link softwares} is detected and causes
+    the indexes to be rebuilt on the next lookup).
+
+    The softwares can also be provided as a {@link LazySoftwareList}, in this
+    case the indexes are built from the names known by the list and only the
+    softwares returned by the lookups get created.
+
+    Results derived from the indexes (names, versions and lookups returning
+    lists) are cached, each call returns a new list (or dict) with the
+    cached contents. The cache is bounded (@see resultCacheSize) and
+    cleared whenever the indexes are rebuilt, which also happens when the
+    addons of one of the softwares of the query change
+    (@see Software.watchAddons).
+
+    Lookups can be done by multiple threads (for instance, by the daemon
+    {@link Server}): the indexes are rebuilt (or updated by addSoftware) by
+    one thread at a time and only replace the current ones once they are
+    complete, so the lookups never wait for a lock.
     """
 
+    # maximum number of results kept by the query cache
+    resultCacheSize = 128
+    __missing = object()
+
     def __init__(self, softwares):
         """Create a query object."""
-        self.__setSoftwares(softwares)
+        self.__indexLock = threading.Lock()
+        self.setSoftwares(softwares)
 
     def softwares(self):
         """Return a list of softwares used for queries."""
         return self.__softwares
 
+    def setSoftwares(self, softwares):
+        """
+        Set a list of softwares that should be used by the query.
+        """
+        assert isinstance(softwares, (list, LazySoftwareList)), "Unexcepted type!"
+
+        with self.__indexLock:
+            self.__softwares = softwares
+            self.__results = LruCache(self.resultCacheSize)
+            self.__buildIndexes()
+
+    def addSoftware(self, software):
+        """
+        Add a software to the query.
+        """
+        self.__indexes()
+        with self.__indexLock:
+            self.__softwares.append(software)
+            position = len(self.__softwares) - 1
+
+            # updating copies, the lookups running meanwhile keep using the
+            # current indexes until the new ones are assigned
+            indexData, versionIndexData = self.__copyIndexes(software)
+            self.__indexSoftware(position, indexData, self.__unwatched, self.__addonRevision)
+            if versionIndexData is not None:
+                self.__indexSoftwareVersion(versionIndexData, self.__software(position))
+
+            self.__versionIndexData = versionIndexData
+            self.__indexData = indexData
+            self.__results.clear()
+            self.__indexedSize += 1
+
+    def cacheStats(self):
+        """
+        Return a dict with the hits, misses and size of the result cache.
+
+        @see LruCache.stats
+        """
+        return self.__results.stats()
+
     def softwareNames(self):
         """
         Return a list of software names.
         """
-        return list(map(lambda x: x.name(), self.softwares()))
+        return list(self.__cached(('softwareNames',), self.__computeSoftwareNames))
 
     def softwareUverNames(self):
         """
         Return a list of software uver names.
         """
-        return list(map(lambda x: x.uverName(), self.softwares()))
+        return list(self.__cached(
+            ('softwareUverNames',),
+            lambda: list(map(Versioned.toUverName, self.softwareNames()))
+        ))
 
     def addonNames(self):
         """
         Return a list of all addon names among the softwares.
         """
-        result = set()
-
-        for software in self.softwares():
-            for addonName in software.addonNames():
-                result.add(addonName)
-
-        return list(result)
+        return list(self.__cached(
+            ('addonNames',),
+            lambda: list(self.__indexes()['addonName'].keys())
+        ))
 
     def addonUverNames(self):
         """
         Return a list of all addon uver names among the softwares.
         """
-        result = set()
+        return list(self.__cached(
+            ('addonUverNames',),
+            lambda: list(self.__indexes()['addonUverName'].keys())
+        ))
 
-        for software in self.softwares():
-            for addon in map(lambda x: software.addon(x), software.addonNames()):
-                result.add(addon.uverName())
+    def uverVersions(self, target=None):
+        """
+        Return a dict with the uver names and versions of the softwares.
 
-        return list(result)
+        Addons that are not part of the softwares are included through the
+        version assigned to them. The variables are added to the target dict
+        when provided (for instance, os.environ), otherwise a new dict is
+        returned.
+        """
+        versions = self.__cached(('uverVersions',), self.__computeUverVersions)
+
+        if target is None:
+            return dict(versions)
+
+        target.update(versions)
+        return target
 
     def softwareByName(self, name):
         """
         Return a software instance based on software's name.
         """
-        for software in self.softwares():
-            if name == software.name():
-                return software
+        index = self.__indexes()['name']
+        if name not in index:
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}"'.format(name)
+            )
 
-        raise SoftwareNotFoundError(
-            'Could not find software "{0}"'.format(name)
-        )
+        return self.__software(index[name])
 
     def softwareByUverName(self, uverName):
         """
         Return a software instance based on software's uver name.
         """
-        for software in self.softwares():
-            if uverName == software.uverName():
-                return software
+        index = self.__indexes()['uverName']
+        if uverName not in index:
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}"'.format(uverName)
+            )
 
-        raise SoftwareNotFoundError(
-            'Could not find software "{0}"'.format(uverName)
-        )
+        return self.__software(index[uverName])
 
     def softwaresByAddonName(self, name):
         """
         Return a list of software instances based on addon's name.
         """
-        result = []
-        for software in self.softwares():
-            if name in software.addonNames():
-                result.append(software)
-
-        if not result:
+        index = self.__indexes()['addonName']
+        if name not in index:
             raise AddonNotFoundError(
                 'Could not find any software with addon "{0}"'.format(name)
             )
 
-        return result
+        return list(self.__cached(
+            ('softwaresByAddonName', name),
+            lambda: list(map(self.__software, index[name]))
+        ))
 
     def softwaresByAddonUverName(self, uverName):
         """
         Return a list of software instances based on addon's uver name.
         """
-        result = []
-        for software in self.softwares():
-            for addon in map(lambda x: software.addon(x), software.addonNames()):
-                if addon.uverName() == uverName:
-                    result.append(software)
+        index = self.__indexes()['addonUverName']
+        if uverName not in index:
+            raise AddonNotFoundError(
+                'Could not find any software with addon "{0}"'.format(uverName)
+            )
+
+        return list(self.__cached(
+            ('softwaresByAddonUverName', uverName),
+            lambda: list(map(self.__software, index[uverName]))
+        ))
+
+    def latestSoftwareByName(self, name):
+        """
+        Return the software instance with the highest version for the name.
+
+        Versions are compared through {@link Versioned.versionKey}.
+        """
+        self.__indexes()
+        versionIndex = self.__versionIndexes()['name'].get(name)
+        if versionIndex is None:
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}"'.format(name)
+            )
+
+        return versionIndex['softwares'][-1]
+
+    def softwaresByVersion(self, name, constraint):
+        """
+        Return a list of software instances with the name matching the constraint.
+
+        The constraint can be either a string (for instance ">=2.0,<3") or a
+        {@link VersionConstraint}. The result is sorted by version (lowest
+        first).
+        """
+        self.__indexes()
+        versionIndex = self.__versionIndexes()['name'].get(name)
+        result = list(map(
+            lambda x: versionIndex['softwares'][x],
+            self.__matchVersionIndex(versionIndex, constraint)
+        ))
+
+        if not result:
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}" matching "{1}"'.format(
+                    name,
+                    self.__versionConstraint(constraint).expression()
+                )
+            )
+
+        return result
+
+    def softwaresByAddonVersion(self, name, constraint):
+        """
+        Return a list of software instances that have the addon matching the constraint.
+
+        The constraint is checked against the version of the addon assigned to
+        each software (@see softwaresByVersion). The result is sorted by the
+        addon version (lowest first).
+        """
+        self.__indexes()
+        versionIndex = self.__versionIndexes()['addonName'].get(name)
+        result = list(map(
+            lambda x: versionIndex['softwares'][x],
+            self.__matchVersionIndex(versionIndex, constraint)
+        ))
 
         if not result:
             raise AddonNotFoundError(
-                'Could not find any software with addon "{0}"'.format(uverName)
+                'Could not find any software with addon "{0}" matching "{1}"'.format(
+                    name,
+                    self.__versionConstraint(constraint).expression()
+                )
             )
 
         return result
 
-    def __setSoftwares(self, softwares):
-        """Set a list of softwares that should be used by the query."""
-        assert isinstance(softwares, list), "Unexcepted type!"
+    def __indexes(self):
+        """
+        Return the lookup indexes, rebuilding them when the list has changed.
+
+        @private
+        """
+        if self.__indexesChanged():
+            with self.__indexLock:
+                # making sure another thread has not rebuilt them already
+                if self.__indexesChanged():
+                    self.__buildIndexes()
+
+        return self.__indexData
+
+    def __indexesChanged(self):
+        """
+        Return a boolean telling if the indexes are out of date.
+
+        @private
+        """
+        return len(self.__softwares) != self.__indexedSize or \
+            self.__addonRevision.value() != 0
+
+    def __cached(self, key, compute):
+        """
+        Return the cached result for the key, computing it when necessary.
+
+        @private
+        """
+        # making sure the cache is still valid
+        self.__indexes()
+
+        result = self.__results.get(key, self.__missing)
+        if result is self.__missing:
+            result = compute()
+            self.__results.set(key, result)
+
+        return result
+
+    def __computeSoftwareNames(self):
+        """
+        Return a new list of software names.
+
+        @private
+        """
+        if isinstance(self.__softwares, LazySoftwareList):
+            return self.__softwares.names()
+
+        return list(map(lambda x: x.name(), self.__softwares))
+
+    def __computeUverVersions(self):
+        """
+        Return a new dict with the uver names and versions of the softwares.
+
+        @private
+        """
+        softwareVersions = {}
+        addonVersions = {}
+        for software in map(self.__software, range(len(self.__softwares))):
+            softwareVersions.setdefault(software.uverName(), software.version())
+
+            for addonName in software.addonNames():
+                addon = software.addon(addonName)
+                addonVersions.setdefault(addon.uverName(), addon.version())
+
+        # the versions of the softwares take precedence over the addons
+        addonVersions.update(softwareVersions)
+
+        return addonVersions
+
+    def __versionIndexes(self):
+        """
+        Return the indexes sorted by version, building them on demand.
+
+        @private
+        """
+        versionIndexData = self.__versionIndexData
+        if versionIndexData is None:
+            with self.__indexLock:
+                # making sure another thread has not built them already
+                versionIndexData = self.__versionIndexData
+                if versionIndexData is None:
+                    versionIndexData = {
+                        'name': {},
+                        'addonName': {}
+                    }
+
+                    for software in map(self.__software, range(len(self.__softwares))):
+                        self.__indexSoftwareVersion(versionIndexData, software)
+
+                    self.__versionIndexData = versionIndexData
+
+        return versionIndexData
+
+    def __indexSoftwareVersion(self, versionIndexData, software):
+        """
+        Add a software (and its addons) to the version indexes.
+
+        @private
+        """
+        self.__insertVersionIndex(
+            versionIndexData['name'],
+            software.name(),
+            software,
+            software
+        )
+
+        for addonName in software.addonNames():
+            self.__insertVersionIndex(
+                versionIndexData['addonName'],
+                addonName,
+                software.addon(addonName),
+                software
+            )
+
+    @staticmethod
+    def __insertVersionIndex(index, name, versioned, software):
+        """
+        Insert a versioned into the sorted index entry of the name.
+
+        @private
+        """
+        if name not in index:
+            index[name] = {
+                'keys': [],
+                'softwares': []
+            }
+
+        entry = index[name]
+        key = versioned.versionKey()
+
+        # equal versions keep the order of the softwares
+        position = bisect.bisect_right(entry['keys'], key)
+        entry['keys'].insert(position, key)
+        entry['softwares'].insert(position, software)
+
+    @classmethod
+    def __matchVersionIndex(cls, entry, constraint):
+        """
+        Return the positions in the index entry matching the constraint.
+
+        @private
+        """
+        constraint = cls.__versionConstraint(constraint)
+        if entry is None:
+            return []
+
+        start, end = constraint.range(entry['keys'])
+
+        return list(filter(
+            lambda x: constraint.matchesKey(entry['keys'][x]),
+            range(start, end)
+        ))
+
+    @staticmethod
+    def __versionConstraint(constraint):
+        """
+        Return the input as a version constraint object.
+
+        @private
+        """
+        if isinstance(constraint, VersionConstraint):
+            return constraint
+
+        return VersionConstraint(constraint)
+
+    def __buildIndexes(self):
+        """
+        Build the lookup indexes from scratch.
+
+        The new indexes are only assigned once they are complete.
+
+        @private
+        """
+        indexData = {
+            'name': {},
+            'uverName': {},
+            'addonName': {},
+            'addonUverName': {}
+        }
+        unwatched = set()
+        addonRevision = AddonRevision()
+
+        size = len(self.__softwares)
+        for position in range(size):
+            self.__indexSoftware(position, indexData, unwatched, addonRevision)
+
+        self.__unwatched = unwatched
+        self.__addonRevision = addonRevision
+        self.__versionIndexData = None
+        self.__indexData = indexData
+        self.__results.clear()
+        self.__indexedSize = size
+
+    def __copyIndexes(self, software):
+        """
+        Return copies of the (lookup, version) indexes that can be updated with the software.
+
+        Only the entries the software is added to are copied, the version
+        indexes are None when they have not been built yet.
+
+        @private
+        """
+        addonNames = software.addonNames()
+
+        indexData = dict(map(lambda x: (x[0], dict(x[1])), self.__indexData.items()))
+        for addonName in addonNames:
+            for indexName, key in (('addonName', addonName), ('addonUverName', Versioned.toUverName(addonName))):
+                if key in indexData[indexName]:
+                    indexData[indexName][key] = list(indexData[indexName][key])
+
+        versionIndexData = self.__versionIndexData
+        if versionIndexData is not None:
+            versionIndexData = dict(map(lambda x: (x[0], dict(x[1])), versionIndexData.items()))
+            for indexName, key in [('name', software.name())] + list(map(lambda x: ('addonName', x), addonNames)):
+                entry = versionIndexData[indexName].get(key)
+                if entry is not None:
+                    versionIndexData[indexName][key] = {
+                        'keys': list(entry['keys']),
+                        'softwares': list(entry['softwares'])
+                    }
+
+        return indexData, versionIndexData
+
+    def __software(self, position):
+        """
+        Return the software at the position of the list.
+
+        Softwares of a lazy list are watched (@see Software.watchAddons) once
+        they get created.
+
+        @private
+        """
+        software = self.__softwares[position]
+        unwatched = self.__unwatched
+        if unwatched and position in unwatched:
+            unwatched.discard(position)
+            software.watchAddons(self.__addonRevision)
+
+        return software
+
+    def __indexSoftware(self, position, indexData, unwatched, addonRevision):
+        """
+        Add the software at the position of the list to the lookup indexes.
+
+        The indexes hold positions in the software list.
+
+        @private
+        """
+        softwares = self.__softwares
+
+        # avoiding to create the softwares of a lazy list, they are only
+        # watched once created (@see __software)
+        if isinstance(softwares, LazySoftwareList) and not softwares.isCreated(position):
+            name = softwares.name(position)
+            addonNames = softwares.addonNames(position)
+            unwatched.add(position)
+        else:
+            software = softwares[position]
+            software.watchAddons(addonRevision)
+            name = software.name()
+            addonNames = software.addonNames()
+
+        # the first software wins, same as a scan through the list
+        indexData['name'].setdefault(name, position)
+        indexData['uverName'].setdefault(Versioned.toUverName(name), position)
+
+        for addonName in addonNames:
+            indexData['addonName'].setdefault(addonName, []).append(position)
+            indexData['addonUverName'].setdefault(
+                Versioned.toUverName(addonName),
+                []
+            ).append(position)
+
 
-        self.__softwares = softwares
+Instrumentation.instrument(Query, (
+    'softwareNames',
+    'softwareUverNames',
+    'addonNames',
+    'addonUverNames',
+    'uverVersions',
+    'softwareByName',
+    'softwareByUverName',
+    'softwaresByAddonName',
+    'softwaresByAddonUverName',
+    'latestSoftwareByName',
+    'softwaresByVersion',
+    'softwaresByAddonVersion'
+))
@@ -0,0 +1,276 @@
+from .Versioned import Versioned, VersionConstraint, Software, Addon, InvalidVersionError
+from .LruCache import LruCache
+from .Instrumentation import Instrumentation
+from .Query import SoftwareNotFoundError, AddonNotFoundError
+from .Loader import AddonNotFoundError as AddonVersionNotFoundError
+
+class SqliteQuery(object):
+    """
+    Queries softwares and addons straight from a sqlite catalog.
+
+    Provides the lookups of {@link Query} for a {@link SqliteCatalog}
+    without building the list of softwares: each lookup is served by the
+    catalog indexes and only the softwares it returns get created. Versions
+    defined by the env override the versions from the catalog (the same
+    way as {@link Loader.softwares}).
+
+    Created softwares are cached (@see softwareCacheSize), so they are
+    shared between calls and should be treated as read-only. Since names
+    are unique in a catalog, {@link latestSoftwareByName} is the same as
+    {@link softwareByName}.
+    """
+
+    # maximum number of softwares kept by the query cache
+    softwareCacheSize = 1024
+
+    def __init__(self, catalog, env={}):
+        """Create a sqlite query object."""
+        self.__catalog = catalog
+        self.__env = dict(env)
+        self.__softwares = LruCache(self.softwareCacheSize)
+
+    def catalog(self):
+        """Return the catalog used for queries."""
+        return self.__catalog
+
+    def cacheStats(self):
+        """
+        Return a dict with the hits, misses and size of the software cache.
+
+        @see LruCache.stats
+        """
+        return self.__softwares.stats()
+
+    def softwareNames(self):
+        """
+        Return a list of software names.
+        """
+        return self.__catalog.softwareNames()
+
+    def softwareUverNames(self):
+        """
+        Return a list of software uver names.
+        """
+        return list(map(Versioned.toUverName, self.softwareNames()))
+
+    def addonNames(self):
+        """
+        Return a list of all addon names among the softwares.
+        """
+        return self.__catalog.addonNames()
+
+    def addonUverNames(self):
+        """
+        Return a list of all addon uver names among the softwares.
+        """
+        return self.__catalog.addonUverNames()
+
+    def uverVersions(self, target=None):
+        """
+        Return a dict with the uver names and versions of the softwares.
+
+        The variables are added to the target dict when provided (for
+        instance, os.environ), otherwise a new dict is returned.
+        """
+        versions = {}
+        for uverName, version in self.__catalog.uverVersions():
+            if uverName not in versions:
+                versions[uverName] = self.__version(uverName, version)
+
+        if target is None:
+            return versions
+
+        target.update(versions)
+        return target
+
+    def softwareByName(self, name):
+        """
+        Return a software instance based on software's name.
+        """
+        software = self.__software(name)
+        if software is None:
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}"'.format(name)
+            )
+
+        return software
+
+    def softwareByUverName(self, uverName):
+        """
+        Return a software instance based on software's uver name.
+        """
+        name = self.__catalog.softwareNameByUverName(uverName)
+        if name is None:
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}"'.format(uverName)
+            )
+
+        return self.softwareByName(name)
+
+    def softwaresByAddonName(self, name):
+        """
+        Return a list of software instances based on addon's name.
+        """
+        names = self.__catalog.softwareNamesByAddonName(name)
+        if not names:
+            raise AddonNotFoundError(
+                'Could not find any software with addon "{0}"'.format(name)
+            )
+
+        return list(map(self.softwareByName, names))
+
+    def softwaresByAddonUverName(self, uverName):
+        """
+        Return a list of software instances based on addon's uver name.
+        """
+        names = self.__catalog.softwareNamesByAddonUverName(uverName)
+        if not names:
+            raise AddonNotFoundError(
+                'Could not find any software with addon "{0}"'.format(uverName)
+            )
+
+        return list(map(self.softwareByName, names))
+
+    def latestSoftwareByName(self, name):
+        """
+        Return the software instance with the highest version for the name.
+        """
+        return self.softwareByName(name)
+
+    def softwaresByVersion(self, name, constraint):
+        """
+        Return a list of software instances with the name matching the constraint.
+
+        The constraint can be either a string (for instance ">=2.0,<3") or a
+        {@link VersionConstraint}.
+        """
+        constraint = self.__versionConstraint(constraint)
+        software = self.__software(name)
+
+        if software is None or not constraint.matches(software.version()):
+            raise SoftwareNotFoundError(
+                'Could not find software "{0}" matching "{1}"'.format(
+                    name,
+                    constraint.expression()
+                )
+            )
+
+        return [software]
+
+    def softwaresByAddonVersion(self, name, constraint):
+        """
+        Return a list of software instances that have the addon matching the constraint.
+
+        The constraint is checked against the version of the addon assigned to
+        each software (@see softwaresByVersion). The result is sorted by the
+        addon version (lowest first), same as {@link Query.softwaresByAddonVersion}.
+        """
+        constraint = self.__versionConstraint(constraint)
+
+        # equal versions keep the order of the softwares (stable sort)
+        result = sorted(
+            filter(
+                lambda x: constraint.matches(x.addon(name).version()),
+                map(self.softwareByName, self.__catalog.softwareNamesByAddonName(name))
+            ),
+            key=lambda x: x.addon(name).versionKey()
+        )
+
+        if not result:
+            raise AddonNotFoundError(
+                'Could not find any software with addon "{0}" matching "{1}"'.format(
+                    name,
+                    constraint.expression()
+                )
+            )
+
+        return result
+
+    def __software(self, name):
+        """
+        Return the software for the name, creating it when necessary (None when not found).
+
+        @private
+        """
+        software = self.__softwares.get(name)
+        if software is not None:
+            return software
+
+        info = self.__catalog.softwareInfo(name)
+        if info is None:
+            return None
+
+        software = Software(name, self.__version(Versioned.toUverName(name), info['version']))
+        self.__setVersionedOptions(software, info['options'])
+
+        for addonName, addonVersion, addonOptions in self.__catalog.softwareAddons(name):
+            if addonVersion is None:
+                raise AddonVersionNotFoundError(
+                    'Could not find a version for the addon "{0}"'.format(
+                        addonName
+                    )
+                )
+
+            addon = Addon(addonName, self.__version(Versioned.toUverName(addonName), addonVersion))
+            self.__setVersionedOptions(addon, addonOptions)
+            software.addAddon(addon)
+
+        self.__softwares.set(name, software)
+
+        return software
+
+    def __version(self, uverName, version):
+        """
+        Return the version for the uver name, which can be overridden by the env.
+
+        @private
+        """
+        if uverName in self.__env:
+            overrideVersion = self.__env[uverName]
+            if overrideVersion != version and not Versioned.isValidVersion(overrideVersion):
+                raise InvalidVersionError(
+                    'version needs to be defined as valid string "{0}"'.format(
+                        overrideVersion
+                    )
+                )
+            version = overrideVersion
+
+        return version
+
+    @staticmethod
+    def __setVersionedOptions(versioned, options):
+        """
+        Set options to a versioned instance.
+
+        @private
+        """
+        for optionName, optionValue in options.items():
+            versioned.setOption(optionName, optionValue)
+
+    @staticmethod
+    def __versionConstraint(constraint):
+        """
+        Return the input as a version constraint object.
+
+        @private
+        """
+        if isinstance(constraint, VersionConstraint):
+            return constraint
+
+        return VersionConstraint(constraint)
+
+
+Instrumentation.instrument(SqliteQuery, (
+    'softwareNames',
+    'softwareUverNames',
+    'addonNames',
+    'addonUverNames',
+    'uverVersions',
+    'softwareByName',
+    'softwareByUverName',
+    'softwaresByAddonName',
+    'softwaresByAddonUverName',
+    'latestSoftwareByName',
+    'softwaresByVersion',
+    'softwaresByAddonVersion'
+))
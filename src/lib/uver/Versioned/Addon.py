@@ -5,11 +5,9 @@ class Addon(Versioned):
     Implements the addon support to the versioned.
     """
 
-    def __init__(self, *args, **kwargs):
-        """
-        Create an addon object.
-        """
-        super(Addon, self).__init__(*args, **kwargs)
+    __slots__ = ()
 
-        # setting default options
-        self.setOption('enabled', True)
+    # addons are enabled by default
+    defaultOptions = {
+        'enabled': True
+    }
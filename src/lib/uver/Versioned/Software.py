@@ -1,21 +1,60 @@
+import weakref
 from .Versioned import Versioned
 from .Addon import Addon
 
 class InvalidAddonError(Exception):
     """Invalid addon error."""
 
+class AddonRevision(object):
+    """
+    Counter bumped whenever the addons of the watched softwares change.
+
+    @see Software.watchAddons
+    """
+
+    __slots__ = ('__value', '__weakref__')
+
+    def __init__(self):
+        """
+        Create an addon revision object.
+        """
+        self.__value = 0
+
+    def value(self):
+        """
+        Return the number of changes to the addons of the watched softwares.
+        """
+        return self.__value
+
+    def bump(self):
+        """
+        Record a change to the addons of a watched software.
+        """
+        self.__value += 1
+
 class Software(Versioned):
     """
     Implements software support to the versioned.
+
+    Information derived from the addons of softwares (for instance, by
+    {@link Query}) can be kept up to date by watching the softwares
+    (@see watchAddons). Addons added while a software is being built are
+    not considered changes.
     """
 
+    __slots__ = ('__addons', '__addonWatchers')
+
+    # shared by the softwares without addons (never modify it in place)
+    __noAddons = {}
+
     def __init__(self, *args, **kwargs):
         """
         Create a software object.
         """
         super(Software, self).__init__(*args, **kwargs)
 
-        self.__addons = {}
+        self.__addons = self.__noAddons
+        self.__addonWatchers = None
 
     def addAddon(self, addon):
         """
@@ -23,8 +62,17 @@ class Software(Versioned):
         """
         assert isinstance(addon, Addon), "Invalid addon type!"
 
+        if self.__addons is self.__noAddons:
+            self.__addons = {}
+
         self.__addons[addon.name()] = addon
 
+        if self.__addonWatchers is not None:
+            for watcher in self.__addonWatchers:
+                revision = watcher()
+                if revision is not None:
+                    revision.bump()
+
     def addon(self, name):
         """
         Return an addon object.
@@ -39,3 +87,17 @@ class Software(Versioned):
         Return a list of addon names.
         """
         return self.__addons.keys()
+
+    def watchAddons(self, revision):
+        """
+        Bump the {@link AddonRevision} whenever the addons of the software change.
+
+        The revision is only weakly referenced by the software.
+        """
+        # dropping the revisions that are gone
+        watchers = list(filter(
+            lambda x: x() is not None,
+            self.__addonWatchers or ()
+        ))
+        watchers.append(weakref.ref(revision))
+        self.__addonWatchers = watchers
@@ -0,0 +1,166 @@
+import re
+import bisect
+
+class InvalidVersionConstraintError(Exception):
+    """Invalid version constraint error."""
+
+class Version(object):
+    """
+    Parses versions into keys that can be compared and sorted.
+
+    A version is split into numeric and alphabetic components (dots are only
+    separators, "1.0a" is the same as "1.0.a"), numbers are compared
+    numerically and words alphabetically.
+
+    Words are pre-release tags: a version with a tag sorts before the
+    release it tags and after the previous releases, for instance
+    "2.9" < "3.0alpha" < "3.0beta" < "3.0beta.2" < "3.0" < "3.0.1". Hence
+    "3.0beta" is matched by "<3" and not by ">=3" (@see VersionConstraint).
+
+    Trailing zeros are ignored, both at the end of the version and before a
+    tag, therefore "2", "2.0" and "2.0.0" are the same version, as well as
+    "1.0.beta" and "1.0.0.beta".
+    """
+
+    __componentRegEx = re.compile('[0-9]+|[^\\W0-9]+')
+
+    # maximum number of memoized keys
+    keyCacheSize = 8192
+    __keys = {}
+    __zero = (2, 0, '')
+    __end = (1, 0, '')
+
+    @staticmethod
+    def key(version):
+        """
+        Return the key used to compare the input version (memoized).
+        """
+        try:
+            return Version.__keys[version]
+        except KeyError:
+            pass
+
+        # words sort before the end of the version, which sorts before numbers
+        components = []
+        for component in Version.__componentRegEx.findall(version):
+            if component.isdigit():
+                components.append((2, int(component), ''))
+                continue
+
+            # dropping the zeros before the tag
+            while components and components[-1] == Version.__zero:
+                components.pop()
+            components.append((0, 0, component))
+
+        while components and components[-1] == Version.__zero:
+            components.pop()
+        components.append(Version.__end)
+        result = tuple(components)
+
+        # keeping the memoization bounded
+        if len(Version.__keys) >= Version.keyCacheSize:
+            Version.__keys.clear()
+        Version.__keys[version] = result
+
+        return result
+
+    @staticmethod
+    def compare(versionA, versionB):
+        """
+        Return -1, 0 or 1 when versionA is lower, equal or greater than versionB.
+        """
+        keyA = Version.key(versionA)
+        keyB = Version.key(versionB)
+
+        return (keyA > keyB) - (keyA < keyB)
+
+class VersionConstraint(object):
+    """
+    Constraint used to match versions.
+
+    The constraint is a comma separated list of comparisons that need to be
+    satisfied, for instance: ">=2.0,<3", "!=2.1", "==1.0" (or just "1.0").
+    Supported operators: ==, !=, >=, <=, >, <.
+    """
+
+    __expressionRegEx = re.compile('^\\s*(==|!=|>=|<=|>|<)?\\s*(([^\\W]|\\.)+)\\s*$')
+
+    def __init__(self, expression):
+        """
+        Create a version constraint object.
+        """
+        self.__expression = expression
+        self.__comparisons = []
+
+        if not expression.strip():
+            raise InvalidVersionConstraintError(
+                'Empty version constraint!'
+            )
+
+        for comparison in expression.split(','):
+            match = self.__expressionRegEx.match(comparison)
+            if not match:
+                raise InvalidVersionConstraintError(
+                    'Invalid version constraint "{0}"'.format(expression)
+                )
+
+            self.__comparisons.append(
+                (match.group(1) or '==', Version.key(match.group(2)))
+            )
+
+    def expression(self):
+        """
+        Return the constraint expression.
+        """
+        return self.__expression
+
+    def matches(self, version):
+        """
+        Return a boolean telling if the version satisfies the constraint.
+        """
+        return self.matchesKey(Version.key(version))
+
+    def matchesKey(self, key):
+        """
+        Return a boolean telling if the version key satisfies the constraint.
+        """
+        for operator, otherKey in self.__comparisons:
+            if operator == '==':
+                success = key == otherKey
+            elif operator == '!=':
+                success = key != otherKey
+            elif operator == '>=':
+                success = key >= otherKey
+            elif operator == '<=':
+                success = key <= otherKey
+            elif operator == '>':
+                success = key > otherKey
+            else:
+                success = key < otherKey
+
+            if not success:
+                return False
+
+        return True
+
+    def range(self, sortedKeys):
+        """
+        Return the (start, end) slice of the sorted keys that can match.
+
+        The slice is computed through binary searches, keys inside of it
+        still need to be checked against "!=" comparisons (@see matchesKey).
+        """
+        start = 0
+        end = len(sortedKeys)
+        for operator, otherKey in self.__comparisons:
+            if operator in ('==', '>='):
+                start = max(start, bisect.bisect_left(sortedKeys, otherKey))
+            elif operator == '>':
+                start = max(start, bisect.bisect_right(sortedKeys, otherKey))
+
+            if operator in ('==', '<='):
+                end = min(end, bisect.bisect_right(sortedKeys, otherKey))
+            elif operator == '<':
+                end = min(end, bisect.bisect_left(sortedKeys, otherKey))
+
+        return (start, max(start, end))
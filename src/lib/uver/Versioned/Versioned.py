@@ -1,4 +1,5 @@
 import re
+from .Version import Version
 
 # compatibility with python 2/3
 try:
@@ -6,6 +7,11 @@ try:
 except NameError:
     basestring = str
 
+try:
+    intern
+except NameError:
+    from sys import intern
+
 class InvalidNameError(Exception):
     """Invalid name error."""
 
@@ -18,16 +24,31 @@ class InvalidVersionError(Exception):
 class Versioned(object):
     """
     Abstract versioned object.
+
+    Versioned objects use slots rather than a per-instance dict. The options
+    start pointing to the class defaults (@see defaultOptions), which are
+    shared among all instances and copied the first time an option is set.
+    Names are interned, so instances created for the same software share
+    the same name string.
     """
 
+    __slots__ = ('__name', '__version', '__versionKey', '__options')
     __nameRegEx = re.compile('^[^\W]+$')
     __versionRegEx = re.compile('^([^\W]|\.)+$')
 
+    # shared options used until an option is set (never modify it in place)
+    defaultOptions = {}
+
+    # maximum number of names memoized by toUverName
+    uverNameCacheSize = 4096
+    __uverNames = {}
+
     def __init__(self, name, version):
         """
         Create a versioned object.
         """
-        self.__options = {}
+        self.__options = self.defaultOptions
+        self.__versionKey = None
         self.__setName(name)
         self.__setVersion(version)
 
@@ -37,6 +58,15 @@ class Versioned(object):
         """
         return self.__version
 
+    def versionKey(self):
+        """
+        Return the key used to compare and sort the version (@see Version.key).
+        """
+        if self.__versionKey is None:
+            self.__versionKey = Version.key(self.__version)
+
+        return self.__versionKey
+
     def uverName(self):
         """
         Return the environment variable name of the versioned.
@@ -52,6 +82,10 @@ class Versioned(object):
 
         assert len(name), "option name cannot be empty"
 
+        # copy on write of the shared default options
+        if self.__options is self.defaultOptions:
+            self.__options = dict(self.__options)
+
         self.__options[name] = value
 
     def option(self, name):
@@ -79,13 +113,43 @@ class Versioned(object):
     def toUverName(name):
         """
         Convert the input software name to the uver name convention.
+
+        The conversions are memoized (up to {@link uverNameCacheSize} names)
+        and the returned uver names are interned.
         """
+        try:
+            return Versioned.__uverNames[name]
+        except (KeyError, TypeError):
+            pass
+
         assert isinstance(name, basestring), \
             "Invalid type"
 
-        return 'UVER_{0}_VERSION'.format(
+        uverName = Versioned.__intern('UVER_{0}_VERSION'.format(
             name.upper()
-        )
+        ))
+
+        # keeping the memoization bounded
+        if len(Versioned.__uverNames) >= Versioned.uverNameCacheSize:
+            Versioned.__uverNames.clear()
+
+        Versioned.__uverNames[name] = uverName
+
+        return uverName
+
+    @staticmethod
+    def isValidName(name):
+        """
+        Return a boolean telling if the input can be used as name.
+        """
+        return bool(isinstance(name, basestring) and len(name) and Versioned.__nameRegEx.match(name))
+
+    @staticmethod
+    def isValidVersion(version):
+        """
+        Return a boolean telling if the input can be used as version.
+        """
+        return bool(isinstance(version, basestring) and len(version) and Versioned.__versionRegEx.match(version))
 
     def __setName(self, name):
         """
@@ -93,12 +157,12 @@ class Versioned(object):
 
         @private
         """
-        if not (isinstance(name, basestring) and len(name) and self.__nameRegEx.match(name)):
+        if not self.isValidName(name):
             raise InvalidNameError(
                 'Invalid addon name: "{0}"'.format(name)
             )
 
-        self.__name = name
+        self.__name = self.__intern(name)
 
     def __setVersion(self, version):
         """
@@ -106,7 +170,7 @@ class Versioned(object):
 
         @private
         """
-        if not (isinstance(version, basestring) and len(version) and self.__versionRegEx.match(version)):
+        if not self.isValidVersion(version):
             raise InvalidVersionError(
                 'version needs to be defined as valid string "{0}"'.format(
                     version
@@ -114,3 +178,16 @@ class Versioned(object):
             )
 
         self.__version = version
+
+    @staticmethod
+    def __intern(value):
+        """
+        Return the interned version of the input string.
+
+        @private
+        """
+        # only native strings can be interned (unicode under python 2)
+        if type(value) is str:
+            return intern(value)
+
+        return value
@@ -1,3 +1,16 @@
-from .Versioned import Versioned, InvalidNameError, InvalidOptionError, InvalidVersionError
-from .Software import Software, InvalidAddonError
-from .Addon import Addon
+from ..LazyModule import LazyModule
+
+# submodules are imported on first access (@see LazyModule)
+LazyModule.install(__name__, [
+    ('Versioned', '.Versioned'),
+    ('InvalidNameError', '.Versioned'),
+    ('InvalidOptionError', '.Versioned'),
+    ('InvalidVersionError', '.Versioned'),
+    ('Software', '.Software'),
+    ('InvalidAddonError', '.Software'),
+    ('AddonRevision', '.Software'),
+    ('Addon', '.Addon'),
+    ('Version', '.Version'),
+    ('VersionConstraint', '.Version'),
+    ('InvalidVersionConstraintError', '.Version')
+])
@@ -1,3 +1,15 @@
-from . import Versioned
-from . import Loader
-from .Query import Query, SoftwareNotFoundError, AddonNotFoundError
+from .LazyModule import LazyModule
+
+# submodules are imported on first access (@see LazyModule)
+LazyModule.install(__name__, [
+    ('Versioned', '.Versioned'),
+    ('Loader', '.Loader'),
+    ('Daemon', '.Daemon'),
+    ('Query', '.Query'),
+    ('SoftwareNotFoundError', '.Query'),
+    ('AddonNotFoundError', '.Query'),
+    ('SqliteQuery', '.SqliteQuery'),
+    ('Instrumentation', '.Instrumentation'),
+    ('EnvFile', '.EnvFile'),
+    ('InvalidEnvFileFormatError', '.EnvFile')
+])
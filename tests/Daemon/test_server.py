@@ -0,0 +1,199 @@
+import json
+import os
+import shutil
+import socket
+import stat
+import tempfile
+import threading
+import unittest
+from uver.Loader import Loader, JsonLoader
+from uver.Daemon import Server, Client, Protocol, DaemonRequestError, SocketInUseError
+
+# compatibility with python 2/3
+try:
+    import socketserver
+except ImportError:
+    import SocketServer as socketserver
+
+class TestServer(unittest.TestCase):
+    """Test daemon server and client objects."""
+
+    def setUp(self):
+        """Create a directory holding the socket and the json files."""
+        self.__directory = tempfile.mkdtemp()
+        self.__socketPath = os.path.join(self.__directory, 'uverd.sock')
+
+    def tearDown(self):
+        """Remove the directory."""
+        shutil.rmtree(self.__directory)
+
+    def test_protocol(self):
+        """Should send and receive length prefixed messages."""
+        left, right = socket.socketpair()
+        try:
+            Protocol.send(left, {'op': 'status', 'env': {'a': u'é'}})
+            Protocol.send(left, [1, 2])
+            self.assertEqual(Protocol.receive(right), {'op': 'status', 'env': {'a': u'é'}})
+            self.assertEqual(Protocol.receive(right), [1, 2])
+
+            left.close()
+            self.assertEqual(Protocol.receive(right), None)
+        finally:
+            right.close()
+
+    def test_requests(self):
+        """Should answer the requests sent by the client."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '1.0', {'foo': 1})
+        loader.addSoftwareInfo('b', '2.0')
+        loader.addAddonInfo('b', 'a', {'bar': 2})
+
+        server = Server(self.__socketPath, loader)
+        server.start()
+        client = Client(self.__socketPath)
+        try:
+            self.assertEqual(
+                client.uverVersions({'UVER_A_VERSION': '1.5'}),
+                {'UVER_A_VERSION': '1.5', 'UVER_B_VERSION': '2.0'}
+            )
+            self.assertEqual(client.resolve(), [('a', '1.0'), ('b', '2.0')])
+
+            software = client.software('b', {'UVER_A_VERSION': '1.5'})
+            self.assertEqual(software['version'], '2.0')
+            self.assertEqual(software['addons']['a']['version'], '1.5')
+            self.assertEqual(software['addons']['a']['options']['bar'], 2)
+            self.assertEqual(client.software('a')['options'], {'foo': 1})
+            self.assertEqual(client.softwaresByAddonName('a'), ['b'])
+            self.assertEqual(client.status()['softwares'], 2)
+
+            # errors are raised by the client
+            self.assertRaises(DaemonRequestError, client.software, 'c')
+            self.assertRaises(DaemonRequestError, client.request, 'unknown')
+
+            # the server reads from the latest snapshot
+            loader.addSoftwareInfo('c', '3.0')
+            self.assertEqual(client.software('c')['version'], '3.0')
+
+            # a second server can not use the same socket
+            self.assertRaises(SocketInUseError, Server(self.__socketPath, loader).start)
+        finally:
+            client.close()
+            server.shutdown()
+
+        self.assertFalse(os.path.exists(self.__socketPath))
+
+    def test_reload(self):
+        """Should reload the watched directories."""
+        filePath = os.path.join(self.__directory, 'a.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        server = Server(self.__socketPath, JsonLoader())
+        server.watchJsonDirectory(self.__directory, interval=60.0)
+        server.start()
+        client = Client(self.__socketPath)
+        try:
+            self.assertEqual(client.uverVersions(), {'UVER_A_VERSION': '1.0'})
+
+            with open(filePath, 'w') as f:
+                json.dump({'a': '1.1'}, f)
+            os.utime(filePath, (0, 0))
+            changes = client.reload()
+            self.assertEqual(list(map(os.path.basename, changes['changed'])), ['a.json'])
+            self.assertEqual(client.uverVersions(), {'UVER_A_VERSION': '1.1'})
+
+            # the previous info is kept when a file is invalid
+            with open(filePath, 'w') as f:
+                f.write('{"a": ')
+            os.utime(filePath, (0, 1))
+            self.assertRaises(DaemonRequestError, client.reload)
+            self.assertEqual(client.uverVersions(), {'UVER_A_VERSION': '1.1'})
+            self.assertTrue(client.status()['reloadError'])
+        finally:
+            client.close()
+            server.shutdown()
+
+    def test_socketMode(self):
+        """Should only allow the user running the server to use the socket."""
+        umask = os.umask(0o022)
+        server = Server(self.__socketPath, Loader())
+        server.start()
+        try:
+            self.assertEqual(stat.S_IMODE(os.stat(self.__socketPath).st_mode), 0o600)
+
+            # making sure the umask used to create the socket has been restored
+            self.assertEqual(os.umask(umask), 0o022)
+        finally:
+            server.shutdown()
+
+    def test_clientDisconnect(self):
+        """Should not fail when the client disconnects before the response."""
+        disconnected = threading.Event()
+        finished = threading.Event()
+        errors = []
+
+        class SlowServer(Server):
+            def process(self, request):
+                disconnected.wait(5)
+                return super(SlowServer, self).process(request)
+
+        serverClass = socketserver.ThreadingUnixStreamServer
+        handleError = serverClass.handle_error
+        shutdownRequest = serverClass.shutdown_request
+
+        def recordError(self, *args):
+            errors.append(args)
+
+        def finishRequest(self, request):
+            shutdownRequest(self, request)
+            finished.set()
+
+        serverClass.handle_error = recordError
+        serverClass.shutdown_request = finishRequest
+        loader = Loader()
+        loader.addSoftwareInfo('a', '1.0')
+        server = SlowServer(self.__socketPath, loader)
+        server.start()
+        try:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.__socketPath)
+            Protocol.send(sock, {'op': 'status'})
+            sock.close()
+            disconnected.set()
+
+            self.assertTrue(finished.wait(5))
+            self.assertEqual(errors, [])
+
+            # the server keeps answering the other clients
+            client = Client(self.__socketPath)
+            try:
+                self.assertEqual(client.resolve(), [('a', '1.0')])
+            finally:
+                client.close()
+        finally:
+            serverClass.handle_error = handleError
+            serverClass.shutdown_request = shutdownRequest
+            server.shutdown()
+
+    def test_reconnect(self):
+        """Should reconnect when the server is restarted."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '1.0')
+
+        server = Server(self.__socketPath, loader)
+        server.start()
+        client = Client(self.__socketPath)
+        try:
+            self.assertEqual(client.resolve(), [('a', '1.0')])
+            server.shutdown()
+
+            server = Server(self.__socketPath, loader)
+            server.start()
+            self.assertEqual(client.resolve(), [('a', '1.0')])
+        finally:
+            client.close()
+            server.shutdown()
+
+
+if __name__ == '__main__':
+    unittest.main()
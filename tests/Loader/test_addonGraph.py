@@ -0,0 +1,65 @@
+from uver.Loader import Loader, AddonGraph, AddonNotFoundError
+from .CommonLoader import CommonLoader
+
+class TestAddonGraph(CommonLoader):
+    """Test addon graph object."""
+
+    def test_adjacency(self):
+        """Should return the direct and transitive relationships."""
+        graph = self.__createLoader().addonGraph()
+
+        self.assertIsInstance(graph, AddonGraph)
+        self.assertEqual(graph.addons('a'), ['b', 'c'])
+        self.assertEqual(graph.addons('d'), [])
+        self.assertEqual(graph.dependents('c'), ['a', 'b'])
+        self.assertEqual(graph.transitiveAddons('a'), ['b', 'c', 'd'])
+        self.assertEqual(graph.transitiveDependents('d'), ['a', 'b', 'c'])
+        self.assertEqual(graph.transitiveDependents('a'), [])
+        self.assertEqual(graph.missing(), [])
+        self.assertEqual(graph.cycles(), [])
+
+    def test_cycles(self):
+        """Should detect cycles between addons."""
+        loader = self.__createLoader()
+        loader.addAddonInfo('d', 'a')
+        loader.addSoftwareInfo('e', '1.0')
+        loader.addAddonInfo('e', 'e')
+        graph = loader.addonGraph()
+
+        self.assertEqual(graph.cycles(), [['a', 'b', 'c', 'd'], ['e']])
+        self.assertEqual(graph.transitiveAddons('a'), ['a', 'b', 'c', 'd'])
+
+    def test_missing(self):
+        """Should report all addons without a version."""
+        loader = self.__createLoader()
+        loader.addAddonInfo('a', 'x')
+        loader.addAddonInfo('y', 'z')
+
+        self.assertEqual(loader.addonGraph().missing(), [('a', 'x'), ('y', 'z')])
+
+        # reported before creating any software
+        self.assertRaises(AddonNotFoundError, loader.softwares)
+        self.assertRaises(AddonNotFoundError, loader.uverVersions)
+
+    def test_snapshot(self):
+        """Should build the graph once per snapshot."""
+        loader = self.__createLoader()
+        graph = loader.addonGraph()
+
+        self.assertIs(loader.addonGraph(), graph)
+        loader.removeAddonInfo('a', 'b')
+        self.assertEqual(loader.addonGraph().addons('a'), ['c'])
+        self.assertEqual(graph.addons('a'), ['b', 'c'])
+
+    def __createLoader(self):
+        """Return a loader with a chain of addons."""
+        loader = Loader()
+        for softwareName in ('a', 'b', 'c', 'd'):
+            loader.addSoftwareInfo(softwareName, '1.0')
+
+        loader.addAddonInfo('a', 'b')
+        loader.addAddonInfo('a', 'c')
+        loader.addAddonInfo('b', 'c')
+        loader.addAddonInfo('c', 'd')
+
+        return loader
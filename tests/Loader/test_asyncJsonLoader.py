@@ -0,0 +1,149 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from uver.Loader import JsonLoader, AsyncJsonLoader, InvalidDirectoryError
+
+class TestAsyncJsonLoader(unittest.TestCase):
+    """Test async json loader object."""
+
+    def setUp(self):
+        """Create a directory with json files and an event loop."""
+        self.__directory = tempfile.mkdtemp()
+        self.__loop = asyncio.new_event_loop()
+
+        for index in range(20):
+            self.__writeFile('config{0:02d}.json'.format(index), {
+                'a': '1.{0}'.format(index),
+                'b{0}'.format(index): {
+                    'version': '2.{0}'.format(index),
+                    'addons': {
+                        'a': {
+                            'options': {'foo': index}
+                        }
+                    }
+                }
+            })
+
+    def tearDown(self):
+        """Remove the directory and close the event loop."""
+        self.__loop.close()
+        shutil.rmtree(self.__directory)
+
+    def test_addFromJsonDirectory(self):
+        """Should produce the same state as the synchronous load."""
+        loader = JsonLoader(trackProvenance=True)
+        loader.addFromJsonDirectory(self.__directory)
+
+        asyncLoader = AsyncJsonLoader(JsonLoader(trackProvenance=True), concurrency=3)
+        self.__loop.run_until_complete(asyncLoader.addFromJsonDirectory(self.__directory))
+
+        self.assertEqual(asyncLoader.loader().infos(), loader.infos())
+        self.assertEqual(asyncLoader.loader().provenance().source('a'), loader.provenance().source('a'))
+        self.assertEqual(
+            self.__loop.run_until_complete(asyncLoader.uverVersions({'UVER_A_VERSION': '9.0'})),
+            loader.uverVersions({'UVER_A_VERSION': '9.0'})
+        )
+
+        # the directory is tracked for reloads
+        filePath = self.__writeFile('config99.json', {'a': '3.0'})
+        changes = self.__loop.run_until_complete(asyncLoader.reloadJsonDirectory(self.__directory))
+        self.assertEqual(changes['added'], [filePath])
+        self.assertEqual(asyncLoader.loader().uverVersions()['UVER_A_VERSION'], '3.0')
+
+        self.assertRaises(
+            InvalidDirectoryError,
+            self.__loop.run_until_complete,
+            asyncLoader.addFromJsonDirectory(os.path.join(self.__directory, 'missing'))
+        )
+
+    def test_changeOrder(self):
+        """Should apply the changes in the order they were requested."""
+        asyncLoader = AsyncJsonLoader()
+        fileNames = sorted(map(lambda x: os.path.join(self.__directory, x), os.listdir(self.__directory)))
+
+        async def addAll():
+            await asyncio.gather(
+                asyncLoader.addFromJsonDirectory(self.__directory),
+                *map(asyncLoader.addFromJsonFile, reversed(fileNames)),
+                asyncLoader.addFromJson('{"c": "1.0"}')
+            )
+
+        self.__loop.run_until_complete(addAll())
+
+        versions = asyncLoader.loader().uverVersions()
+        self.assertEqual(versions['UVER_A_VERSION'], '1.0')
+        self.assertEqual(versions['UVER_C_VERSION'], '1.0')
+
+    def test_softwares(self):
+        """Should create the softwares in the executor sharing concurrent calls."""
+        asyncLoader = AsyncJsonLoader()
+        self.__loop.run_until_complete(asyncLoader.addFromJsonDirectory(self.__directory))
+
+        async def resolve():
+            return await asyncio.gather(*map(
+                lambda x: asyncLoader.softwares({'UVER_A_VERSION': '5.0'}),
+                range(10)
+            ))
+
+        results = self.__loop.run_until_complete(resolve())
+        expected = asyncLoader.loader().softwares({'UVER_A_VERSION': '5.0'})
+        for result in results:
+            self.assertEqual(list(map(lambda x: (x.name(), x.version()), result)), list(map(lambda x: (x.name(), x.version()), expected)))
+
+        # each caller gets its own list
+        self.assertIsNot(results[0], results[1])
+
+        lazySoftwares = self.__loop.run_until_complete(asyncLoader.softwares(lazy=True))
+        self.assertEqual(len(lazySoftwares), len(expected))
+
+    def test_readWhileChanging(self):
+        """Should not block the event loop while a change is being applied."""
+        entered = threading.Event()
+        release = threading.Event()
+
+        class SlowJsonLoader(JsonLoader):
+            def addInfos(self, infos):
+                super(SlowJsonLoader, self).addInfos(infos)
+                if not entered.is_set():
+                    entered.set()
+                    release.wait(5)
+
+        asyncLoader = AsyncJsonLoader(SlowJsonLoader())
+        asyncLoader.loader().addSoftwareInfo('c', '1.0')
+
+        async def readWhileChanging():
+            change = asyncio.ensure_future(asyncLoader.addFromJsonDirectory(self.__directory))
+            while not entered.is_set():
+                await asyncio.sleep(0.01)
+
+            try:
+                versions = await asyncLoader.uverVersions()
+                softwares = await asyncLoader.softwares()
+            finally:
+                release.set()
+
+            await change
+            return versions, softwares
+
+        versions, softwares = self.__loop.run_until_complete(readWhileChanging())
+        self.assertEqual(versions, {'UVER_C_VERSION': '1.0'})
+        self.assertEqual(list(map(lambda x: x.name(), softwares)), ['c'])
+        self.assertEqual(asyncLoader.loader().uverVersions()['UVER_A_VERSION'], '1.19')
+
+    def __writeFile(self, name, contents):
+        """
+        Write a json file to the directory returning its path.
+        """
+        filePath = os.path.join(self.__directory, name)
+        with open(filePath, 'w') as f:
+            json.dump(contents, f)
+
+        return filePath
+
+
+if __name__ == '__main__':
+    unittest.main()
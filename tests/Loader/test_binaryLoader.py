@@ -0,0 +1,171 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+from uver.Loader import \
+    Loader, \
+    BinaryLoader, \
+    BinaryFormat, \
+    InvalidBinaryFormatError, \
+    InvalidFileError
+from uver import Query
+from .CommonLoader import CommonLoader
+
+class TestBinaryLoader(CommonLoader):
+    """Test binary loader object."""
+
+    __softwareInfos = {
+        'a': {
+            'version': '10.1',
+            'addons': {
+                'b': {
+                    'options': {
+                        'enabled': False,
+                        'list': [1, 2]
+                    }
+                },
+                'c': {}
+            },
+            'options': {
+                'foo': u'café'
+            }
+        },
+        'b': {
+            'version': '12.1',
+            'options': {}
+        },
+        'c': {
+            'version': '11.1',
+            'addons': {
+                'b': {}
+            },
+            'options': {}
+        }
+    }
+
+    def setUp(self):
+        """Create a temporary directory for the binary files."""
+        self.__directory = tempfile.mkdtemp()
+        self.__fileName = os.path.join(self.__directory, 'config.uverbin')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.__directory)
+
+    def test_binaryFile(self):
+        """Should load the same info written by a loader."""
+        loader = self.__createLoader()
+        loader.addAddonInfo('x', 'b')
+        loader.writeBinary(self.__fileName)
+
+        binaryLoader = BinaryLoader()
+        binaryLoader.loadFromBinaryFile(self.__fileName)
+
+        self.assertEqual(binaryLoader.infos(), loader.infos())
+        self.assertEqual(binaryLoader.uverVersions(), loader.uverVersions())
+
+        self.checkSoftwareInfo(self.__softwareInfos, binaryLoader.softwares())
+
+        softwares = binaryLoader.softwares({'UVER_B_VERSION': '13'})
+        self.assertEqual(
+            dict(map(lambda x: (x.name(), x.version()), softwares)),
+            {'a': '10.1', 'b': '13', 'c': '11.1'}
+        )
+        self.assertEqual(softwares[0].addon('b').option('list'), [1, 2])
+
+    def test_lazyQuery(self):
+        """Should query the binary file without creating all softwares."""
+        self.__createLoader().writeBinary(self.__fileName)
+        binaryLoader = BinaryLoader()
+        binaryLoader.loadFromBinaryFile(self.__fileName)
+
+        softwares = binaryLoader.softwares(lazy=True)
+        query = Query(softwares)
+
+        self.assertEqual(query.softwareNames(), ['a', 'b', 'c'])
+        self.assertEqual(sorted(query.addonNames()), ['b', 'c'])
+        self.assertEqual(query.softwareByName('c').addon('b').version(), '12.1')
+        self.assertEqual(list(map(softwares.isCreated, range(len(softwares)))), [False, False, True])
+
+    def test_changes(self):
+        """Should copy the info when the loader gets changed."""
+        self.__createLoader().writeBinary(self.__fileName)
+        binaryLoader = BinaryLoader()
+        binaryLoader.loadFromBinaryFile(self.__fileName)
+
+        binaryLoader.addSoftwareInfo('d', '1.0')
+        binaryLoader.removeAddonInfo('a', 'c')
+
+        self.assertEqual(
+            binaryLoader.uverVersions(),
+            {
+                'UVER_A_VERSION': '10.1',
+                'UVER_B_VERSION': '12.1',
+                'UVER_C_VERSION': '11.1',
+                'UVER_D_VERSION': '1.0'
+            }
+        )
+        self.assertEqual(sorted(binaryLoader.infos()['addons']['a'].keys()), ['b'])
+
+    def test_close(self):
+        """Should close the memory-mapped file."""
+        self.__createLoader().writeBinary(self.__fileName)
+
+        with BinaryLoader() as binaryLoader:
+            binaryLoader.loadFromBinaryFile(self.__fileName)
+            binaryLoader.loadFromBinaryFile(self.__fileName)
+            mappings = list(binaryLoader._BinaryLoader__mappings)
+            self.assertEqual(binaryLoader.infos()['softwares']['b']['version'], '12.1')
+
+        self.assertEqual(len(mappings), 2)
+        self.assertTrue(all(map(lambda x: x.closed, mappings)))
+        self.assertEqual(binaryLoader.infos(), {'softwares': {}, 'addons': {}})
+        self.assertEqual(binaryLoader.softwares(), [])
+
+        # closing again does nothing
+        binaryLoader.close()
+
+    def test_binaryFormat(self):
+        """Should look up entries from the binary data."""
+        binaryFormat = BinaryFormat(BinaryFormat.contents(self.__createLoader().infos()))
+
+        softwareInfos = binaryFormat.softwareInfos()
+        self.assertEqual(len(softwareInfos), 3)
+        self.assertIn('b', softwareInfos)
+        self.assertNotIn('d', softwareInfos)
+        self.assertEqual(softwareInfos['a']['options'], {'foo': u'café'})
+        self.assertEqual(softwareInfos['b'], {'version': '12.1', 'options': {}})
+        self.assertRaises(KeyError, lambda: softwareInfos['a']['addons'])
+        self.assertRaises(KeyError, lambda: softwareInfos['d'])
+
+        addonInfos = binaryFormat.addonInfos()
+        self.assertEqual(sorted(addonInfos.keys()), ['a', 'c'])
+        self.assertRaises(KeyError, lambda: addonInfos['b'])
+        self.assertEqual(addonInfos['a']['c'], {'options': {}})
+
+    def test_invalidFile(self):
+        """Should fail when the file is not a valid binary file."""
+        self.assertRaises(InvalidFileError, BinaryLoader().loadFromBinaryFile, self.__fileName)
+
+        open(self.__fileName, 'wb').close()
+        self.assertRaises(InvalidBinaryFormatError, BinaryLoader().loadFromBinaryFile, self.__fileName)
+
+        with open(self.__fileName, 'wb') as f:
+            f.write(b'{"a": "1.0.0", "b": "2.0.0"}')
+
+        self.assertRaises(InvalidBinaryFormatError, BinaryLoader().loadFromBinaryFile, self.__fileName)
+
+    def __createLoader(self):
+        """Return a loader with the software infos."""
+        loader = Loader()
+        for softwareName, softwareData in self.__softwareInfos.items():
+            loader.addSoftwareInfo(
+                softwareName,
+                softwareData['version'],
+                softwareData['options']
+            )
+
+            for addonName, addonData in softwareData.get('addons', {}).items():
+                loader.addAddonInfo(softwareName, addonName, addonData.get('options', {}))
+
+        return loader
@@ -0,0 +1,172 @@
+import json
+import marshal
+import os
+import shutil
+import tempfile
+import threading
+from uver.Loader import JsonLoader, JsonCache
+from .CommonLoader import CommonLoader
+
+class TestJsonCache(CommonLoader):
+    """Test json cache object."""
+
+    __rootPath = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    __jsonDirectory = os.path.join(__rootPath, 'data', 'json')
+
+    def setUp(self):
+        """Create a temporary cache directory."""
+        self.__tempDirectory = tempfile.mkdtemp()
+        self.__cacheDirectory = os.path.join(self.__tempDirectory, 'cache')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.__tempDirectory)
+
+    def test_constructor(self):
+        """Should create the cache directory."""
+        cache = JsonCache(self.__cacheDirectory)
+
+        self.assertTrue(os.path.isdir(self.__cacheDirectory))
+        self.assertEqual(cache.directory(), self.__cacheDirectory)
+
+    def test_cachedDirectory(self):
+        """Should load the same softwares from the cache."""
+        softwareInfos = {}
+        for fileName in ('simple.json', 'complex.json', 'externalAddons.json'):
+            with open(os.path.join(self.__jsonDirectory, fileName), 'r') as f:
+                softwareInfos.update(json.load(f))
+
+        for workers in (None, 4):
+            loader = JsonLoader(self.__cacheDirectory)
+            loader.addFromJsonDirectory(self.__jsonDirectory, workers=workers)
+
+            softwares = loader.softwares()
+            self.checkSoftwareInfo(softwareInfos, softwares)
+            self.checkAddonsInfo(softwareInfos, softwares)
+
+        # second round was loaded from the cache
+        loader = JsonLoader(self.__cacheDirectory)
+        loader.addFromJsonDirectory(self.__jsonDirectory)
+        self.assertEqual(loader.cache().stats(), {'hits': 3, 'misses': 0})
+
+    def test_changedFile(self):
+        """Should parse the file again when the contents change."""
+        filePath = os.path.join(self.__tempDirectory, 'config.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        loader = JsonLoader(self.__cacheDirectory)
+        loader.addFromJsonFile(filePath)
+
+        # same size, different contents and modification time
+        with open(filePath, 'w') as f:
+            json.dump({'a': '2.0'}, f)
+        os.utime(filePath, (0, 0))
+
+        loader = JsonLoader(self.__cacheDirectory)
+        loader.addFromJsonFile(filePath)
+
+        self.assertEqual(loader.softwares()[0].version(), '2.0')
+        self.assertEqual(loader.cache().stats(), {'hits': 0, 'misses': 1})
+
+    def test_touchedFile(self):
+        """Should use the cache when only the modification time changes."""
+        filePath = os.path.join(self.__tempDirectory, 'config.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        JsonLoader(self.__cacheDirectory).addFromJsonFile(filePath)
+        os.utime(filePath, (0, 0))
+
+        loader = JsonLoader(self.__cacheDirectory)
+        loader.addFromJsonFile(filePath)
+
+        self.assertEqual(loader.softwares()[0].version(), '1.0')
+        self.assertEqual(loader.cache().stats(), {'hits': 1, 'misses': 0})
+
+    def test_invalidEntry(self):
+        """Should ignore corrupted cache entries."""
+        filePath = os.path.join(self.__tempDirectory, 'config.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        JsonLoader(self.__cacheDirectory).addFromJsonFile(filePath)
+        for entryName in os.listdir(self.__cacheDirectory):
+            with open(os.path.join(self.__cacheDirectory, entryName), 'wb') as f:
+                f.write(b'invalid')
+
+        loader = JsonLoader(self.__cacheDirectory)
+        loader.addFromJsonFile(filePath)
+
+        self.assertEqual(loader.softwares()[0].version(), '1.0')
+        self.assertEqual(loader.cache().stats(), {'hits': 0, 'misses': 1})
+
+    def test_cacheFailure(self):
+        """Should parse the file when the cache entries can't be read or written."""
+        filePath = os.path.join(self.__tempDirectory, 'config.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        # the entry path is taken by a directory
+        cache = JsonCache(self.__cacheDirectory)
+        JsonLoader(self.__cacheDirectory).addFromJsonFile(filePath)
+        entryName = os.listdir(self.__cacheDirectory)[0]
+        os.remove(os.path.join(self.__cacheDirectory, entryName))
+        os.makedirs(os.path.join(self.__cacheDirectory, entryName, 'x'))
+
+        infos = cache.infos(filePath, lambda x: {'softwares': json.loads(x), 'addons': {}})
+        self.assertEqual(infos['softwares'], {'a': '1.0'})
+
+        # the temporary entry is removed
+        self.assertEqual(os.listdir(self.__cacheDirectory), [entryName])
+
+        # the cache directory is not a directory anymore
+        shutil.rmtree(self.__cacheDirectory)
+        with open(self.__cacheDirectory, 'w') as f:
+            f.write('')
+
+        loader = JsonLoader(self.__cacheDirectory)
+        loader.addFromJsonFile(filePath)
+        self.assertEqual(loader.softwares()[0].version(), '1.0')
+        self.assertEqual(loader.cache().stats(), {'hits': 0, 'misses': 1})
+
+    def test_invalidEntryLayout(self):
+        """Should parse the file when an entry does not have the expected layout."""
+        filePath = os.path.join(self.__tempDirectory, 'config.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        JsonLoader(self.__cacheDirectory).addFromJsonFile(filePath)
+        entryPath = os.path.join(self.__cacheDirectory, os.listdir(self.__cacheDirectory)[0])
+        with open(entryPath, 'rb') as f:
+            header, entry = marshal.load(f)
+
+        for invalidEntry in (entry[:2], list(entry), entry[:4] + (None,), 10):
+            with open(entryPath, 'wb') as f:
+                marshal.dump((header, invalidEntry), f)
+
+            loader = JsonLoader(self.__cacheDirectory)
+            loader.addFromJsonFile(filePath)
+            self.assertEqual(loader.softwares()[0].version(), '1.0')
+            self.assertEqual(loader.cache().stats(), {'hits': 0, 'misses': 1})
+
+    def test_threadStats(self):
+        """Should count the hits of multiple threads."""
+        filePath = os.path.join(self.__tempDirectory, 'config.json')
+        with open(filePath, 'w') as f:
+            json.dump({'a': '1.0'}, f)
+
+        cache = JsonCache(self.__cacheDirectory)
+        cache.infos(filePath, lambda x: {'softwares': json.loads(x), 'addons': {}})
+
+        def load():
+            for index in range(200):
+                cache.infos(filePath, lambda x: {'softwares': json.loads(x), 'addons': {}})
+
+        threads = list(map(lambda x: threading.Thread(target=load), range(4)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(cache.stats(), {'hits': 800, 'misses': 1})
@@ -1,5 +1,9 @@
+import io
 import json
 import os
+import shutil
+import tempfile
+import threading
 from uver.Loader import \
     JsonLoader, \
     UnexpectedRootContentError, \
@@ -59,6 +63,44 @@ class TestJsonLoader(CommonLoader):
         self.checkSoftwareInfo(softwareInfos, softwares)
         self.checkAddonsInfo(softwareInfos, softwares)
 
+    def test_addingJsonStream(self):
+        """Should test adding a stream of json to the loader."""
+        softwareInfos = {
+            'a': {
+                'version': '10.1',
+                'options': {
+                    'a': [1, {'b': '}'}]
+                }
+            },
+            'b': {
+                'version': '12.1',
+                'addons': {
+                    'a': {
+                        'options': {
+                            'enabled': False
+                        }
+                    }
+                }
+            },
+            'c': '10.0.1'
+        }
+        jsonString = json.dumps(softwareInfos, indent=4)
+
+        # file object
+        loader = JsonLoader()
+        loader.addFromJsonStream(io.StringIO(jsonString), chunkSize=16)
+        softwares = loader.softwares()
+        self.checkSoftwareInfo(softwareInfos, softwares)
+        self.checkAddonsInfo(softwareInfos, softwares)
+
+        # chunks
+        streamLoader = JsonLoader()
+        streamLoader.addFromJsonStream(jsonString[i:i + 5] for i in range(0, len(jsonString), 5))
+        self.assertEqual(streamLoader.infos(), loader.infos())
+
+        # unexpected root
+        self.assertRaises(UnexpectedRootContentError, JsonLoader().addFromJsonStream, ['["a"]'])
+
     def test_unexpectedRootContent(self):
         """
         Should fail when json does not have the proper format for the root.
@@ -169,6 +211,168 @@ class TestJsonLoader(CommonLoader):
         self.checkSoftwareInfo(softwareInfos, softwares)
         self.checkAddonsInfo(softwareInfos, softwares)
 
+    def test_addingJsonDirectoryWorkers(self):
+        """Should load a directory using a pool of threads."""
+        serialLoader = JsonLoader()
+        serialLoader.addFromJsonDirectory(self.__jsonDirectory)
+
+        loader = JsonLoader()
+        loader.addFromJsonDirectory(self.__jsonDirectory, workers=4)
+
+        serialSoftwares = serialLoader.softwares()
+        softwares = loader.softwares()
+        self.assertListEqual(
+            list(map(lambda x: (x.name(), x.version(), sorted(x.addonNames())), softwares)),
+            list(map(lambda x: (x.name(), x.version(), sorted(x.addonNames())), serialSoftwares))
+        )
+
+    def test_directoryOrder(self):
+        """Should merge the files in alphabetical order."""
+        directory = tempfile.mkdtemp()
+        try:
+            for index in range(20):
+                filePath = os.path.join(directory, 'file{0:02d}.json'.format(index))
+                with open(filePath, 'w') as f:
+                    json.dump({'a': '1.{0}'.format(index)}, f)
+
+            for workers in (None, 4):
+                loader = JsonLoader(trackProvenance=True)
+                loader.addFromJsonDirectory(directory, workers=workers)
+                self.assertEqual(loader.softwares()[0].version(), '1.19')
+                self.assertEqual(
+                    list(map(lambda x: os.path.basename(x[0]), loader.provenance().history('a')[:2])),
+                    ['file19.json', 'file18.json']
+                )
+        finally:
+            shutil.rmtree(directory)
+
+    def test_reloadJsonDirectory(self):
+        """Should reload only the files that were modified."""
+        directory = tempfile.mkdtemp()
+        try:
+            def writeFile(name, contents):
+                filePath = os.path.join(directory, name)
+                with open(filePath, 'w') as f:
+                    json.dump(contents, f)
+                os.utime(filePath, (0, len(contents)))
+
+            writeFile('a.json', {'a': '1.0', 'b': '1.0'})
+            writeFile('b.json', {'b': '2.0', 'c': {'version': '1.0', 'addons': {'a': {}}}})
+
+            loader = JsonLoader(trackProvenance=True)
+            changes = loader.reloadJsonDirectory(directory)
+            self.assertEqual(len(changes['added']), 2)
+            self.assertEqual(
+                loader.uverVersions(),
+                {'UVER_A_VERSION': '1.0', 'UVER_B_VERSION': '2.0', 'UVER_C_VERSION': '1.0'}
+            )
+
+            # nothing has changed
+            self.assertEqual(
+                loader.reloadJsonDirectory(directory),
+                {'added': [], 'changed': [], 'removed': []}
+            )
+
+            # "b" falls back to the definition from a.json
+            writeFile('b.json', {'c': {'version': '1.1'}})
+            writeFile('c.json', {'d': '3.0'})
+            changes = loader.reloadJsonDirectory(directory)
+            self.assertEqual(list(map(os.path.basename, changes['added'])), ['c.json'])
+            self.assertEqual(list(map(os.path.basename, changes['changed'])), ['b.json'])
+            self.assertEqual(
+                loader.uverVersions(),
+                {
+                    'UVER_A_VERSION': '1.0',
+                    'UVER_B_VERSION': '1.0',
+                    'UVER_C_VERSION': '1.1',
+                    'UVER_D_VERSION': '3.0'
+                }
+            )
+            self.assertEqual(list(loader.infos()['addons'].keys()), [])
+
+            # sources of the entries
+            provenance = loader.provenance()
+            self.assertEqual(provenance.source('b'), (os.path.join(directory, 'a.json'), 1))
+            self.assertEqual(provenance.source('c'), (os.path.join(directory, 'b.json'), 0))
+            self.assertEqual(provenance.source('c', 'a'), None)
+            self.assertEqual(provenance.source('d'), (os.path.join(directory, 'c.json'), 0))
+
+            os.remove(os.path.join(directory, 'a.json'))
+            changes = loader.reloadJsonDirectory(directory)
+            self.assertEqual(list(map(os.path.basename, changes['removed'])), ['a.json'])
+            self.assertEqual(
+                loader.uverVersions(),
+                {'UVER_C_VERSION': '1.1', 'UVER_D_VERSION': '3.0'}
+            )
+        finally:
+            shutil.rmtree(directory)
+
+    def test_reloadProvenance(self):
+        """Should keep the provenance bounded across reloads."""
+        directory = tempfile.mkdtemp()
+        try:
+            filePath = os.path.join(directory, 'a.json')
+            loader = JsonLoader(trackProvenance=True)
+            for index in range(50):
+                with open(filePath, 'w') as f:
+                    json.dump({'a': '1.{0}'.format(index), 'b': {'version': '1.0', 'addons': {'a': {}}}}, f)
+                os.utime(filePath, (0, index))
+
+                loader.reloadJsonDirectory(directory)
+                self.assertLessEqual(len(loader.provenance()), 6)
+
+            self.assertEqual(loader.provenance().history('a'), [(filePath, 0)])
+            self.assertIsNotNone(JsonLoader().provenance())
+            self.assertIsNone(JsonLoader(trackProvenance=False).provenance())
+        finally:
+            shutil.rmtree(directory)
+
+    def test_reloadInvalidFile(self):
+        """Should keep the loader untouched when a modified file is invalid."""
+        directory = tempfile.mkdtemp()
+        try:
+            filePath = os.path.join(directory, 'a.json')
+            with open(filePath, 'w') as f:
+                json.dump({'a': '1.0'}, f)
+
+            loader = JsonLoader()
+            loader.addFromJsonDirectory(directory)
+
+            with open(filePath, 'w') as f:
+                f.write('{"a": ')
+
+            self.assertRaises(ValueError, loader.reloadJsonDirectory, directory)
+            self.assertEqual(loader.uverVersions(), {'UVER_A_VERSION': '1.0'})
+        finally:
+            shutil.rmtree(directory)
+
+    def test_watchJsonDirectory(self):
+        """Should poll the directory until the stop event is set."""
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, 'a.json'), 'w') as f:
+                json.dump({'a': '1.0'}, f)
+
+            loader = JsonLoader()
+            stopEvent = threading.Event()
+            reported = []
+
+            def callback(changes):
+                reported.append(changes)
+                stopEvent.set()
+
+            loader.watchJsonDirectory(
+                directory,
+                interval=0.01,
+                callback=callback,
+                stopEvent=stopEvent
+            )
+
+            self.assertEqual(len(reported), 1)
+            self.assertEqual(loader.uverVersions(), {'UVER_A_VERSION': '1.0'})
+        finally:
+            shutil.rmtree(directory)
+
     def test_addingJsonFile(self):
         """Should test adding json files to the loader."""
         loader = JsonLoader()
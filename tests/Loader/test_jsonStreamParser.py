@@ -0,0 +1,90 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import unittest
+from uver.Loader import JsonStreamParser, InvalidJsonStreamError
+
+class TestJsonStreamParser(unittest.TestCase):
+    """Test json stream parser object."""
+
+    __contents = {
+        'a': '1.0',
+        'b "quoted" \\ {name}': {
+            'version': '2.0',
+            'options': {
+                'list': [1, 2.5, None, True, {'x': ']}'}],
+                'text': u'café ,:'
+            }
+        },
+        'c': 10,
+        'd': []
+    }
+
+    def test_entries(self):
+        """Should return the same entries as the json module."""
+        jsonString = json.dumps(self.__contents, indent=4, ensure_ascii=False)
+
+        for chunkSize in (1, 3, 7, len(jsonString)):
+            chunks = [jsonString[i:i + chunkSize] for i in range(0, len(jsonString), chunkSize)]
+            self.assertEqual(dict(JsonStreamParser.entries(chunks)), self.__contents)
+
+    def test_byteEntries(self):
+        """Should decode utf-8 chunks split in the middle of a character."""
+        jsonBytes = json.dumps(self.__contents, ensure_ascii=False).encode('utf-8')
+        chunks = [jsonBytes[i:i + 1] for i in range(len(jsonBytes))]
+
+        self.assertEqual(dict(JsonStreamParser.entries(chunks)), self.__contents)
+        self.assertEqual(
+            dict(JsonStreamParser.entries(io.BytesIO(jsonBytes), chunkSize=5)),
+            self.__contents
+        )
+
+    def test_incremental(self):
+        """Should return each entry as soon as it's complete."""
+        parser = JsonStreamParser()
+
+        self.assertEqual(parser.feed('{"a": "1.0", "b": {"vers'), [('a', '1.0')])
+        self.assertEqual(parser.feed('ion": "2.0"}'), [])
+        self.assertEqual(parser.feed(' , "c": 3}  '), [('b', {'version': '2.0'}), ('c', 3)])
+        parser.close()
+
+    def test_largeValue(self):
+        """Should parse a value spanning many chunks (escapes split between chunks)."""
+        contents = {'a': {'text': 'x\\"y' * 10000}, 'b': '1.0'}
+        jsonString = json.dumps(contents)
+
+        parser = JsonStreamParser()
+        result = []
+        for index in range(0, len(jsonString), 7):
+            result.extend(parser.feed(jsonString[index:index + 7]))
+        parser.close()
+
+        self.assertEqual(dict(result), contents)
+
+    def test_emptyObject(self):
+        """Should parse an empty root object."""
+        self.assertEqual(list(JsonStreamParser.entries([' { } '])), [])
+
+    def test_invalidStream(self):
+        """Should fail when the stream is not a valid json object."""
+        invalidStreams = [
+            '',
+            '[1, 2]',
+            '{"a": 1',
+            '{"a" 1}',
+            '{"a": }',
+            '{"a": 1,}',
+            '{"a": tru}',
+            '{"a": 1} 2',
+            '{a: 1}'
+        ]
+
+        for invalidStream in invalidStreams:
+            self.assertRaises(
+                InvalidJsonStreamError,
+                lambda: list(JsonStreamParser.entries([invalidStream]))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
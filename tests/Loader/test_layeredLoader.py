@@ -0,0 +1,123 @@
+from uver.Loader import Loader, LayeredLoader
+from .CommonLoader import CommonLoader
+
+class TestLayeredLoader(CommonLoader):
+    """Test layered loader object."""
+
+    __siteInfos = {
+        'softwares': {
+            'a': {'version': '1.0', 'options': {'render': {'threads': 8, 'gpu': False}, 'foo': 1}},
+            'b': {'version': '2.0', 'options': {'bar': [1]}}
+        },
+        'addons': {
+            'a': {'b': {'options': {'enabled': True, 'paths': {'x': '/x'}}}}
+        }
+    }
+
+    __showInfos = {
+        'softwares': {
+            'a': {'version': '1.5', 'options': {'render': {'gpu': True}}}
+        },
+        'addons': {
+            'a': {'b': {'options': {'paths': {'y': '/y'}}}}
+        }
+    }
+
+    def test_merge(self):
+        """Should merge the layers deeply following their priorities."""
+        loader = LayeredLoader()
+        loader.setLayer('show', self.__showInfos, 10)
+        loader.setLayer('site', self.__siteInfos, 0)
+
+        self.assertEqual(loader.layerNames(), ['site', 'show'])
+        self.assertEqual(loader.layerPriority('show'), 10)
+        self.assertIs(loader.layerInfos('site'), self.__siteInfos)
+
+        infos = loader.infos()
+        self.assertEqual(infos['softwares']['a'], {
+            'version': '1.5',
+            'options': {'render': {'threads': 8, 'gpu': True}, 'foo': 1}
+        })
+        self.assertEqual(
+            infos['addons']['a']['b']['options'],
+            {'enabled': True, 'paths': {'x': '/x', 'y': '/y'}}
+        )
+
+        # unchanged entries are shared with the layers
+        self.assertIs(infos['softwares']['b'], self.__siteInfos['softwares']['b'])
+        self.assertEqual(
+            dict(map(lambda x: (x.name(), x.version()), loader.softwares())),
+            {'a': '1.5', 'b': '2.0'}
+        )
+
+        # inputs are not modified
+        self.assertEqual(self.__siteInfos['softwares']['a']['options']['render'], {'threads': 8, 'gpu': False})
+
+    def test_replaceLayer(self):
+        """Should merge only the replaced layer on top of the cached ones."""
+        loader = LayeredLoader()
+        loader.setLayer('site', self.__siteInfos, 0)
+        loader.setLayer('show', self.__showInfos, 10)
+
+        shotLoader = Loader()
+        shotLoader.addSoftwareInfo('b', '3.0')
+        loader.setLayer('shot', shotLoader, 20)
+        mergedA = loader.infos()['softwares']['a']
+        self.assertEqual(loader.uverVersions()['UVER_B_VERSION'], '3.0')
+
+        otherShotLoader = Loader()
+        otherShotLoader.addSoftwareInfo('c', '1.0')
+        loader.setLayer('shot', otherShotLoader, 20)
+        self.assertIs(loader.infos()['softwares']['a'], mergedA)
+        self.assertEqual(
+            loader.uverVersions(),
+            {'UVER_A_VERSION': '1.5', 'UVER_B_VERSION': '2.0', 'UVER_C_VERSION': '1.0'}
+        )
+
+        loader.removeLayer('show')
+        loader.removeLayer('missing')
+        self.assertEqual(loader.layerNames(), ['site', 'shot'])
+        self.assertEqual(loader.uverVersions()['UVER_A_VERSION'], '1.0')
+
+        loader.removeLayer('site')
+        loader.removeLayer('shot')
+        self.assertEqual(loader.infos(), {'softwares': {}, 'addons': {}})
+        self.assertRaises(KeyError, loader.layerInfos, 'site')
+
+    def test_reuseSoftwares(self):
+        """Should only create the softwares affected by a replaced layer."""
+        loader = LayeredLoader()
+        loader.setLayer('site', self.__siteInfos, 0)
+
+        shotLoader = Loader()
+        shotLoader.addSoftwareInfo('c', '1.0')
+        loader.setLayer('shot', shotLoader, 20)
+        before = dict(map(lambda x: (x.name(), x), loader.softwares()))
+
+        otherShotLoader = Loader()
+        otherShotLoader.addSoftwareInfo('d', '1.0')
+        loader.setLayer('shot', otherShotLoader, 20)
+        after = dict(map(lambda x: (x.name(), x), loader.softwares()))
+
+        self.assertIs(after['a'], before['a'])
+        self.assertIs(after['b'], before['b'])
+        self.assertEqual(sorted(after.keys()), ['a', 'b', 'd'])
+
+        # "a" uses "b" as addon
+        otherShotLoader.addSoftwareInfo('b', '3.0')
+        loader.setLayer('shot', otherShotLoader, 20)
+        softwares = dict(map(lambda x: (x.name(), x), loader.softwares()))
+        self.assertIsNot(softwares['a'], after['a'])
+        self.assertEqual(softwares['a'].addon('b').version(), '3.0')
+
+    def test_mergeOptions(self):
+        """Should only create the dicts along the merged values."""
+        nested = {'c': 1}
+        baseOptions = {'a': {'b': 1}, 'n': nested}
+        options = {'a': {'d': 2}, 'e': {'f': 3}}
+
+        merged = LayeredLoader.mergeOptions(baseOptions, options)
+        self.assertEqual(merged, {'a': {'b': 1, 'd': 2}, 'n': {'c': 1}, 'e': {'f': 3}})
+        self.assertIs(merged['n'], nested)
+        self.assertIs(merged['e'], options['e'])
+        self.assertIs(LayeredLoader.mergeOptions(baseOptions, {}), baseOptions)
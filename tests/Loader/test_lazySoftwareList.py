@@ -0,0 +1,115 @@
+from uver.Loader import Loader, LazySoftware, LazySoftwareList, AddonNotFoundError
+from uver.Versioned import Software, Addon
+from uver import Query
+from .CommonLoader import CommonLoader
+
+class TestLazySoftwareList(CommonLoader):
+    """Test lazy software list object."""
+
+    __softwareInfos = {
+        'a': {
+            'version': '10.1',
+            'addons': {
+                'b': {
+                    'options': {
+                        'enabled': False
+                    }
+                }
+            },
+            'options': {
+                'foo': 1
+            }
+        },
+        'b': {
+            'version': '12.1',
+            'options': {}
+        },
+        'c': {
+            'version': '11.1',
+            'addons': {
+                'b': {}
+            },
+            'options': {}
+        }
+    }
+
+    def test_lazySoftwares(self):
+        """Should create the same softwares as the eager mode."""
+        loader = self.__createLoader()
+        softwares = loader.softwares(lazy=True)
+
+        self.assertIsInstance(softwares, LazySoftwareList)
+        self.assertEqual(len(softwares), 3)
+        self.assertEqual(softwares.names(), ['a', 'b', 'c'])
+        self.assertFalse(any(map(softwares.isCreated, range(len(softwares)))))
+
+        self.checkSoftwareInfo(self.__softwareInfos, list(softwares))
+        self.checkAddonsInfo(self.__softwareInfos, list(softwares))
+
+    def test_createdOnce(self):
+        """Should create each software only when accessed (once)."""
+        softwares = self.__createLoader().softwares({'UVER_B_VERSION': '13'}, lazy=True)
+
+        software = softwares[1]
+        self.assertTrue(softwares.isCreated(1))
+        self.assertFalse(softwares.isCreated(0))
+        self.assertIs(softwares[1], software)
+        self.assertEqual(software.version(), '13')
+        self.assertEqual(softwares[0].addon('b').version(), '13')
+        self.assertEqual(list(map(lambda x: x.name(), softwares[0:2])), ['a', 'b'])
+
+    def test_lazyAddons(self):
+        """Should only create the addons when they are accessed."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addAddonInfo('a', 'missing')
+
+        software = loader.softwares(lazy=True)[0]
+        self.assertIsInstance(software, LazySoftware)
+        self.assertEqual(software.version(), '10.1')
+        self.assertRaises(AddonNotFoundError, software.addonNames)
+
+    def test_query(self):
+        """Should only create the softwares returned by the query."""
+        softwares = self.__createLoader().softwares(lazy=True)
+        query = Query(softwares)
+
+        self.assertEqual(sorted(query.addonNames()), ['b'])
+        self.assertEqual(query.softwareNames(), ['a', 'b', 'c'])
+        self.assertEqual(query.softwareUverNames(), ['UVER_A_VERSION', 'UVER_B_VERSION', 'UVER_C_VERSION'])
+        self.assertFalse(any(map(softwares.isCreated, range(len(softwares)))))
+
+        self.assertEqual(query.softwareByName('b').version(), '12.1')
+        self.assertEqual(
+            list(map(lambda x: x.name(), query.softwaresByAddonName('b'))),
+            ['a', 'c']
+        )
+        self.assertEqual(list(map(softwares.isCreated, range(len(softwares)))), [True, True, True])
+
+        # loading the addons of a lazy software is not a change
+        misses = query.cacheStats()['misses']
+        software = query.softwareByName('c')
+        self.assertEqual(list(software.addonNames()), ['b'])
+        query.addonNames()
+        self.assertEqual(query.cacheStats()['misses'], misses)
+        software.addAddon(Addon('e', '1.0'))
+        self.assertEqual(sorted(query.addonNames()), ['b', 'e'])
+
+        query.addSoftware(Software('d', '1.0'))
+        self.assertEqual(query.softwareByName('d').version(), '1.0')
+        self.assertEqual(softwares.names(), ['a', 'b', 'c', 'd'])
+
+    def __createLoader(self):
+        """Return a loader with the software infos."""
+        loader = Loader()
+        for softwareName, softwareData in sorted(self.__softwareInfos.items()):
+            loader.addSoftwareInfo(
+                softwareName,
+                softwareData['version'],
+                softwareData['options']
+            )
+
+            for addonName, addonData in softwareData.get('addons', {}).items():
+                loader.addAddonInfo(softwareName, addonName, addonData.get('options', {}))
+
+        return loader
@@ -1,4 +1,6 @@
+import multiprocessing
 from uver.Loader import Loader, AddonNotFoundError
+from uver.Versioned import InvalidVersionError
 from .CommonLoader import CommonLoader
 
 class TestLoader(CommonLoader):
@@ -213,3 +215,205 @@ class TestLoader(CommonLoader):
 
         # checking addons
         self.checkAddonsInfo(softwareInfosFinal, softwares)
+
+    def test_resolvedReuse(self):
+        """Should reuse the softwares that are not affected by the env."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addSoftwareInfo('b', '12.1')
+        loader.addSoftwareInfo('c', '11.1')
+        loader.addAddonInfo('a', 'b')
+
+        softwares = dict(map(lambda x: (x.name(), x), loader.softwares()))
+        overridden = dict(map(
+            lambda x: (x.name(), x),
+            loader.softwares({'UVER_B_VERSION': '15', 'PATH': '/bin'})
+        ))
+
+        # "c" is not affected by the override
+        self.assertIs(softwares['c'], overridden['c'])
+
+        # "b" is overridden and "a" uses "b" as addon
+        self.assertIsNot(softwares['a'], overridden['a'])
+        self.assertIsNot(softwares['b'], overridden['b'])
+        self.assertEqual(overridden['b'].version(), '15')
+        self.assertEqual(overridden['a'].addon('b').version(), '15')
+        self.assertEqual(softwares['a'].addon('b').version(), '12.1')
+
+    def test_resolvedCache(self):
+        """Should cache the result based on the relevant env subset."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+
+        first = loader.softwares({'UVER_A_VERSION': '11', 'FOO': '1'})
+        second = loader.softwares({'UVER_A_VERSION': '11', 'FOO': '2'})
+        self.assertIsNot(first, second)
+        self.assertIs(first[0], second[0])
+
+        # overriding the version with the parsed version is the same as no override
+        self.assertIs(
+            loader.softwares({'UVER_A_VERSION': '10.1'})[0],
+            loader.softwares()[0]
+        )
+
+    def test_resolvedInvalidation(self):
+        """Should discard the compiled softwares when info is added."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addSoftwareInfo('b', '12.1')
+        before = loader.softwares()[0]
+
+        loader.addSoftwareInfo('a', '10.2')
+        after = loader.softwares()[0]
+        self.assertIsNot(before, after)
+        self.assertEqual(after.version(), '10.2')
+
+        loader.addAddonInfo('a', 'b')
+        softwares = loader.softwares()
+        self.assertEqual(list(softwares[0].addonNames()), ['b'])
+
+        # softwares whose info did not change are reused
+        loader.addSoftwareInfo('c', '1.0')
+        self.assertIs(loader.softwares()[0], softwares[0])
+        self.assertIs(loader.softwares()[1], softwares[1])
+
+        # changing the version of an addon creates its softwares again
+        loader.addSoftwareInfo('b', '12.2')
+        self.assertEqual(loader.softwares()[0].addon('b').version(), '12.2')
+
+    def test_infos(self):
+        """Should transfer the software and addon info between loaders."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1', {'foo': 1})
+        loader.addSoftwareInfo('b', '12.1')
+        loader.addAddonInfo('a', 'b', {'enabled': False})
+
+        infos = loader.infos()
+        self.assertEqual(
+            infos,
+            {
+                'softwares': {
+                    'a': {'version': '10.1', 'options': {'foo': 1}},
+                    'b': {'version': '12.1', 'options': {}}
+                },
+                'addons': {
+                    'a': {'b': {'options': {'enabled': False}}}
+                }
+            }
+        )
+
+        otherLoader = Loader()
+        otherLoader.addSoftwareInfo('a', '9.0')
+        otherLoader.addInfos(infos)
+        self.assertEqual(otherLoader.infos(), infos)
+        self.assertEqual(
+            list(map(lambda x: x.version(), otherLoader.softwares())),
+            ['10.1', '12.1']
+        )
+
+    def test_uverVersions(self):
+        """Should return the uver names and versions without creating softwares."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addSoftwareInfo('b', '12.1')
+        loader.addAddonInfo('a', 'b')
+
+        self.assertEqual(
+            loader.uverVersions({'UVER_B_VERSION': '15'}),
+            {'UVER_A_VERSION': '10.1', 'UVER_B_VERSION': '15'}
+        )
+
+        target = {'PATH': '/bin'}
+        result = loader.uverVersions(target=target)
+        self.assertIs(result, target)
+        self.assertEqual(
+            target,
+            {'PATH': '/bin', 'UVER_A_VERSION': '10.1', 'UVER_B_VERSION': '12.1'}
+        )
+
+        # same result as going through the softwares
+        softwares = loader.softwares({'UVER_A_VERSION': '11'})
+        self.assertEqual(
+            loader.uverVersions({'UVER_A_VERSION': '11'}),
+            dict(map(lambda x: (x.uverName(), x.version()), softwares))
+        )
+
+    def test_uverVersionsErrors(self):
+        """Should fail on invalid versions and missing addons."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+
+        self.assertRaises(
+            InvalidVersionError,
+            loader.uverVersions,
+            {'UVER_A_VERSION': '10 1'}
+        )
+
+        loader.addAddonInfo('a', 'missing')
+        self.assertRaises(AddonNotFoundError, loader.uverVersions)
+
+    def test_removeInfo(self):
+        """Should remove softwares and addons from the loader."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addSoftwareInfo('b', '12.1')
+        loader.addAddonInfo('a', 'b')
+        self.assertEqual(len(loader.softwares()), 2)
+
+        loader.removeAddonInfo('a', 'b')
+        loader.removeAddonInfo('a', 'missing')
+        loader.removeSoftwareInfo('b')
+        loader.removeSoftwareInfo('missing')
+
+        softwares = loader.softwares()
+        self.assertEqual(len(softwares), 1)
+        self.assertEqual(list(softwares[0].addonNames()), [])
+        self.assertEqual(loader.infos()['addons'], {})
+
+    def test_resolveMany(self):
+        """Should resolve the versions for each env."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addAddonInfo('a', 'b')
+        loader.addSoftwareInfo('b', '12.1')
+
+        envs = [
+            {},
+            {'UVER_B_VERSION': '13', 'OTHER': '1'},
+            {'UVER_B_VERSION': '12.1'},
+            {'UVER_B_VERSION': '13'}
+        ]
+        expected = [
+            (('a', '10.1'), ('b', '12.1')),
+            (('a', '10.1'), ('b', '13')),
+            (('a', '10.1'), ('b', '12.1')),
+            (('a', '10.1'), ('b', '13'))
+        ]
+
+        result = loader.resolveMany(envs)
+        self.assertEqual(list(map(lambda x: tuple(sorted(x)), result)), expected)
+
+        # envs with the same overrides share the result
+        self.assertIs(result[0], result[2])
+        self.assertIs(result[1], result[3])
+
+        # resolving through a pool of processes
+        result = loader.resolveMany(envs, processes=2)
+        self.assertEqual(list(map(lambda x: tuple(sorted(x)), result)), expected)
+
+        # the pool is kept by the snapshot
+        snapshot = loader.snapshot()
+        processIds = sorted(map(lambda x: x.pid, multiprocessing.active_children()))
+        snapshot.resolveMany(envs, processes=2)
+        self.assertEqual(sorted(map(lambda x: x.pid, multiprocessing.active_children())), processIds)
+        snapshot.close()
+        self.assertTrue(processIds)
+        self.assertFalse(set(processIds) & set(map(lambda x: x.pid, multiprocessing.active_children())))
+        self.assertEqual(snapshot.resolveMany(envs, processes=2), result)
+
+        self.assertRaises(
+            InvalidVersionError,
+            loader.resolveMany,
+            envs + [{'UVER_A_VERSION': '10 1'}],
+            2
+        )
@@ -0,0 +1,99 @@
+import unittest
+from uver.Loader import Provenance
+
+class TestProvenance(unittest.TestCase):
+    """Test provenance object."""
+
+    def test_history(self):
+        """Should keep the override history of each key."""
+        provenance = Provenance()
+        provenance.add('a.json', 0, 'a', None, ['foo'])
+        provenance.add('b.json', 3, 'a')
+        provenance.add('b.json', 3, 'a', 'b')
+
+        self.assertEqual(provenance.source('a'), ('b.json', 3))
+        self.assertEqual(provenance.history('a'), [('b.json', 3), ('a.json', 0)])
+        self.assertEqual(provenance.source('a', 'b'), ('b.json', 3))
+        self.assertEqual(provenance.source('x'), None)
+        self.assertEqual(provenance.history('x'), [])
+        self.assertEqual(provenance.sources(), ['a.json', 'b.json'])
+        self.assertEqual(len(provenance), 3)
+
+        # the option was dropped by the latest definition of "a"
+        self.assertEqual(provenance.source('a', None, 'foo'), None)
+        self.assertEqual(provenance.history('a', None, 'foo'), [('a.json', 0)])
+
+    def test_addInfos(self):
+        """Should record all entries of the info."""
+        provenance = Provenance()
+        provenance.addInfos(
+            'a.json',
+            {
+                'softwares': {
+                    'a': {'version': '1.0', 'options': {}},
+                    'b': {'version': '1.0', 'options': {'foo': 1}}
+                },
+                'addons': {
+                    'b': {'a': {'options': {'enabled': False}}}
+                }
+            },
+            firstPosition=2
+        )
+
+        self.assertEqual(provenance.source('a'), ('a.json', 2))
+        self.assertEqual(provenance.source('b', None, 'foo'), ('a.json', 3))
+        self.assertEqual(provenance.source('b', 'a'), ('a.json', 3))
+        self.assertEqual(provenance.source('b', 'a', 'enabled'), ('a.json', 3))
+
+    def test_addInfosOrder(self):
+        """Should keep the order of the infos and entries added in between."""
+        infos = {
+            'softwares': {'a': {'version': '1.0', 'options': {}}},
+            'addons': {'a': {'b': {'options': {}}, 'c': {'options': {}}}}
+        }
+
+        provenance = Provenance()
+        provenance.addInfos('a.json', infos)
+        provenance.add('b.json', 4, 'a')
+        provenance.addInfos('c.json', infos, softwareNames=set(), addonKeys=set([('a', 'c')]))
+
+        self.assertEqual(provenance.history('a'), [('b.json', 4), ('a.json', 0)])
+        self.assertEqual(provenance.history('a', 'b'), [('a.json', 0)])
+        self.assertEqual(provenance.history('a', 'c'), [('c.json', 0), ('a.json', 0)])
+        self.assertEqual(len(provenance), 5)
+
+    def test_discard(self):
+        """Should forget an entry including its options."""
+        provenance = Provenance()
+        provenance.add('a.json', 0, 'a', None, ['foo'])
+        provenance.discard('a')
+        provenance.discard('x')
+
+        self.assertEqual(provenance.source('a'), None)
+        self.assertEqual(provenance.history('a', None, 'foo'), [])
+
+        provenance.add('b.json', 1, 'a')
+        self.assertEqual(provenance.history('a'), [('b.json', 1)])
+
+    def test_compact(self):
+        """Should free the records of discarded entries."""
+        provenance = Provenance()
+        provenance.add('a.json', 0, 'a')
+        provenance.add('b.json', 1, 'a')
+        provenance.add('a.json', 2, 'b', 'a', ['enabled'])
+
+        for index in range(100):
+            provenance.discard('b', 'a')
+            provenance.add('c{0}.json'.format(index), 2, 'b', 'a', ['enabled'])
+
+        self.assertLessEqual(len(provenance), 6)
+        self.assertEqual(provenance.history('a'), [('b.json', 1), ('a.json', 0)])
+        self.assertEqual(provenance.history('b', 'a', 'enabled'), [('c99.json', 2)])
+
+        provenance.discardMany(['a'], [('b', 'a')])
+        self.assertEqual(len(provenance), 0)
+        self.assertEqual(provenance.source('a'), None)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+import time
+import threading
+from uver.Loader import Loader, Snapshot
+from .CommonLoader import CommonLoader
+
+class TestSnapshot(CommonLoader):
+    """Test snapshot object."""
+
+    def test_constructor(self):
+        """Should test the constructor."""
+        snapshot = Snapshot({'a': {'version': '1.0', 'options': {}}}, {}, 3)
+
+        self.assertEqual(snapshot.generation(), 3)
+        self.assertEqual(snapshot.uverVersions(), {'UVER_A_VERSION': '1.0'})
+
+    def test_namesByUverName(self):
+        """Should return the software names of each uver name."""
+        loader = Loader()
+        loader.addSoftwareInfo('foo', '1.0')
+        loader.addSoftwareInfo('FOO', '2.0')
+        loader.addSoftwareInfo('bar', '1.0')
+
+        namesByUverName = loader.namesByUverName()
+        self.assertEqual(namesByUverName, {'UVER_FOO_VERSION': ['foo', 'FOO'], 'UVER_BAR_VERSION': ['bar']})
+
+        # the result is a copy
+        namesByUverName['UVER_FOO_VERSION'].append('x')
+        self.assertEqual(loader.snapshot().namesByUverName()['UVER_FOO_VERSION'], ['foo', 'FOO'])
+
+    def test_immutable(self):
+        """Should not be affected by changes made to the loader."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.addAddonInfo('a', 'b')
+        loader.addSoftwareInfo('b', '12.1')
+        snapshot = loader.snapshot()
+
+        loader.addSoftwareInfo('a', '10.2')
+        loader.addAddonInfo('a', 'c')
+        loader.addSoftwareInfo('c', '1.0')
+        loader.removeSoftwareInfo('b')
+
+        self.assertEqual(
+            snapshot.uverVersions(),
+            {'UVER_A_VERSION': '10.1', 'UVER_B_VERSION': '12.1'}
+        )
+        self.assertEqual(list(snapshot.softwares()[0].addonNames()), ['b'])
+        self.assertGreater(loader.snapshot().generation(), snapshot.generation())
+
+    def test_batch(self):
+        """Should only expose the changes when the batch ends."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+
+        with loader.batch():
+            loader.addSoftwareInfo('a', '10.2')
+            with loader.batch():
+                loader.addSoftwareInfo('b', '12.1')
+            self.assertEqual(loader.uverVersions(), {'UVER_A_VERSION': '10.1'})
+
+        self.assertEqual(
+            loader.uverVersions(),
+            {'UVER_A_VERSION': '10.2', 'UVER_B_VERSION': '12.1'}
+        )
+
+    def test_readYourWrites(self):
+        """Should expose the changes of a thread to itself while another thread is writing."""
+        loader = Loader()
+        entered = threading.Event()
+
+        class SlowOptions(dict):
+            def __iter__(self):
+                return iter(self.keys())
+
+            def keys(self):
+                entered.set()
+                time.sleep(0.1)
+                return super(SlowOptions, self).keys()
+
+        loader.addSoftwareInfo('a', '10.1')
+
+        # the writer holds the lock while copying the options
+        writer = threading.Thread(
+            target=lambda: loader.addSoftwareInfo('b', '12.1', SlowOptions(foo=1))
+        )
+        writer.start()
+        try:
+            self.assertTrue(entered.wait(5))
+            self.assertEqual(loader.uverVersions()['UVER_A_VERSION'], '10.1')
+        finally:
+            writer.join()
+
+    def test_lockFreeReaders(self):
+        """Should not wait for a batch running in another thread."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '10.1')
+        loader.uverVersions()
+        entered = threading.Event()
+        release = threading.Event()
+
+        def write():
+            with loader.batch():
+                loader.addSoftwareInfo('a', '11')
+                entered.set()
+                release.wait(5)
+
+        writer = threading.Thread(target=write)
+        writer.start()
+        try:
+            self.assertTrue(entered.wait(5))
+
+            # the reader has no changes of its own
+            result = []
+            reader = threading.Thread(target=lambda: result.append(loader.uverVersions()))
+            reader.start()
+            reader.join(5)
+            self.assertFalse(reader.is_alive())
+            self.assertEqual(result, [{'UVER_A_VERSION': '10.1'}])
+        finally:
+            release.set()
+            writer.join()
+
+        self.assertEqual(loader.uverVersions(), {'UVER_A_VERSION': '11'})
+
+    def test_concurrentReaders(self):
+        """Should always resolve a consistent generation while writing."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '0')
+        loader.addSoftwareInfo('b', '0')
+        errors = []
+        done = threading.Event()
+
+        def read():
+            while not done.is_set():
+                versions = set(loader.uverVersions().values())
+                if len(versions) != 1:
+                    errors.append(versions)
+
+        readers = list(map(lambda x: threading.Thread(target=read), range(4)))
+        for reader in readers:
+            reader.start()
+
+        try:
+            for index in range(1, 500):
+                with loader.batch():
+                    loader.addSoftwareInfo('a', str(index))
+                    loader.addSoftwareInfo('b', str(index))
+        finally:
+            done.set()
+            for reader in readers:
+                reader.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(loader.uverVersions()['UVER_A_VERSION'], '499')
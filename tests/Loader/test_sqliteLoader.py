@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+from uver.Loader import \
+    Loader, \
+    SqliteLoader, \
+    SqliteCatalog, \
+    InvalidSqliteCatalogError
+from uver import Query
+from .CommonLoader import CommonLoader
+
+class TestSqliteLoader(CommonLoader):
+    """Test sqlite loader object."""
+
+    __softwareInfos = {
+        'a': {
+            'version': '10.1',
+            'addons': {
+                'b': {
+                    'options': {
+                        'enabled': False,
+                        'list': [1, 2]
+                    }
+                },
+                'c': {}
+            },
+            'options': {
+                'foo': u'café'
+            }
+        },
+        'b': {
+            'version': '12.1',
+            'options': {}
+        },
+        'c': {
+            'version': '11.1',
+            'addons': {
+                'b': {}
+            },
+            'options': {}
+        }
+    }
+
+    def setUp(self):
+        """Create a temporary directory for the catalog files."""
+        self.__directory = tempfile.mkdtemp()
+        self.__fileName = os.path.join(self.__directory, 'config.db')
+
+    def tearDown(self):
+        """Remove the temporary directory."""
+        shutil.rmtree(self.__directory)
+
+    def test_sqliteFile(self):
+        """Should load the same info written by a loader."""
+        loader = self.__createLoader()
+        loader.addAddonInfo('x', 'b')
+        loader.writeSqlite(self.__fileName)
+
+        sqliteLoader = SqliteLoader()
+        sqliteLoader.loadFromSqliteFile(self.__fileName)
+
+        self.assertEqual(sqliteLoader.infos(), loader.infos())
+        self.assertEqual(sqliteLoader.uverVersions(), loader.uverVersions())
+
+        self.checkSoftwareInfo(self.__softwareInfos, sqliteLoader.softwares())
+
+        softwares = sqliteLoader.softwares({'UVER_B_VERSION': '13'})
+        self.assertEqual(
+            dict(map(lambda x: (x.name(), x.version()), softwares)),
+            {'a': '10.1', 'b': '13', 'c': '11.1'}
+        )
+        self.assertEqual(softwares[0].addon('b').option('list'), [1, 2])
+
+    def test_lazyQuery(self):
+        """Should query the catalog without creating all softwares."""
+        self.__createLoader().writeSqlite(self.__fileName)
+        sqliteLoader = SqliteLoader()
+        sqliteLoader.loadFromSqliteFile(self.__fileName)
+
+        softwares = sqliteLoader.softwares(lazy=True)
+        query = Query(softwares)
+
+        self.assertEqual(query.softwareNames(), ['a', 'b', 'c'])
+        self.assertEqual(query.softwareByName('c').addon('b').version(), '12.1')
+        self.assertEqual(list(map(softwares.isCreated, range(len(softwares)))), [False, False, True])
+
+    def test_catalog(self):
+        """Should look up entries from the catalog."""
+        loader = self.__createLoader()
+        loader.addAddonInfo('x', 'b')
+        SqliteCatalog.write(self.__fileName, loader.infos())
+        catalog = SqliteCatalog(self.__fileName)
+
+        softwareInfos = catalog.softwareInfos()
+        self.assertEqual(len(softwareInfos), 3)
+        self.assertIn('b', softwareInfos)
+        self.assertNotIn('d', softwareInfos)
+        self.assertEqual(softwareInfos['a']['options'], {'foo': u'café'})
+        self.assertRaises(KeyError, lambda: softwareInfos['d'])
+
+        addonInfos = catalog.addonInfos()
+        self.assertEqual(list(addonInfos.keys()), ['a', 'c', 'x'])
+        self.assertRaises(KeyError, lambda: addonInfos['b'])
+        self.assertIn('x', addonInfos)
+        self.assertNotIn('b', addonInfos)
+        self.assertTrue(catalog.hasSoftware('a'))
+        self.assertFalse(catalog.hasAddons('b'))
+        self.assertEqual(addonInfos['a']['c'], {'options': {}})
+
+        self.assertEqual(catalog.softwareNameByUverName('UVER_C_VERSION'), 'c')
+        self.assertEqual(catalog.softwareNamesByAddonName('b'), ['a', 'c'])
+        self.assertEqual(catalog.softwareAddons('x'), [('b', '12.1', {})])
+        self.assertEqual(catalog.addonNames(), ['b', 'c'])
+        catalog.close()
+
+    def test_invalidFile(self):
+        """Should fail when the file is not a valid catalog."""
+        self.assertRaises(InvalidSqliteCatalogError, SqliteLoader().loadFromSqliteFile, self.__fileName)
+
+        with open(self.__fileName, 'wb') as f:
+            f.write(b'{"a": "1.0.0", "b": "2.0.0"}')
+
+        self.assertRaises(InvalidSqliteCatalogError, SqliteLoader().loadFromSqliteFile, self.__fileName)
+
+    def __createLoader(self):
+        """Return a loader with the software infos."""
+        loader = Loader()
+        for softwareName, softwareData in self.__softwareInfos.items():
+            loader.addSoftwareInfo(
+                softwareName,
+                softwareData['version'],
+                softwareData['options']
+            )
+
+            for addonName, addonData in softwareData.get('addons', {}).items():
+                loader.addAddonInfo(softwareName, addonName, addonData.get('options', {}))
+
+        return loader
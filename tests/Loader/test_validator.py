@@ -0,0 +1,159 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+from uver.Loader import Loader, Validator, ValidationIssue
+
+class TestValidator(unittest.TestCase):
+    """Test validator object."""
+
+    def test_valid(self):
+        """Should not report issues for valid contents."""
+        validator = Validator()
+        validator.addFromJson(json.dumps({
+            'a': '1.0',
+            'b': {
+                'version': '2.0',
+                'addons': {
+                    'a': {
+                        'options': {
+                            'enabled': False
+                        }
+                    }
+                },
+                'options': {
+                    'foo': [1]
+                }
+            }
+        }))
+
+        self.assertTrue(validator.isValid())
+        self.assertEqual(validator.issues(), [])
+
+    def test_aggregatedIssues(self):
+        """Should report all the issues with their key paths."""
+        validator = Validator()
+        validator.addFromContents({
+            'a': '1 0',
+            'b-c': '1.0',
+            'd': ['1.0'],
+            'e': {
+                'version': '1.0',
+                'options': [],
+                'addons': {
+                    'a': None,
+                    'x': {
+                        'options': {
+                            '': 1
+                        }
+                    }
+                }
+            },
+            'f': {
+                'addons': []
+            }
+        }, 'config.json')
+
+        issues = sorted(map(str, validator.issues()))
+        self.assertEqual(issues, [
+            'config.json: a: version needs to be defined as valid string "1 0"',
+            'config.json: b-c: Invalid name: "b-c"',
+            'config.json: d: Could not decode version for "d"',
+            'config.json: e.addons.a: Expecting object as content for addon!',
+            'config.json: e.addons.x.options: Invalid option name: ""',
+            'config.json: e.addons.x: Could not find a version for the addon "x"',
+            'config.json: e.options: options need to be a dictionary',
+            'config.json: f.addons: Expecting object for addons!',
+            'config.json: f: Could not decode version for "f"'
+        ])
+
+        issue = validator.issues()[0]
+        self.assertIsInstance(issue, ValidationIssue)
+        self.assertEqual(issue.fileName(), 'config.json')
+
+    def test_directory(self):
+        """Should resolve addons across the files of a directory."""
+        directory = tempfile.mkdtemp()
+        try:
+            with open(os.path.join(directory, 'a.json'), 'w') as f:
+                json.dump({'a': {'version': '1.0', 'addons': {'b': {}, 'c': {}}}}, f)
+
+            with open(os.path.join(directory, 'b.json'), 'w') as f:
+                json.dump({'b': '1.0'}, f)
+
+            with open(os.path.join(directory, 'c.json'), 'w') as f:
+                f.write('{"c": ')
+
+            validator = Validator()
+            validator.addFromJsonDirectory(directory)
+            issues = validator.issues()
+
+            self.assertEqual(len(issues), 2)
+            self.assertEqual(issues[0].fileName(), os.path.join(directory, 'c.json'))
+            self.assertTrue(issues[0].message().startswith('Invalid json'))
+            self.assertEqual(issues[1].fileName(), os.path.join(directory, 'a.json'))
+            self.assertEqual(issues[1].keyPath(), ('a', 'addons', 'c'))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_optionValues(self):
+        """Should report option values that are not json types."""
+        validator = Validator()
+        validator.addFromContents({
+            'a': {
+                'version': '1.0',
+                'options': {
+                    'valid': [1, 2.5, None, True, u'café', {'x': {'y': []}}],
+                    'object': object(),
+                    'nested': {'x': [1, set([2])], 3: 'z'}
+                }
+            }
+        }, 'config.json')
+
+        issues = sorted(map(str, validator.issues()))
+        self.assertEqual(issues, [
+            'config.json: a.options.nested.x.1: Invalid option value type: "set"',
+            'config.json: a.options.nested: Invalid option key: "3"',
+            'config.json: a.options.object: Invalid option value type: "object"'
+        ])
+
+    def test_unreadableFile(self):
+        """Should report files that can not be decoded."""
+        directory = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(directory, 'a.json')
+            with open(fileName, 'wb') as f:
+                f.write(b'{"a": "\xff\xfe"}')
+
+            validator = Validator()
+            validator.addFromJsonDirectory(directory)
+            issues = validator.issues()
+
+            self.assertEqual(len(issues), 1)
+            self.assertEqual(issues[0].fileName(), fileName)
+            self.assertTrue(issues[0].message().startswith('Could not read file'))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_infos(self):
+        """Should validate the info of a loader."""
+        loader = Loader()
+        loader.addSoftwareInfo('a', '1.0')
+        loader.addSoftwareInfo('b', '')
+        loader.addAddonInfo('a', 'c')
+
+        validator = Validator()
+        validator.addInfos(loader.infos())
+
+        self.assertEqual(
+            list(map(str, validator.issues())),
+            [
+                'b.version: version needs to be defined as valid string ""',
+                'a.addons.c: Could not find a version for the addon "c"'
+            ]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
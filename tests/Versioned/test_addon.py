@@ -19,3 +19,19 @@ class TestAddon(unittest.TestCase):
 
         self.assertEqual(len(addon.optionNames()), 1)
         self.assertEqual(addon.option('enabled'), True)
+
+    def test_sharedDefaultOptions(self):
+        """Should copy the shared default options when setting an option."""
+        addon = Addon("foo", "1.1")
+        otherAddon = Addon("bar", "1.1")
+        addon.setOption('enabled', False)
+
+        self.assertEqual(addon.option('enabled'), False)
+        self.assertEqual(otherAddon.option('enabled'), True)
+        self.assertEqual(Addon.defaultOptions, {'enabled': True})
+
+    def test_slots(self):
+        """Should not allocate a dict per instance."""
+        addon = Addon("foo", "1.1")
+
+        self.assertFalse(hasattr(addon, '__dict__'))
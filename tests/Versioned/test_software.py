@@ -1,5 +1,6 @@
+import weakref
 import unittest
-from uver.Versioned import Software, Addon, InvalidAddonError
+from uver.Versioned import Software, Addon, AddonRevision, InvalidAddonError
 
 class TestSoftware(unittest.TestCase):
     """Test software object."""
@@ -51,3 +52,39 @@ class TestSoftware(unittest.TestCase):
             success = True
 
         self.assertTrue(success)
+
+    def test_addonsPerInstance(self):
+        """Should not share addons between softwares."""
+        software = Software("foo", "1.1")
+        otherSoftware = Software("bar", "1.1")
+        software.addAddon(Addon("a", "1.0"))
+
+        self.assertEqual(list(software.addonNames()), ['a'])
+        self.assertEqual(list(otherSoftware.addonNames()), [])
+
+    def test_watchAddons(self):
+        """Should bump the watching revisions when the addons change."""
+        software = Software("foo", "1.1")
+        software.addAddon(Addon("a", "1.0"))
+
+        revision = AddonRevision()
+        software.watchAddons(revision)
+        self.assertEqual(revision.value(), 0)
+
+        Software("bar", "1.1").addAddon(Addon("b", "1.0"))
+        self.assertEqual(revision.value(), 0)
+
+        software.addAddon(Addon("b", "1.0"))
+        self.assertEqual(revision.value(), 1)
+
+        # revisions are weakly referenced, the dead ones are dropped
+        deadRevision = weakref.ref(revision)
+        del revision
+        self.assertIsNone(deadRevision())
+
+        newRevision = AddonRevision()
+        software.watchAddons(newRevision)
+        self.assertEqual(len(software._Software__addonWatchers), 1)
+
+        software.addAddon(Addon("c", "1.0"))
+        self.assertEqual(newRevision.value(), 1)
@@ -0,0 +1,79 @@
+import unittest
+from uver.Versioned import Version, VersionConstraint, InvalidVersionConstraintError
+
+class TestVersion(unittest.TestCase):
+    """Test version object."""
+
+    def test_ordering(self):
+        """Should sort the versions by their components."""
+        versions = ['10.0', '1.0.1', '2', '1.0.beta', '1.0a', '1.0', '1.10', '1.9', '0.9']
+
+        self.assertListEqual(
+            sorted(versions, key=Version.key),
+            ['0.9', '1.0a', '1.0.beta', '1.0', '1.0.1', '1.9', '1.10', '2', '10.0']
+        )
+        self.assertEqual(Version.key('2'), Version.key('2.0.0'))
+
+    def test_preRelease(self):
+        """Should sort the pre-releases before their release."""
+        versions = ['3.0.1', '3.0', '3.0beta.2', '3.0beta', '3.0alpha', '2.9', '3.0rc1']
+
+        self.assertListEqual(
+            sorted(versions, key=Version.key),
+            ['2.9', '3.0alpha', '3.0beta', '3.0beta.2', '3.0rc1', '3.0', '3.0.1']
+        )
+        self.assertTrue(VersionConstraint('<3').matches('3.0beta'))
+        self.assertFalse(VersionConstraint('>=3').matches('3.0beta'))
+        self.assertTrue(VersionConstraint('>=3.0beta,<3').matches('3.0rc1'))
+
+    def test_trailingZeros(self):
+        """Should ignore the trailing zeros, including the ones before a tag."""
+        self.assertEqual(Version.key('1.0.beta'), Version.key('1.0.0.beta'))
+        self.assertEqual(Version.key('1.0.beta'), Version.key('1beta'))
+        self.assertEqual(Version.key('2.0'), Version.key('2'))
+        self.assertNotEqual(Version.key('1.0.5'), Version.key('1.5'))
+        self.assertEqual(Version.compare('1.0.0.beta', '1.0.beta.1'), -1)
+
+    def test_compare(self):
+        """Should compare two versions."""
+        self.assertEqual(Version.compare('1.2', '1.10'), -1)
+        self.assertEqual(Version.compare('1.10', '1.2'), 1)
+        self.assertEqual(Version.compare('1.2', '1.2'), 0)
+
+    def test_key(self):
+        """Should memoize the keys."""
+        self.assertIs(Version.key('3.2.1'), Version.key('3.2.1'))
+
+class TestVersionConstraint(unittest.TestCase):
+    """Test version constraint object."""
+
+    def test_matches(self):
+        """Should match the versions satisfying the constraint."""
+        constraint = VersionConstraint('>=2.0, <3,!=2.5')
+
+        self.assertEqual(constraint.expression(), '>=2.0, <3,!=2.5')
+        self.assertTrue(constraint.matches('2.0'))
+        self.assertTrue(constraint.matches('2.10'))
+        self.assertFalse(constraint.matches('2.5'))
+        self.assertFalse(constraint.matches('3'))
+        self.assertFalse(constraint.matches('1.9'))
+        self.assertTrue(VersionConstraint('1.0').matches('1.0'))
+        self.assertTrue(VersionConstraint('>1.0,<=1.2').matches('1.2'))
+
+    def test_range(self):
+        """Should return the slice of sorted keys that can match."""
+        keys = list(map(Version.key, ['1.0', '2.0', '2.5', '3.0', '4.0']))
+
+        self.assertEqual(VersionConstraint('>=2.0,<3').range(keys), (1, 3))
+        self.assertEqual(VersionConstraint('>2.0,<=3').range(keys), (2, 4))
+        self.assertEqual(VersionConstraint('==2.5').range(keys), (2, 3))
+        self.assertEqual(VersionConstraint('>5').range(keys), (5, 5))
+
+    def test_invalidConstraint(self):
+        """Should fail to parse invalid constraints."""
+        for expression in ('', '>=', '=>1.0', '1.0 2.0', '>=1.0,'):
+            self.assertRaises(
+                InvalidVersionConstraintError,
+                VersionConstraint,
+                expression
+            )
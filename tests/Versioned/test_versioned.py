@@ -118,3 +118,44 @@ class TestVersioned(unittest.TestCase):
             success = True
 
         self.assertTrue(success)
+
+    def test_internedNames(self):
+        """Should intern the names and uver names."""
+        versioned = Versioned(''.join(['f', 'oo']), "1.0")
+        otherVersioned = Versioned(''.join(['fo', 'o']), "1.0")
+
+        self.assertIs(versioned.name(), otherVersioned.name())
+        self.assertIs(versioned.uverName(), otherVersioned.uverName())
+
+    def test_sharedDefaultOptions(self):
+        """Should not modify the shared default options."""
+        versioned = Versioned("foo", "1.0")
+        versioned.setOption('a', 1)
+
+        self.assertEqual(Versioned.defaultOptions, {})
+        self.assertEqual(len(Versioned("bar", "1.0").optionNames()), 0)
+
+    def test_uverNameMemoization(self):
+        """Should return the same uver name object for the same name."""
+        uverName = Versioned.toUverName('fooBar')
+
+        self.assertEqual(uverName, 'UVER_FOOBAR_VERSION')
+        self.assertIs(Versioned.toUverName('fooBar'), uverName)
+
+    def test_uverNameCacheSize(self):
+        """Should keep the memoization bounded."""
+        cacheSize = Versioned.uverNameCacheSize
+        Versioned.uverNameCacheSize = 2
+        try:
+            for name in ('cacheA', 'cacheB', 'cacheC'):
+                Versioned.toUverName(name)
+
+            self.assertEqual(Versioned.toUverName('cacheA'), 'UVER_CACHEA_VERSION')
+            self.assertEqual(Versioned.toUverName('cacheC'), 'UVER_CACHEC_VERSION')
+        finally:
+            Versioned.uverNameCacheSize = cacheSize
+
+        # the default size is also enforced
+        for index in range(Versioned.uverNameCacheSize + 10):
+            Versioned.toUverName('cache{0}'.format(index))
+        self.assertLessEqual(len(Versioned._Versioned__uverNames), Versioned.uverNameCacheSize)
@@ -0,0 +1,53 @@
+import os
+import shutil
+import subprocess
+import tempfile
+import unittest
+from uver import EnvFile, InvalidEnvFileFormatError
+
+class TestEnvFile(unittest.TestCase):
+    """Test env file object."""
+
+    __variables = {
+        'UVER_B_VERSION': '1.0',
+        'UVER_A_VERSION': "it's"
+    }
+
+    def test_shContents(self):
+        """Should format the variables as a shell sourceable file."""
+        self.assertEqual(
+            EnvFile.contents(self.__variables),
+            "export UVER_A_VERSION='it'\\''s'\nexport UVER_B_VERSION='1.0'\n"
+        )
+
+    def test_envContents(self):
+        """Should format the variables as NAME=value lines."""
+        self.assertEqual(
+            EnvFile.contents(self.__variables, 'env'),
+            "UVER_A_VERSION=it's\nUVER_B_VERSION=1.0\n"
+        )
+
+    def test_invalidFormat(self):
+        """Should fail when the format is not supported."""
+        success = False
+        try:
+            EnvFile.contents(self.__variables, 'invalid')
+        except InvalidEnvFileFormatError:
+            success = True
+
+        self.assertTrue(success)
+
+    def test_write(self):
+        """Should write a file that can be sourced by the shell."""
+        directory = tempfile.mkdtemp()
+        try:
+            fileName = os.path.join(directory, 'env.sh')
+            EnvFile.write(fileName, self.__variables)
+
+            output = subprocess.check_output(
+                ['sh', '-c', '. "{0}" && echo "$UVER_A_VERSION"'.format(fileName)]
+            )
+            self.assertEqual(output.decode('utf-8').strip(), "it's")
+            self.assertEqual(os.listdir(directory), ['env.sh'])
+        finally:
+            shutil.rmtree(directory)
@@ -0,0 +1,97 @@
+import os
+import unittest
+from uver import Instrumentation, Query
+from uver.Loader import Loader, JsonLoader
+
+class TestInstrumentation(unittest.TestCase):
+    """Test instrumentation object."""
+
+    __jsonDirectory = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+        'data',
+        'json'
+    )
+
+    def tearDown(self):
+        """Disable the instrumentation."""
+        Instrumentation.disable()
+        Instrumentation.reset()
+
+    def test_disabled(self):
+        """Should not record anything while disabled."""
+        softwareByName = Query.__dict__['softwareByName']
+
+        loader = JsonLoader()
+        loader.addFromJsonFile(os.path.join(self.__jsonDirectory, 'simple.json'))
+        Query(loader.softwares()).softwareByName('a')
+
+        self.assertEqual(Instrumentation.stats(), {'timers': {}, 'counters': {}})
+
+        # methods are only replaced while enabled
+        Instrumentation.enable()
+        self.assertIsNot(Query.__dict__['softwareByName'], softwareByName)
+        Instrumentation.disable()
+        self.assertIs(Query.__dict__['softwareByName'], softwareByName)
+
+    def test_stats(self):
+        """Should record the timers and counters while enabled."""
+        Instrumentation.enable()
+
+        loader = JsonLoader()
+        loader.addFromJsonFile(os.path.join(self.__jsonDirectory, 'complex.json'))
+        query = Query(loader.softwares())
+        query.softwareByName('c')
+        query.softwareByName('c')
+
+        stats = Instrumentation.stats()
+        self.assertEqual(stats['counters']['files'], 1)
+        self.assertEqual(stats['counters']['softwares'], len(loader.infos()['softwares']))
+        self.assertTrue(stats['counters']['bytes'] > 0)
+        self.assertTrue(stats['counters']['addons'] > 0)
+        self.assertTrue(stats['counters']['options'] > 0)
+        self.assertEqual(stats['timers']['Query.softwareByName']['calls'], 2)
+        for timerName in ('JsonLoader.addFromJsonFile', 'JsonLoader.read', 'JsonLoader.decode', 'Loader.softwares'):
+            self.assertEqual(stats['timers'][timerName]['calls'], 1)
+            self.assertTrue(
+                stats['timers'][timerName]['total'] >= stats['timers'][timerName]['max'] >= 0.0
+            )
+
+        # the values are kept until reset
+        Instrumentation.disable()
+        self.assertEqual(Instrumentation.stats(), stats)
+        Instrumentation.reset()
+        self.assertEqual(Instrumentation.stats(), {'timers': {}, 'counters': {}})
+
+    def test_hooks(self):
+        """Should send the recorded values to the hooks."""
+        recorded = []
+
+        def hook(kind, name, value):
+            recorded.append((kind, name, value))
+
+        Instrumentation.addHook(hook)
+        try:
+            Instrumentation.enable()
+            loader = Loader()
+            loader.addSoftwareInfo('a', '1.0', {'foo': 1})
+            loader.uverVersions()
+            Instrumentation.count('custom', 3)
+            with Instrumentation.timer('custom'):
+                pass
+        finally:
+            Instrumentation.removeHook(hook)
+
+        self.assertIn(('counter', 'custom', 3), recorded)
+        self.assertIn('Loader.uverVersions', map(lambda x: x[1], recorded))
+        self.assertEqual(
+            list(map(lambda x: x[:2], filter(lambda x: x[0] == 'timer' and x[1] == 'custom', recorded))),
+            [('timer', 'custom')]
+        )
+
+        # removed hooks are not called anymore
+        Instrumentation.count('custom')
+        self.assertEqual(len(list(filter(lambda x: x[1] == 'custom', recorded))), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import subprocess
+import unittest
+import uver
+
+class TestLazyModule(unittest.TestCase):
+    """Test lazy module object."""
+
+    __libDirectory = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+        'src',
+        'lib'
+    )
+
+    def test_cheapImport(self):
+        """Should not import the submodules (nor their dependencies) when importing uver."""
+        env = dict(os.environ)
+        env['PYTHONPATH'] = self.__libDirectory
+        output = subprocess.check_output(
+            [
+                sys.executable,
+                '-c',
+                'import sys, uver; print(" ".join(sorted(sys.modules.keys())))'
+            ],
+            env=env
+        )
+        modules = output.decode('utf-8').split()
+
+        self.assertNotIn('json', modules)
+        self.assertNotIn('glob', modules)
+        self.assertNotIn('uver.Loader', modules)
+        self.assertNotIn('uver.Versioned', modules)
+
+    def test_attributes(self):
+        """Should expose the attributes instead of the submodules named after them."""
+        from uver.Loader import JsonLoader
+
+        self.assertTrue(isinstance(uver.Loader.Loader, type))
+        self.assertTrue(issubclass(JsonLoader, uver.Loader.Loader))
+        self.assertTrue(isinstance(uver.Query, type))
+        self.assertTrue(isinstance(uver.Versioned.Versioned, type))
+        self.assertEqual(uver.Versioned.__name__, 'uver.Versioned')
+        self.assertIn('JsonLoader', dir(uver.Loader))
+        self.assertRaises(AttributeError, getattr, uver.Loader, 'Unknown')
+
+
+if __name__ == '__main__':
+    unittest.main()
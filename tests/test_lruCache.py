@@ -0,0 +1,41 @@
+import unittest
+from uver.LruCache import LruCache
+
+class TestLruCache(unittest.TestCase):
+    """Test lru cache object."""
+
+    def test_getSet(self):
+        """Should return the cached values."""
+        cache = LruCache(2)
+        cache.set('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('b', 2), 2)
+
+    def test_eviction(self):
+        """Should discard the least recently used entry."""
+        cache = LruCache(2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(len(cache), 2)
+
+    def test_stats(self):
+        """Should count hits and misses."""
+        cache = LruCache(4)
+        cache.set('a', 1)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.clear()
+
+        self.assertEqual(
+            cache.stats(),
+            {'hits': 2, 'misses': 1, 'size': 0, 'maxSize': 4}
+        )
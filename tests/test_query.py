@@ -1,3 +1,4 @@
+import threading
 import unittest
 from uver.Versioned import Software, Addon
 from uver import Query, SoftwareNotFoundError, AddonNotFoundError
@@ -154,6 +155,220 @@ class TestQuery(unittest.TestCase):
 
         self.assertTrue(success)
 
+    def test_addSoftware(self):
+        """Should keep the indexes up to date when adding a software."""
+        softwares = self.__getSoftwares()
+        query = Query(softwares)
+
+        softwareE = Software('E', '2.0.0')
+        softwareE.addAddon(Addon('D', '0.0.1'))
+        query.addSoftware(softwareE)
+
+        self.assertIs(query.softwareByName('E'), softwareE)
+        self.assertIs(query.softwareByUverName('UVER_E_VERSION'), softwareE)
+        self.assertListEqual(query.softwaresByAddonName('D'), [softwareE])
+        self.assertListEqual(query.softwaresByAddonUverName('UVER_D_VERSION'), [softwareE])
+        self.assertEqual(sorted(query.addonNames()), ['A', 'D'])
+
+    def test_setSoftwares(self):
+        """Should rebuild the indexes when assigning a new software list."""
+        query = Query(self.__getSoftwares())
+
+        softwareE = Software('E', '2.0.0')
+        query.setSoftwares([softwareE])
+
+        self.assertIs(query.softwareByName('E'), softwareE)
+        self.assertEqual(query.addonNames(), [])
+        self.assertRaises(SoftwareNotFoundError, query.softwareByName, 'A')
+
+    def test_appendedSoftware(self):
+        """Should detect softwares appended directly to the software list."""
+        softwares = self.__getSoftwares()
+        query = Query(softwares)
+
+        softwareE = Software('E', '2.0.0')
+        query.softwares().append(softwareE)
+
+        self.assertIs(query.softwareByName('E'), softwareE)
+
+    def test_firstSoftwareWins(self):
+        """Should return the first software when names are duplicated."""
+        softwares = self.__getSoftwares()
+        duplicated = Software('A', '9.9.9')
+        softwares.append(duplicated)
+        query = Query(softwares)
+
+        self.assertIs(query.softwareByName('A'), softwares[0])
+        self.assertIs(query.softwareByUverName('UVER_A_VERSION'), softwares[0])
+
+    def test_uverVersions(self):
+        """Should return the uver names and versions of the softwares."""
+        softwares = self.__getSoftwares()
+        softwares[1].addAddon(Addon('F', '3.0'))
+        query = Query(softwares)
+
+        self.assertEqual(
+            query.uverVersions(),
+            {
+                'UVER_A_VERSION': '1.1.0',
+                'UVER_B_VERSION': '1.0.0',
+                'UVER_C_VERSION': '0.1.0',
+                'UVER_D_VERSION': '0.0.1',
+                'UVER_F_VERSION': '3.0'
+            }
+        )
+
+    def test_resultCache(self):
+        """Should cache the results until the softwares change."""
+        softwares = self.__getSoftwares()
+        query = Query(softwares)
+
+        softwareNames = query.softwareNames()
+        addonNames = query.addonNames()
+        self.assertEqual(query.softwareNames(), softwareNames)
+        self.assertEqual(query.addonNames(), addonNames)
+        self.assertEqual(query.softwaresByAddonName('A'), query.softwaresByAddonName('A'))
+        self.assertIsNot(query.uverVersions(), query.uverVersions())
+
+        stats = query.cacheStats()
+        self.assertEqual(stats['misses'], 4)
+        self.assertEqual(stats['hits'], 4)
+        self.assertEqual(stats['maxSize'], Query.resultCacheSize)
+
+        # each call returns a new list
+        softwareNames.append('X')
+        query.addonNames().sort(reverse=True)
+        self.assertNotIn('X', query.softwareNames())
+        self.assertEqual(query.addonNames(), addonNames)
+
+        # changes to the software list
+        query.addSoftware(Software('E', '1.0'))
+        self.assertIn('E', query.softwareNames())
+        softwares.append(Software('F', '1.0'))
+        self.assertIn('F', query.softwareNames())
+
+        # changes to the addons of a software that has been indexed
+        self.assertNotIn('G', query.addonNames())
+        softwares[0].addAddon(Addon('G', '1.0'))
+        self.assertIn('G', query.addonNames())
+        self.assertEqual(query.softwaresByAddonName('G'), [softwares[0]])
+        self.assertIn('UVER_G_VERSION', query.uverVersions())
+
+        # changes to softwares that are not part of the query
+        hits = query.cacheStats()['hits']
+        Software('H', '1.0').addAddon(Addon('G', '1.0'))
+        otherSoftwares = self.__getSoftwares()
+        Query(otherSoftwares).addonNames()
+        otherSoftwares[0].addAddon(Addon('H', '1.0'))
+        query.addonNames()
+        self.assertEqual(query.cacheStats()['hits'], hits + 1)
+
+    def test_threads(self):
+        """Should answer lookups from multiple threads while rebuilding the indexes."""
+        softwares = self.__getSoftwares()
+        query = Query(softwares)
+        errors = []
+
+        def lookup():
+            try:
+                for index in range(200):
+                    self.assertEqual(query.softwareByName('B').name(), 'B')
+                    self.assertIn('A', query.addonNames())
+            except Exception as err:
+                errors.append(err)
+
+        threads = list(map(lambda x: threading.Thread(target=lookup), range(4)))
+        for thread in threads:
+            thread.start()
+
+        # forcing the indexes to be rebuilt
+        for index in range(50):
+            softwares[0].addAddon(Addon('A{0}'.format(index), '1.0'))
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertIn('A49', query.addonNames())
+
+    def test_addSoftwareThreads(self):
+        """Should answer lookups from multiple threads while adding softwares."""
+        query = Query(self.__getSoftwares())
+        query.latestSoftwareByName('A')
+        errors = []
+
+        def lookup():
+            try:
+                size = 0
+                for index in range(200):
+                    softwares = query.softwaresByAddonName('A')
+                    self.assertGreaterEqual(len(softwares), size)
+                    self.assertTrue(all(map(lambda x: 'A' in x.addonNames(), softwares)))
+                    size = len(softwares)
+                    self.assertEqual(query.latestSoftwareByName('A').name(), 'A')
+            except Exception as err:
+                errors.append(err)
+
+        threads = list(map(lambda x: threading.Thread(target=lookup), range(4)))
+        for thread in threads:
+            thread.start()
+
+        for index in range(100):
+            software = Software('E{0}'.format(index), '1.0')
+            software.addAddon(Addon('A', '1.{0}'.format(index)))
+            query.addSoftware(software)
+
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(query.softwaresByAddonName('A')), 102)
+        self.assertEqual(query.softwaresByAddonVersion('A', '>=1.99')[0].name(), 'E99')
+
+    def test_latestSoftwareByName(self):
+        """Should return the software with the highest version."""
+        softwares = self.__getSoftwares()
+        latest = Software('A', '1.10.0')
+        softwares.append(latest)
+        softwares.append(Software('A', '1.9.0'))
+        query = Query(softwares)
+
+        self.assertIs(query.latestSoftwareByName('A'), latest)
+        self.assertRaises(SoftwareNotFoundError, query.latestSoftwareByName, 'E')
+
+    def test_softwaresByVersion(self):
+        """Should return the softwares matching the version constraint."""
+        softwares = self.__getSoftwares()
+        query = Query(softwares)
+        for version in ('2.0', '3.0', '2.5', '1.0'):
+            query.addSoftware(Software('A', version))
+
+        self.assertListEqual(
+            list(map(lambda x: x.version(), query.softwaresByVersion('A', '>=1.1,<3'))),
+            ['1.1.0', '2.0', '2.5']
+        )
+        self.assertListEqual(
+            list(map(lambda x: x.version(), query.softwaresByVersion('A', '!=2.0,<3'))),
+            ['1.0', '1.1.0', '2.5']
+        )
+        self.assertRaises(SoftwareNotFoundError, query.softwaresByVersion, 'A', '>3')
+        self.assertRaises(SoftwareNotFoundError, query.softwaresByVersion, 'E', '>3')
+
+    def test_softwaresByAddonVersion(self):
+        """Should return the softwares with the addon matching the version constraint."""
+        softwares = self.__getSoftwares()
+        softwareE = Software('E', '1.0')
+        softwareE.addAddon(Addon('A', '2.0'))
+        softwares.append(softwareE)
+        query = Query(softwares)
+
+        self.assertListEqual(query.softwaresByAddonVersion('A', '>=2'), [softwareE])
+        self.assertListEqual(
+            list(map(lambda x: x.name(), query.softwaresByAddonVersion('A', '<2'))),
+            ['B', 'C']
+        )
+        self.assertRaises(AddonNotFoundError, query.softwaresByAddonVersion, 'A', '>2')
+
     def __getSoftwares(self):
         """Return an expected list of software with addons."""
         result = []
@@ -0,0 +1,109 @@
+import os
+import shutil
+import tempfile
+import unittest
+from uver.Loader import JsonLoader, SqliteCatalog, AddonNotFoundError as AddonVersionNotFoundError
+from uver import Query, SqliteQuery, SoftwareNotFoundError, AddonNotFoundError
+
+class TestSqliteQuery(unittest.TestCase):
+    """Test sqlite query object."""
+
+    __jsonDirectory = os.path.join(
+        os.path.dirname(os.path.dirname(os.path.realpath(__file__))),
+        'data',
+        'json'
+    )
+
+    def setUp(self):
+        """Write a catalog from the json test data."""
+        self.__directory = tempfile.mkdtemp()
+        self.__loader = JsonLoader()
+        for name in ('simple.json', 'complex.json'):
+            self.__loader.addFromJsonFile(os.path.join(self.__jsonDirectory, name))
+
+        fileName = os.path.join(self.__directory, 'config.db')
+        self.__loader.writeSqlite(fileName)
+        self.__catalog = SqliteCatalog(fileName)
+
+    def tearDown(self):
+        """Remove the catalog."""
+        self.__catalog.close()
+        shutil.rmtree(self.__directory)
+
+    def test_sameAsQuery(self):
+        """Should return the same results as the query over the loaded softwares."""
+        env = {'UVER_A_VERSION': '9.0'}
+        query = Query(self.__loader.softwares(env))
+        sqliteQuery = SqliteQuery(self.__catalog, env)
+
+        def describe(software):
+            return (
+                software.name(),
+                software.version(),
+                sorted(map(lambda x: (x, software.option(x)), software.optionNames())),
+                sorted(map(lambda x: (x, software.addon(x).version()), software.addonNames()))
+            )
+
+        self.assertEqual(sqliteQuery.softwareNames(), query.softwareNames())
+        self.assertEqual(sqliteQuery.softwareUverNames(), query.softwareUverNames())
+        self.assertEqual(sqliteQuery.addonNames(), query.addonNames())
+        self.assertEqual(sqliteQuery.addonUverNames(), query.addonUverNames())
+        self.assertEqual(sqliteQuery.uverVersions(), query.uverVersions())
+
+        for name in query.softwareNames():
+            self.assertEqual(describe(sqliteQuery.softwareByName(name)), describe(query.softwareByName(name)))
+            self.assertEqual(
+                describe(sqliteQuery.latestSoftwareByName(name)),
+                describe(query.latestSoftwareByName(name))
+            )
+
+        for addonName in query.addonNames():
+            self.assertEqual(
+                list(map(describe, sqliteQuery.softwaresByAddonName(addonName))),
+                list(map(describe, query.softwaresByAddonName(addonName)))
+            )
+            self.assertEqual(
+                list(map(describe, sqliteQuery.softwaresByAddonVersion(addonName, '>=0'))),
+                list(map(describe, query.softwaresByAddonVersion(addonName, '>=0')))
+            )
+
+        uverName = query.softwareUverNames()[0]
+        self.assertEqual(
+            describe(sqliteQuery.softwareByUverName(uverName)),
+            describe(query.softwareByUverName(uverName))
+        )
+        self.assertEqual(sqliteQuery.softwareByName('a').version(), '9.0')
+        self.assertEqual(list(map(describe, sqliteQuery.softwaresByVersion('a', '>=9'))), [describe(query.softwareByName('a'))])
+
+    def test_errors(self):
+        """Should raise the same errors as the query."""
+        sqliteQuery = SqliteQuery(self.__catalog)
+
+        self.assertRaises(SoftwareNotFoundError, sqliteQuery.softwareByName, 'unknown')
+        self.assertRaises(SoftwareNotFoundError, sqliteQuery.softwareByUverName, 'UVER_UNKNOWN_VERSION')
+        self.assertRaises(SoftwareNotFoundError, sqliteQuery.softwaresByVersion, 'a', '>=100')
+        self.assertRaises(AddonNotFoundError, sqliteQuery.softwaresByAddonName, 'unknown')
+        self.assertRaises(AddonNotFoundError, sqliteQuery.softwaresByAddonUverName, 'UVER_UNKNOWN_VERSION')
+        self.assertRaises(AddonNotFoundError, sqliteQuery.softwaresByAddonVersion, 'a', '>=100')
+
+        # addons without a version
+        loader = JsonLoader()
+        loader.addFromJson('{"a": {"version": "1.0", "addons": {"missing": {}}}}')
+        fileName = os.path.join(self.__directory, 'missing.db')
+        loader.writeSqlite(fileName)
+        catalog = SqliteCatalog(fileName)
+        try:
+            self.assertRaises(AddonVersionNotFoundError, SqliteQuery(catalog).softwareByName, 'a')
+        finally:
+            catalog.close()
+
+    def test_cache(self):
+        """Should only create the softwares once."""
+        sqliteQuery = SqliteQuery(self.__catalog)
+
+        self.assertIs(sqliteQuery.softwareByName('a'), sqliteQuery.softwareByName('a'))
+        self.assertEqual(sqliteQuery.cacheStats()['hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()